@@ -0,0 +1,278 @@
+"""Cloud API benchmark: the IoT and sharing accounts against the mock Tuya cloud.
+
+Runs the real XTIOTOpenAPI, XTIOTOpenMQ and XTIOTDeviceManager, and the sharing
+account (CustomerApi and XTSharingDeviceManager) against XTMockTuyaCloud and
+XTMockMQTTBroker (see mock_tuya_cloud.py), and reports:
+- the login and device list startup durations (or the error that stopped them)
+- the sharing device list startup duration (homes, devices, specifications, strategies)
+- the WebRTC configuration and lock unlock durations
+- the MQTT device report throughput up to the device manager listeners
+- the API telemetry (calls, errors and latency percentiles per endpoint)
+
+Latency, throttling and failures of the mock cloud are configurable to measure the
+integration when the cloud is slow or degraded, e.g.:
+python benchmarks/bench_cloud_api.py --latency 0.2 --max-rps 20 --failure-rate 0.05 --hang-rate 0.01 --timeout 2
+
+Usage: python benchmarks/bench_cloud_api.py [--devices 50] [--messages 2000] [--latency 0.05]
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import logging
+import threading
+import time
+import types
+from unittest.mock import MagicMock
+
+from paho.mqtt import client as mqtt
+from tuya_iot import openmq
+from tuya_sharing.customerapi import (
+    CustomerApi,
+    CustomerTokenInfo,
+)
+from tuya_sharing.home import (
+    HomeRepository,
+)
+from tuya_sharing.scenes import (
+    SceneRepository,
+)
+
+from mock_tuya_cloud import (
+    MOCK_ACCESS_ID,
+    MOCK_ACCESS_SECRET,
+    MOCK_MQTT_PASSWORD,
+    MOCK_UID,
+    XTMockCloudBehaviour,
+    XTMockMQTTBroker,
+    XTMockTuyaCloud,
+    make_device_report_payload,
+)
+from fleet import (
+    DEVICE_DP_COUNT,
+    get_device_id,
+    get_dp_code,
+    make_fleet,
+)
+
+from custom_components.xtend_tuya.const import (
+    LOGGER,
+    MESSAGE_SOURCE_TUYA_IOT,
+    MESSAGE_SOURCE_TUYA_SHARING,
+)
+from custom_components.xtend_tuya.multi_manager.multi_manager import (
+    MultiManager,
+)
+from custom_components.xtend_tuya.multi_manager.tuya_iot.init import (
+    XTTuyaIOTDeviceManagerInterface,
+)
+from custom_components.xtend_tuya.multi_manager.tuya_iot.xt_tuya_iot_data import (
+    TuyaIOTData,
+)
+from custom_components.xtend_tuya.multi_manager.tuya_iot.xt_tuya_iot_home_manager import (
+    XTIOTHomeManager,
+)
+from custom_components.xtend_tuya.multi_manager.tuya_iot.xt_tuya_iot_manager import (
+    XTIOTDeviceManager,
+)
+from custom_components.xtend_tuya.multi_manager.tuya_iot.xt_tuya_iot_mq import (
+    XTIOTOpenMQ,
+)
+from custom_components.xtend_tuya.multi_manager.tuya_iot.xt_tuya_iot_openapi import (
+    XTIOTOpenAPI,
+)
+from custom_components.xtend_tuya.multi_manager.tuya_iot.ipc import xt_tuya_iot_ipc_mq
+from custom_components.xtend_tuya.multi_manager.tuya_sharing.const import (
+    TUYA_CLIENT_ID,
+)
+from custom_components.xtend_tuya.multi_manager.tuya_sharing.init import (
+    XTTuyaSharingDeviceManagerInterface,
+)
+from custom_components.xtend_tuya.multi_manager.tuya_sharing.util import (
+    instrument_customer_api,
+)
+from custom_components.xtend_tuya.multi_manager.tuya_sharing.xt_tuya_sharing_data import (
+    TuyaSharingData,
+)
+from custom_components.xtend_tuya.multi_manager.tuya_sharing.xt_tuya_sharing_device_repository import (
+    XTSharingDeviceRepository,
+)
+from custom_components.xtend_tuya.multi_manager.tuya_sharing.xt_tuya_sharing_manager import (
+    XTSharingDeviceManager,
+)
+import custom_components.xtend_tuya.multi_manager.shared.multi_device_listener as multi_device_listener
+
+MQTT_SUBSCRIPTION_TIMEOUT = 10
+MQTT_DELIVERY_TIMEOUT = 60
+
+def use_paho_v1_callbacks() -> None:
+    #tuya_iot and the IPC MQ create their clients with mqtt.Client(client_id), which paho-mqtt 2.x
+    #rejects: give them a client using the 1.x callback signatures they are written for
+    if not hasattr(mqtt, "CallbackAPIVersion"):
+        return
+    paho_v1 = types.SimpleNamespace(
+        Client=functools.partial(mqtt.Client, mqtt.CallbackAPIVersion.VERSION1),
+        MQTTMessage=mqtt.MQTTMessage,
+    )
+    openmq.mqtt = paho_v1
+    xt_tuya_iot_ipc_mq.mqtt = paho_v1
+
+def create_iot_account(multi_manager: MultiManager, endpoint: str, timeout: float) -> TuyaIOTData:
+    #Same steps as XTTuyaIOTDeviceManagerInterface._init_from_entry, without the config entry
+    api = XTIOTOpenAPI(endpoint=endpoint, access_id=MOCK_ACCESS_ID, access_secret=MOCK_ACCESS_SECRET, timeout=timeout)
+    api.set_dev_channel("hass")
+    api.telemetry = multi_manager.api_telemetry
+    response = api.connect("user@example.com", "password", "1", "smartlife")
+    if response is None or response.get("success", False) is False:
+        raise RuntimeError(f"Login failed: {response}")
+    mq = XTIOTOpenMQ(api)
+    device_manager = XTIOTDeviceManager(multi_manager, api, mq)
+    home_manager = XTIOTHomeManager(api, mq, device_manager, multi_manager)
+    device_manager.add_device_listener(multi_manager.multi_device_listener)
+    account = XTTuyaIOTDeviceManagerInterface()
+    account.multi_manager = multi_manager
+    account.hass = multi_manager.hass
+    account.iot_account = TuyaIOTData(device_manager=device_manager, mq=mq, device_ids=[], home_manager=home_manager)
+    multi_manager.accounts[MESSAGE_SOURCE_TUYA_IOT] = account
+    return account.iot_account
+
+def create_sharing_account(multi_manager: MultiManager, cloud: XTMockTuyaCloud) -> TuyaSharingData:
+    #Same steps as XTTuyaSharingDeviceManagerInterface._init_from_entry for a standalone entry, without the config entry
+    device_manager = XTSharingDeviceManager(multi_manager=multi_manager, other_device_manager=None)
+    device_manager.terminal_id = "mock_terminal"
+    device_manager.customer_api = CustomerApi(CustomerTokenInfo(cloud.new_sharing_token()), TUYA_CLIENT_ID, "mock_user_code", cloud.endpoint, None)
+    device_manager.mq = None
+    instrument_customer_api(device_manager.customer_api, multi_manager.api_telemetry)
+    device_manager.home_repository = HomeRepository(device_manager.customer_api)
+    device_manager.device_repository = XTSharingDeviceRepository(device_manager.customer_api, device_manager, multi_manager)
+    device_manager.scene_repository = SceneRepository(device_manager.customer_api)
+    device_manager.add_device_listener(multi_manager.multi_device_listener)
+    account = XTTuyaSharingDeviceManagerInterface()
+    account.multi_manager = multi_manager
+    account.hass = multi_manager.hass
+    account.sharing_account = TuyaSharingData(device_manager=device_manager, device_ids=[], ha_tuya_integration_config_manager=None)
+    multi_manager.accounts[MESSAGE_SOURCE_TUYA_SHARING] = account
+    return account.sharing_account
+
+def run_sharing_startup(multi_manager: MultiManager, cloud: XTMockTuyaCloud, device_count: int) -> None:
+    sharing_account = create_sharing_account(multi_manager, cloud)
+    multi_manager.accounts[MESSAGE_SOURCE_TUYA_SHARING].update_device_cache()
+    if len(sharing_account.device_manager.device_map) != device_count:
+        raise RuntimeError(f"{len(sharing_account.device_manager.device_map)}/{device_count} sharing devices loaded")
+
+def run_timed(name: str, function, *args) -> bool:
+    start = time.perf_counter()
+    try:
+        function(*args)
+    except Exception as e:
+        print(f"{name:<24} failed after {(time.perf_counter() - start) * 1000:>9.1f} ms: {type(e).__name__}: {e}")
+        return False
+    print(f"{name:<24} {(time.perf_counter() - start) * 1000:>9.1f} ms")
+    return True
+
+def run_device_startup(iot_account: TuyaIOTData, multi_manager: MultiManager) -> None:
+    iot_account.home_manager.update_device_cache()
+    multi_manager.master_device_map.update(iot_account.device_manager.device_map)
+
+def run_webrtc_configs(iot_account: TuyaIOTData, device_ids: list[str]) -> None:
+    webrtc_manager = iot_account.device_manager.ipc_manager.webrtc_manager
+    for device_id in device_ids:
+        if webrtc_manager.get_device_config(device_id) is None:
+            raise RuntimeError(f"No WebRTC configuration for {device_id}")
+    webrtc_manager.clear_device_configs()
+
+def run_lock_unlocks(iot_account: TuyaIOTData, device_ids: list[str]) -> None:
+    for device_id in device_ids:
+        if not iot_account.device_manager.send_lock_unlock_command(device_id, False):
+            raise RuntimeError(f"Unlocking {device_id} failed")
+
+def run_mqtt_reports(iot_account: TuyaIOTData, multi_manager: MultiManager, broker: XTMockMQTTBroker, device_count: int, message_count: int) -> None:
+    received = threading.Semaphore(0)
+    iot_account.mq.add_message_listener(lambda msg: received.release())
+    iot_account.mq.start()
+    topic = f"cloud/token/in/device/{MOCK_UID}"
+    if not broker.wait_for_subscription(topic, MQTT_SUBSCRIPTION_TIMEOUT):
+        raise RuntimeError("The MQ client didn't subscribe to the device topic")
+    multi_manager.is_ready_for_messages = True
+    payloads = [
+        make_device_report_payload(
+            get_device_id(index % device_count),
+            [{"code": get_dp_code(index % DEVICE_DP_COUNT + 1), "value": index % 100, "t": int(time.time() * 1000)}],
+        )
+        for index in range(message_count)
+    ]
+    start = time.perf_counter()
+    for payload in payloads:
+        broker.publish(topic, payload)
+    deadline = time.monotonic() + MQTT_DELIVERY_TIMEOUT
+    for delivered in range(message_count):
+        if not received.acquire(timeout=max(0, deadline - time.monotonic())):
+            raise RuntimeError(f"Only {delivered}/{message_count} reports delivered")
+    duration = time.perf_counter() - start
+    print(f"{'mqtt reports':<24} {message_count / duration:>9.0f} msg/s")
+
+def run_benchmark(args: argparse.Namespace) -> None:
+    behaviour = XTMockCloudBehaviour(
+        latency=args.latency,
+        latency_jitter=args.jitter,
+        max_requests_per_second=args.max_rps,
+        failure_rate=args.failure_rate,
+        hang_rate=args.hang_rate,
+        hang_duration=args.timeout * 2,
+        seed=args.seed,
+    )
+    broker = XTMockMQTTBroker(username=f"cloud_{MOCK_UID}", password=MOCK_MQTT_PASSWORD).start()
+    cloud = XTMockTuyaCloud(make_fleet(args.devices, open_api=True), behaviour, broker).start()
+    use_paho_v1_callbacks()
+    #Entities are not benchmarked, drop the dispatcher signals
+    multi_device_listener.dispatcher_send = lambda *args, **kwargs: None
+    #The merge reports every differing descriptor of the synthetic fleet, only keep the errors
+    LOGGER.setLevel(logging.ERROR)
+    multi_manager = MultiManager(MagicMock())
+    iot_account: TuyaIOTData | None = None
+    try:
+        def login() -> None:
+            nonlocal iot_account
+            iot_account = create_iot_account(multi_manager, cloud.endpoint, args.timeout)
+
+        if run_timed("login", login):
+            if run_timed(f"device list ({args.devices})", run_device_startup, iot_account, multi_manager):
+                device_ids = list(iot_account.device_manager.device_map)[:args.calls]
+                run_timed(f"webrtc configs ({len(device_ids)})", run_webrtc_configs, iot_account, device_ids)
+                run_timed(f"lock unlocks ({len(device_ids)})", run_lock_unlocks, iot_account, device_ids)
+                run_timed(f"mqtt ({args.messages})", run_mqtt_reports, iot_account, multi_manager, broker, args.devices, args.messages)
+        run_timed(f"sharing devices ({args.devices})", run_sharing_startup, multi_manager, cloud, args.devices)
+        print(f"mock cloud requests: {json.dumps(cloud.request_counts, indent=2)}")
+        print(f"api telemetry: {json.dumps(multi_manager.api_telemetry.get_statistics(), indent=2)}")
+    finally:
+        if iot_account is not None:
+            for mq in (iot_account.mq, iot_account.device_manager.ipc_manager.ipc_mq):
+                if mq.client is not None:
+                    mq.stop()
+        cloud.stop()
+        broker.stop()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, default=50)
+    parser.add_argument("--calls", type=int, default=10, help="number of devices whose WebRTC configuration and lock are used")
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every answer of the mock cloud")
+    parser.add_argument("--jitter", type=float, default=0, help="random seconds added on top of the latency")
+    parser.add_argument("--max-rps", type=float, default=0, help="requests per second above which the mock cloud answers HTTP 429")
+    parser.add_argument("--failure-rate", type=float, default=0, help="portion of the requests answered with HTTP 500")
+    parser.add_argument("--hang-rate", type=float, default=0, help="portion of the requests answered after twice the timeout")
+    parser.add_argument("--timeout", type=float, default=10, help="XTIOTOpenAPI request timeout")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    #The MQ threads of tuya_iot are not daemons and sleep until their configuration expires,
+    #threads started from a daemon thread are daemons too so the script can exit
+    runner = threading.Thread(target=run_benchmark, args=(args,), daemon=True)
+    runner.start()
+    runner.join()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Device memory benchmark: XTDevice layouts on the same synthetic fleet.
+
+Builds fleets (see fleet.py) with each device layout and measures the memory they
+retain with tracemalloc:
+- before: XTDevice as a SimpleNamespace with plain dataclass specification objects
+  (the layout used before the slotted classes, copied below)
+- slots + __dict__: the current XTDevice, fixed fields in slots and the other cloud
+  fields in its __dict__ overflow, slotted specification objects with interned strings
+- slots only: the current classes with a XTDevice without the __dict__ slot, which
+  can't keep the fields it doesn't know (they are dropped), to show what the overflow costs
+
+Each layout is measured with the fixed fields only, then with the fields the cloud
+sends on top of them (--extra-fields), which end up in the __dict__ overflow.
+
+Usage: python benchmarks/bench_device_memory.py [--sizes 10 100 1000] [--extra-fields 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any
+
+import offline  # noqa: F401
+from fleet import (
+    FLEET_SIZES,
+    make_device,
+)
+
+from custom_components.xtend_tuya.multi_manager.shared.device import (
+    XTDevice,
+    XTDeviceFunction,
+    XTDeviceStatusRange,
+)
+from custom_components.xtend_tuya.multi_manager.shared.descriptor_string_pool import (
+    XTDescriptorStringPool,
+)
+
+@dataclass
+class XTLegacyDeviceStatusRange:
+    code: str
+    type: str
+    values: str
+    dp_id: int = None
+
+@dataclass
+class XTLegacyDeviceFunction:
+    code: str
+    type: str
+    desc: str = None
+    name: str = None
+    values: dict[str, Any] = field(default_factory=dict)
+    dp_id: int = None
+
+class XTLegacyDevice(SimpleNamespace):
+    def __init__(self, **kwargs: Any) -> None:
+        self.local_strategy = {}
+        self.status = {}
+        self.function = {}
+        self.status_range = {}
+        super().__init__(**kwargs)
+
+#XTDevice without the __dict__ overflow slot
+XTSlotsOnlyDevice = type(
+    "XTSlotsOnlyDevice",
+    (),
+    {
+        "__slots__": tuple(slot for slot in XTDevice.__slots__ if slot != "__dict__"),
+        "__init__": XTDevice.__init__,
+    },
+)
+
+LAYOUTS: dict[str, tuple[type, type, type]] = {
+    "before": (XTLegacyDevice, XTLegacyDeviceStatusRange, XTLegacyDeviceFunction),
+    "slots + __dict__": (XTDevice, XTDeviceStatusRange, XTDeviceFunction),
+    "slots only": (XTSlotsOnlyDevice, XTDeviceStatusRange, XTDeviceFunction),
+}
+
+def get_cloud_fields(index: int, extra_field_count: int) -> dict[str, Any]:
+    #Fixed fields of the device list answer that make_device doesn't set, then fields no XTDevice slot covers
+    fields: dict[str, Any] = {
+        "local_key": f"{index:016x}",
+        "product_name": f"Product {index}",
+        "sub": False,
+        "uuid": f"uuid{index:012d}",
+        "asset_id": f"{index:019d}",
+        "icon": f"smart/icon/{index}.png",
+        "ip": f"10.0.{index // 256 % 256}.{index % 256}",
+        "time_zone": "+01:00",
+        "active_time": 1700000000 + index,
+        "create_time": 1700000000 + index,
+        "update_time": 1700000000 + index,
+    }
+    for extra_index in range(extra_field_count):
+        fields[f"extra_{extra_index}"] = f"value {index}/{extra_index}"
+    return fields
+
+def build_fleet(size: int, layout: tuple[type, type, type], extra_field_count: int) -> list:
+    device_class, status_range_class, function_class = layout
+    devices = []
+    for index in range(size):
+        device = make_device(index, device_class=device_class, status_range_class=status_range_class, function_class=function_class)
+        for name, value in get_cloud_fields(index, extra_field_count).items():
+            if device_class is XTSlotsOnlyDevice and name not in XTSlotsOnlyDevice.__slots__:
+                continue
+            setattr(device, name, value)
+        devices.append(device)
+    #Same as after MultiManager.update_device_cache: the devices keep their descriptors, the pool is emptied
+    XTDescriptorStringPool.clear()
+    return devices
+
+def measure_retained(size: int, layout: tuple[type, type, type], extra_field_count: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    devices = build_fleet(size, layout, extra_field_count)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del devices
+    return retained
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(FLEET_SIZES))
+    parser.add_argument("--extra-fields", type=int, default=4, help="cloud fields per device that no XTDevice slot covers")
+    args = parser.parse_args()
+
+    #Warm up the type caches of every layout so that the first measure doesn't include them
+    for layout in LAYOUTS.values():
+        build_fleet(1, layout, args.extra_fields)
+    print(f"{'devices':>8} {'layout':>18} {'fields':>14} {'KiB/device':>11} {'vs before':>10}")
+    for size in args.sizes:
+        for extra_field_count in (0, args.extra_fields):
+            fields_label = f"fixed + {extra_field_count} extra" if extra_field_count else "fixed"
+            before = None
+            for name, layout in LAYOUTS.items():
+                retained = measure_retained(size, layout, extra_field_count)
+                if before is None:
+                    before = retained
+                print(
+                    f"{size:>8} {name:>18} {fields_label:>14} {retained / 1024 / size:>11.2f} "
+                    f"{(retained - before) / before * 100:>+9.1f}%"
+                )
+
+if __name__ == "__main__":
+    main()
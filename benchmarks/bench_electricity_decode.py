@@ -0,0 +1,127 @@
+"""Electricity RAW decoding benchmark: per-field decoder versus ElectricityTypeData.from_raw_batch.
+
+The per-field decoder is the ElectricityTypeData.from_raw that was used before the
+batch decoder (one struct.unpack per field, on sliced and padded copies). Both decoders
+are run on the same three-phase reports, and reports:
+- the decoding time of all the reports with each decoder
+- the decoding time of the sensors' previous pattern, where every sensor (current, power
+  and voltage of each phase) decoded its phase on its own: 9 decodes per report
+- a check that both decoders give identical values, including for short, long,
+  empty and invalid (odd-length base64) payloads
+
+Usage: python benchmarks/bench_electricity_decode.py [--meters 60] [--reports 1000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import binascii
+import random
+import struct
+import time
+
+import fleet  # noqa: F401
+
+from custom_components.xtend_tuya.base import (
+    ElectricityTypeData,
+)
+
+PHASE_COUNT = 3
+SENSORS_PER_PHASE = 3
+
+def decode_per_field(data: str) -> ElectricityTypeData:
+    #ElectricityTypeData.from_raw before the batch decoder
+    raw = base64.b64decode(data)
+    if len(raw) < 8:
+        return ElectricityTypeData(electriccurrent=None, power=None, voltage=None)
+    voltage = struct.unpack(">H", raw[0:2])[0] / 10.0
+    electriccurrent = struct.unpack(">L", b"\x00" + raw[2:5])[0] / 1000.0
+    power = struct.unpack(">L", b"\x00" + raw[5:8])[0] / 1000.0
+    return ElectricityTypeData(
+        electriccurrent=str(electriccurrent), power=str(power), voltage=str(voltage)
+    )
+
+def make_phase(rnd: random.Random, length: int = 8) -> str:
+    payload = struct.pack(">H", rnd.randrange(2100, 2500)) + rnd.randrange(1 << 24).to_bytes(3, "big") + rnd.randrange(1 << 24).to_bytes(3, "big")
+    payload = (payload + bytes(rnd.randrange(256) for _ in range(max(0, length - 8))))[:length]
+    return base64.b64encode(payload).decode("ascii")
+
+def make_reports(meter_count: int, report_count: int, seed: int = 1) -> list[list[str]]:
+    rnd = random.Random(seed)
+    return [[make_phase(rnd) for _ in range(PHASE_COUNT)] for _ in range(meter_count * report_count)]
+
+def make_edge_payloads(seed: int = 1) -> list[str]:
+    #Every length around the 8 bytes layout, and base64 strings that don't decode
+    rnd = random.Random(seed)
+    payloads = [make_phase(rnd, length) for length in range(0, 17) for _ in range(20)]
+    payloads.extend(["", "A", "AAA", "AAAAA", "AAECAwQFBgc", "not base64!"])
+    return payloads
+
+def decode_or_error(decoder, payload: str) -> ElectricityTypeData | str:
+    try:
+        return decoder(payload)
+    except (binascii.Error, ValueError) as e:
+        return type(e).__name__
+
+def check_identical(reports: list[list[str]], edge_payloads: list[str]) -> int:
+    payloads = [payload for report in reports for payload in report] + edge_payloads
+    mismatches = 0
+    for payload in payloads:
+        expected = decode_or_error(decode_per_field, payload)
+        single = decode_or_error(ElectricityTypeData.from_raw, payload)
+        batch = decode_or_error(lambda payload: ElectricityTypeData.from_raw_batch([payload])[0], payload)
+        if not expected == single == batch:
+            mismatches += 1
+            print(f"Mismatch for {payload!r}: {expected} / {single} / {batch}")
+    for report in reports:
+        if ElectricityTypeData.from_raw_batch(report) != [decode_per_field(payload) for payload in report]:
+            mismatches += 1
+            print(f"Batch mismatch for {report}")
+    return mismatches
+
+def measure(function, reports: list[list[str]]) -> float:
+    start = time.perf_counter()
+    function(reports)
+    return time.perf_counter() - start
+
+def decode_reports_per_field(reports: list[list[str]]) -> None:
+    for report in reports:
+        for payload in report:
+            decode_per_field(payload)
+
+def decode_reports_per_sensor(reports: list[list[str]]) -> None:
+    for report in reports:
+        for payload in report:
+            for _ in range(SENSORS_PER_PHASE):
+                decode_per_field(payload)
+
+def decode_reports_batch(reports: list[list[str]]) -> None:
+    from_raw_batch = ElectricityTypeData.from_raw_batch
+    for report in reports:
+        from_raw_batch(report)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meters", type=int, default=60)
+    parser.add_argument("--reports", type=int, default=1000, help="reports per meter")
+    args = parser.parse_args()
+
+    reports = make_reports(args.meters, args.reports)
+    edge_payloads = make_edge_payloads()
+    mismatches = check_identical(reports, edge_payloads)
+    print(f"{len(reports)} reports of {PHASE_COUNT} phases, {len(edge_payloads)} edge case payloads: {mismatches} mismatches")
+
+    #Warm up, then keep the best of 3 runs
+    measure(decode_reports_batch, reports[:1000])
+    print(f"{'decoder':>32} {'total ms':>9} {'us/report':>10}")
+    for name, function in (
+        ("per field (9 decodes/report)", decode_reports_per_sensor),
+        ("per field (3 decodes/report)", decode_reports_per_field),
+        ("batch (1 call/report)", decode_reports_batch),
+    ):
+        duration = min(measure(function, reports) for _ in range(3))
+        print(f"{name:>32} {duration * 1000:>9.1f} {duration / len(reports) * 1e6:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Import benchmark: sharing-only entry versus sharing + OpenAPI (tuya_iot) entry.
+
+Each run is a fresh interpreter that preloads the Home Assistant core (already
+loaded when HA sets up the integration), then times the import of the integration
+and of the plugins MultiManager.setup_entry loads for the entry options
+(AllowedPlugins.get_plugins_to_load). Reports:
+- the median import duration per entry type
+- whether tuya_iot, the IPC/WebRTC stack and paho ended up in sys.modules
+
+Usage: python benchmarks/bench_import.py [--repeat 7]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from fleet import (
+    REPO_ROOT,
+)
+
+from custom_components.xtend_tuya.const import (
+    TUYA_IOT_REQUIRED_OPTIONS,
+)
+
+ENTRY_OPTIONS: dict[str, dict[str, str]] = {
+    "sharing only": {},
+    "sharing + tuya_iot": {option: "" for option in TUYA_IOT_REQUIRED_OPTIONS},
+}
+
+#Modules whose presence after the import is reported
+WATCHED_MODULES: tuple[str, ...] = (
+    "tuya_iot",
+    "custom_components.xtend_tuya.multi_manager.tuya_iot.ipc.webrtc.xt_tuya_iot_webrtc_manager",
+    "paho.mqtt.client",
+)
+
+IMPORT_SCRIPT = """
+import importlib, json, sys, time
+import homeassistant.core, homeassistant.config_entries, homeassistant.helpers.entity_platform
+start = time.perf_counter()
+import custom_components.xtend_tuya
+from custom_components.xtend_tuya.const import AllowedPlugins
+for plugin in AllowedPlugins.get_plugins_to_load(json.loads(sys.argv[1])):
+    importlib.import_module(f"custom_components.xtend_tuya.multi_manager.{plugin}.init")
+duration = time.perf_counter() - start
+print(json.dumps({"duration": duration, "modules": [module for module in json.loads(sys.argv[2]) if module in sys.modules]}))
+"""
+
+def run_import(options: dict[str, str]) -> tuple[float, list[str]]:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT, json.dumps(options), json.dumps(WATCHED_MODULES)],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    result = json.loads(output.stdout.strip().splitlines()[-1])
+    return result["duration"], result["modules"]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    #The first run compiles the bytecode of the integration if needed, it's not measured
+    run_import(ENTRY_OPTIONS["sharing + tuya_iot"])
+    print(f"{'entry':>20} {'median ms':>10}  loaded")
+    for name, options in ENTRY_OPTIONS.items():
+        durations: list[float] = []
+        for _ in range(args.repeat):
+            duration, modules = run_import(options)
+            durations.append(duration)
+        print(f"{name:>20} {statistics.median(durations) * 1000:>10.1f}  {', '.join(modules) or '-'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Message pipeline benchmark: MQTT device reports through MultiManager.on_message.
+
+The messages go through the real pipeline (MultiManager, the report handling of the
+IoT or sharing device manager, the virtual states and MultiDeviceListener.update_device),
+only the Home Assistant dispatcher is stubbed so that no entity is involved. Reports,
+separately for the IoT and the sharing messages:
+- throughput (messages per second)
+- on_message latency percentiles
+- memory allocated per message (peak above the baseline, tracemalloc) and blocks retained per message
+
+By default a synthetic trace is generated for each source (the sharing reports carry
+dpId like the sharing MQ does), a trace recorded by the integration can be replayed
+instead: enable performance monitoring, download the config entry diagnostics and
+pass the file with --trace (its devices are created from the fleet if unknown, each
+message is replayed through the account that received it).
+
+Usage: python benchmarks/bench_message_pipeline.py [--devices 200] [--messages 20000] [--trace diagnostics.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from typing import Any
+from unittest.mock import MagicMock
+
+from fleet import (
+    DEVICE_DP_COUNT,
+    get_device_id,
+    get_dp_code,
+    make_device,
+)
+
+from custom_components.xtend_tuya.const import (
+    MESSAGE_SOURCE_TUYA_IOT,
+    MESSAGE_SOURCE_TUYA_SHARING,
+)
+from custom_components.xtend_tuya.multi_manager.multi_manager import (
+    MultiManager,
+)
+from custom_components.xtend_tuya.multi_manager.tuya_iot.xt_tuya_iot_manager import (
+    XTIOTDeviceManager,
+)
+from custom_components.xtend_tuya.multi_manager.tuya_iot.init import (
+    XTTuyaIOTDeviceManagerInterface,
+)
+from custom_components.xtend_tuya.multi_manager.tuya_iot.xt_tuya_iot_data import (
+    TuyaIOTData,
+)
+from custom_components.xtend_tuya.multi_manager.tuya_sharing.xt_tuya_sharing_data import (
+    TuyaSharingData,
+)
+from custom_components.xtend_tuya.multi_manager.tuya_sharing.xt_tuya_sharing_manager import (
+    XTSharingDeviceManager,
+)
+from custom_components.xtend_tuya.multi_manager.tuya_sharing.init import (
+    XTTuyaSharingDeviceManagerInterface,
+)
+import custom_components.xtend_tuya.multi_manager.shared.multi_device_listener as multi_device_listener
+
+LATENCY_PERCENTILES: tuple[int, ...] = (50, 90, 99)
+ALLOCATION_SAMPLE_SIZE = 2000
+MESSAGE_SOURCES: tuple[str, ...] = (MESSAGE_SOURCE_TUYA_IOT, MESSAGE_SOURCE_TUYA_SHARING)
+
+class XTBenchmarkSharingListener:
+    #tuya-device-sharing-sdk 0.2 passes the updated properties and their timestamps to the listeners,
+    #the 0.1.9 the integration pins only passes the device
+    def __init__(self, multi_manager: MultiManager) -> None:
+        self.multi_manager = multi_manager
+
+    def update_device(self, device, *args) -> None:
+        self.multi_manager.multi_device_listener.update_device(device)
+
+def create_multi_manager(device_count: int) -> MultiManager:
+    #Entities are not benchmarked, drop the dispatcher signals
+    multi_device_listener.dispatcher_send = lambda *args, **kwargs: None
+    multi_manager = MultiManager(MagicMock())
+    device_manager = XTIOTDeviceManager.__new__(XTIOTDeviceManager)
+    device_manager.multi_manager = multi_manager
+    device_manager.device_map = {}
+    device_manager.device_listeners = [multi_manager.multi_device_listener]
+    device_manager.mq = MagicMock()
+    account = XTTuyaIOTDeviceManagerInterface()
+    account.multi_manager = multi_manager
+    account.hass = multi_manager.hass
+    #Real account data rather than mocks, a mock would record (and retain) every call made on it
+    account.iot_account = TuyaIOTData(device_manager=device_manager, mq=device_manager.mq, device_ids=[], home_manager=None)
+    multi_manager.accounts[MESSAGE_SOURCE_TUYA_IOT] = account
+    sharing_device_manager = XTSharingDeviceManager(multi_manager)
+    sharing_device_manager.device_listeners = {XTBenchmarkSharingListener(multi_manager)}
+    sharing_account = XTTuyaSharingDeviceManagerInterface()
+    sharing_account.multi_manager = multi_manager
+    sharing_account.hass = multi_manager.hass
+    sharing_account.sharing_account = TuyaSharingData(device_manager=sharing_device_manager, device_ids=[], ha_tuya_integration_config_manager=None)
+    multi_manager.accounts[MESSAGE_SOURCE_TUYA_SHARING] = sharing_account
+    for index in range(device_count):
+        add_device(multi_manager, make_device(index))
+    multi_manager.is_ready_for_messages = True
+    return multi_manager
+
+def add_device(multi_manager: MultiManager, device) -> None:
+    #Both accounts see every device, like after the merge of a device available through both
+    device.support_local = True
+    iot_account = multi_manager.accounts[MESSAGE_SOURCE_TUYA_IOT].iot_account
+    iot_account.device_manager.device_map[device.id] = device
+    iot_account.device_ids.append(device.id)
+    sharing_account = multi_manager.accounts[MESSAGE_SOURCE_TUYA_SHARING].sharing_account
+    sharing_account.device_manager.device_map[device.id] = device
+    sharing_account.device_ids.append(device.id)
+    multi_manager.master_device_map[device.id] = device
+
+def get_dp_value(rnd: random.Random, dp_id: int) -> Any:
+    #Same types as fleet._get_dp_specification, enums must stay in range or the sharing SDK drops them
+    if dp_id % 3 == 0:
+        return rnd.choice(("low", "middle", "high"))
+    elif dp_id % 3 == 1:
+        return rnd.randrange(100)
+    return rnd.random() < 0.5
+
+def make_trace(device_count: int, message_count: int, source: str, seed: int = 1) -> list[tuple[str, dict[str, Any]]]:
+    #The IoT MQ reports codes, the sharing MQ reports dpId
+    rnd = random.Random(seed)
+    dp_key = "code" if source == MESSAGE_SOURCE_TUYA_IOT else "dpId"
+    trace: list[tuple[str, dict[str, Any]]] = []
+    for _ in range(message_count):
+        trace.append((source, {
+            "protocol": 4,
+            "data": {
+                "devId": get_device_id(rnd.randrange(device_count)),
+                "status": [
+                    {dp_key: get_dp_code(dp_id) if dp_key == "code" else dp_id, "value": get_dp_value(rnd, dp_id), "t": int(time.time() * 1000)}
+                    for dp_id in rnd.sample(range(1, DEVICE_DP_COUNT + 1), 3)
+                ],
+            },
+        }))
+    return trace
+
+def load_trace(multi_manager: MultiManager, path: str) -> list[tuple[str, dict[str, Any]]]:
+    with open(path, encoding="utf-8") as file:
+        diagnostics = json.load(file)
+    entries = diagnostics.get("data", diagnostics).get("message_trace", [])
+    trace: list[tuple[str, dict[str, Any]]] = []
+    for entry in entries:
+        message = entry["message"]
+        if isinstance(message, str):
+            message = json.loads(message)
+        if (device_id := message.get("data", {}).get("devId")) and device_id not in multi_manager.master_device_map:
+            device = make_device(len(multi_manager.master_device_map))
+            device.id = device_id
+            add_device(multi_manager, device)
+        source = entry.get("source", MESSAGE_SOURCE_TUYA_IOT)
+        if source not in MESSAGE_SOURCES:
+            continue
+        trace.append((source, message))
+    return trace
+
+def get_percentile(samples: list[float], percentile: int) -> float:
+    return samples[min(len(samples) - 1, len(samples) * percentile // 100)]
+
+def measure_latency(multi_manager: MultiManager, trace: list[tuple[str, dict[str, Any]]]) -> tuple[float, list[float]]:
+    #The handlers modify the messages in place, each run gets its own copy
+    messages = [(source, json.loads(json.dumps(message))) for source, message in trace]
+    latencies: list[float] = []
+    for source, message in messages:
+        start = time.perf_counter()
+        multi_manager.on_message(source, message)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return len(latencies) / sum(latencies), latencies
+
+def measure_allocations(multi_manager: MultiManager, trace: list[tuple[str, dict[str, Any]]]) -> tuple[float, float]:
+    messages = [(source, json.loads(json.dumps(message))) for source, message in trace[:ALLOCATION_SAMPLE_SIZE]]
+    if not messages:
+        return 0, 0
+    peak_total = 0
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for source, message in messages:
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        multi_manager.on_message(source, message)
+        peak_total += tracemalloc.get_traced_memory()[1] - current
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained_blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+    return peak_total / len(messages), retained_blocks / len(messages)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=20000, help="number of synthetic messages per source")
+    parser.add_argument("--trace", help="config entry diagnostics (or a message_trace dict) to replay")
+    args = parser.parse_args()
+
+    multi_manager = create_multi_manager(args.devices)
+    if args.trace:
+        trace = load_trace(multi_manager, args.trace)
+    else:
+        trace = [message for source in MESSAGE_SOURCES for message in make_trace(args.devices, args.messages, source)]
+    if not trace:
+        print("The trace is empty")
+        return
+
+    percentile_headers = " ".join(f"{f'p{percentile} us':>9}" for percentile in LATENCY_PERCENTILES)
+    print(f"{len(trace)} messages, {len(multi_manager.master_device_map)} devices")
+    print(f"{'source':>12} {'monitoring':>10} {'msg/s':>9} {percentile_headers} {'KiB/msg':>8} {'blocks/msg':>10}")
+    for source in MESSAGE_SOURCES:
+        source_trace = [message for message in trace if message[0] == source]
+        if not source_trace:
+            continue
+        for monitoring in (False, True):
+            multi_manager.performance_monitor.set_enabled(monitoring)
+            #Warm up the caches (decoded values, descriptors) before measuring
+            measure_latency(multi_manager, source_trace[:ALLOCATION_SAMPLE_SIZE])
+            messages_per_second, latencies = measure_latency(multi_manager, source_trace)
+            percentiles = " ".join(f"{get_percentile(latencies, percentile) * 1e6:>9.1f}" for percentile in LATENCY_PERCENTILES)
+            allocations = ""
+            if not monitoring:
+                allocated_bytes, retained_blocks = measure_allocations(multi_manager, source_trace)
+                allocations = f" {allocated_bytes / 1024:>8.1f} {retained_blocks:>10.3f}"
+            print(f"{source:>12} {str(monitoring):>10} {messages_per_second:>9.0f} {percentiles}{allocations}")
+        multi_manager.performance_monitor.set_enabled(False)
+
+if __name__ == "__main__":
+    main()
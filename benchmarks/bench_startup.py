@@ -0,0 +1,132 @@
+"""Startup benchmark: merge of the sharing/OpenAPI device pairs and CloudFixes.
+
+Runs the same steps as MultiManager.update_device_cache once the accounts have
+returned their devices, on synthetic fleets (see fleet.py), and reports:
+- the merge and CloudFixes durations (tracemalloc off)
+- the duration of MultiManager.update_device_cache itself, with a sharing and an
+  OpenAPI account that return the synthetic fleets (conversion to XTDevice, master
+  device map, merge and CloudFixes)
+- the peak memory of the whole startup (separate tracemalloc run)
+- the memory retained per device once the fixes are done
+
+No network access is needed and the requirements don't have to be installed: the
+ones that are missing are stubbed (see offline.py).
+
+Usage: python benchmarks/bench_startup.py [--sizes 10 100 1000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+import offline  # noqa: F401
+from fleet import (
+    FLEET_SIZES,
+    make_fleet,
+)
+
+from custom_components.xtend_tuya.const import (
+    MESSAGE_SOURCE_TUYA_IOT,
+    MESSAGE_SOURCE_TUYA_SHARING,
+)
+from custom_components.xtend_tuya.multi_manager.multi_manager import (
+    MultiManager,
+)
+from custom_components.xtend_tuya.multi_manager.shared.device import (
+    XTDevice,
+)
+
+from custom_components.xtend_tuya.multi_manager.shared.merging_manager import (
+    XTMergingManager,
+)
+from custom_components.xtend_tuya.multi_manager.shared.cloud_fix import (
+    CloudFixes,
+)
+from custom_components.xtend_tuya.multi_manager.shared.descriptor_string_pool import (
+    XTDescriptorStringPool,
+)
+
+def run_startup(size: int) -> tuple[list, float, float]:
+    #Devices are built before the clock starts, the SDK calls they stand for are not measured
+    sharing_devices = make_fleet(size)
+    open_api_devices = make_fleet(size, open_api=True)
+    start = time.perf_counter()
+    for sharing_device, open_api_device in zip(sharing_devices, open_api_devices):
+        XTMergingManager.merge_devices(sharing_device, open_api_device)
+    merge_duration = time.perf_counter() - start
+    start = time.perf_counter()
+    for sharing_device in sharing_devices:
+        CloudFixes.apply_fixes(sharing_device)
+    XTDescriptorStringPool.clear()
+    cloud_fixes_duration = time.perf_counter() - start
+    return sharing_devices, merge_duration, cloud_fixes_duration
+
+class XTBenchmarkAccount:
+    #The parts of XTDeviceManagerInterface that MultiManager.update_device_cache uses,
+    #the device list the account would get from its SDK is given at creation
+    def __init__(self, devices: list[XTDevice], convert: bool) -> None:
+        self.devices = devices
+        self.convert = convert
+        self.device_map: dict[str, XTDevice] = {}
+
+    def update_device_cache(self) -> None:
+        self.device_map.update((device.id, device) for device in self.devices)
+
+    def get_available_device_maps(self) -> list[dict[str, XTDevice]]:
+        return [self.device_map]
+
+    def convert_to_xt_device(self, device: XTDevice) -> XTDevice:
+        #The sharing account converts its CustomerDevice, the OpenAPI one already has XTDevice
+        if self.convert:
+            return XTDevice.from_compatible_device(device)
+        return device
+
+def run_update_device_cache(size: int) -> float:
+    multi_manager = MultiManager(None)
+    multi_manager.accounts[MESSAGE_SOURCE_TUYA_SHARING] = XTBenchmarkAccount(make_fleet(size), True)
+    multi_manager.accounts[MESSAGE_SOURCE_TUYA_IOT] = XTBenchmarkAccount(make_fleet(size, open_api=True), False)
+    start = time.perf_counter()
+    multi_manager.update_device_cache()
+    return time.perf_counter() - start
+
+def measure_memory(size: int) -> tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    devices, _, _ = run_startup(size)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    del devices
+    return peak, retained
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(FLEET_SIZES))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size, the best one is reported")
+    args = parser.parse_args()
+
+    if offline.STUBBED:
+        print(f"Stubbed requirements: {', '.join(offline.STUBBED)}")
+    print(
+        f"{'devices':>8} {'merge ms':>10} {'fixes ms':>10} {'ms/device':>10} "
+        f"{'cache ms':>10} {'peak KiB':>10} {'KiB/device':>11}"
+    )
+    for size in args.sizes:
+        timings = [run_startup(size)[1:] for _ in range(args.repeat)]
+        merge_duration, cloud_fixes_duration = min(timings, key=sum)
+        update_device_cache_duration = min(run_update_device_cache(size) for _ in range(args.repeat))
+        peak, retained = measure_memory(size)
+        total_ms = (merge_duration + cloud_fixes_duration) * 1000
+        print(
+            f"{size:>8} {merge_duration * 1000:>10.1f} {cloud_fixes_duration * 1000:>10.1f} "
+            f"{total_ms / size:>10.3f} {update_device_cache_duration * 1000:>10.1f} "
+            f"{peak / 1024:>10.0f} {retained / 1024 / size:>11.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
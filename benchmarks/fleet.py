@@ -0,0 +1,97 @@
+"""Synthetic XTDevice fleets used by the offline benchmarks.
+
+No cloud access is needed: every device is built locally with the same shape as the
+devices returned by the sharing and IoT SDKs (status range, functions, local strategy
+and data model). The integration and its requirements (Home Assistant, tuya-device-sharing-sdk)
+must be importable, the SDKs are never called.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+
+#Make custom_components importable when the scripts are run from anywhere
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from custom_components.xtend_tuya.multi_manager.shared.device import (  # noqa: E402
+    XTDevice,
+    XTDeviceFunction,
+    XTDeviceStatusRange,
+)
+
+FLEET_SIZES: tuple[int, ...] = (10, 100, 1000)
+#Devices are spread over this many products so that descriptors repeat like in a real home
+FLEET_PRODUCT_COUNT = 10
+DEVICE_DP_COUNT = 20
+
+def get_device_id(index: int) -> str:
+    return f"bf{index:08d}"
+
+def get_dp_code(dp_id: int) -> str:
+    return f"code_{dp_id}"
+
+def _get_dp_specification(dp_id: int, open_api: bool) -> tuple[str, dict]:
+    #The OpenAPI flavour of a device reports a different scale for its integers, which the merge has to reconcile
+    if dp_id % 3 == 0:
+        return "Enum", {"range": ["low", "middle", "high"]}
+    elif dp_id % 3 == 1:
+        return "Integer", {
+            "unit": "W",
+            "min": 0,
+            "max": 100000 if open_api else 1000,
+            "scale": 2 if open_api else 0,
+            "step": 1,
+        }
+    return "Boolean", {}
+
+def make_device(
+    index: int,
+    open_api: bool = False,
+    dp_count: int = DEVICE_DP_COUNT,
+    device_class: type = XTDevice,
+    status_range_class: type = XTDeviceStatusRange,
+    function_class: type = XTDeviceFunction,
+) -> XTDevice:
+    #The classes can be replaced to compare other device layouts on the same fleet (see bench_device_memory.py)
+    device = device_class(
+        id=get_device_id(index),
+        name=f"Device {index}",
+        category="cz",
+        product_id=f"product{index % FLEET_PRODUCT_COUNT}",
+        online=True,
+    )
+    properties: list[dict] = []
+    for dp_id in range(1, dp_count + 1):
+        code = get_dp_code(dp_id)
+        dp_type, values = _get_dp_specification(dp_id, open_api)
+        values_str = json.dumps(values)
+        device.status_range[code] = status_range_class(code=code, type=dp_type, values=values_str, dp_id=dp_id)
+        if dp_id % 2:
+            device.function[code] = function_class(code=code, type=dp_type, values=values_str, dp_id=dp_id)
+        device.status[code] = 0
+        device.local_strategy[dp_id] = {
+            "status_code": code,
+            "status_code_alias": [],
+            "value_convert": "default",
+            "config_item": {
+                "valueType": dp_type,
+                "valueDesc": values_str,
+                "statusFormat": json.dumps({code: "$"}),
+                "pid": device.product_id,
+            },
+        }
+        properties.append({
+            "abilityId": dp_id,
+            "code": code,
+            "accessMode": "rw",
+            "typeSpec": {"type": "value", "min": 0, "max": 1000},
+        })
+    device.data_model = json.dumps({"services": [{"properties": properties}]})
+    return device
+
+def make_fleet(size: int, open_api: bool = False) -> list[XTDevice]:
+    return [make_device(index, open_api) for index in range(size)]
@@ -0,0 +1,812 @@
+"""Mock Tuya cloud: OpenAPI HTTP server and MQTT broker.
+
+XTMockTuyaCloud serves the OpenAPI endpoints used by the tuya_iot account of the
+integration for a synthetic fleet (see fleet.py):
+- token (login and refresh), with the request signature and the access token checked
+- device list, device info/status and specifications
+- thing model and shadow properties (read and issue)
+- webrtc-configs
+- door-lock remote-unlocks, password-ticket and password-free door-operate
+- MQTT access configuration pointing to the XTMockMQTTBroker
+
+and the CustomerApi endpoints used by the tuya_sharing account (requests recognized
+by their X-requestId header), with the request signature checked and the parameters,
+bodies and results encrypted like the Tuya cloud does:
+- token refresh, homes, rooms and scenes (query and trigger)
+- home device list, device details, specifications, strategy (status), custom type
+  and report types
+- device commands, stream allocation, version report and MQTT access configuration
+new_sharing_token gives the token info a CustomerApi is created with.
+
+XTMockCloudBehaviour injects latency (with jitter), throttling (HTTP 429 above a
+request rate) and failures (HTTP 500 or hanging requests) so that the integration
+can be measured under degraded conditions.
+
+XTMockMQTTBroker is a minimal MQTT 3.1.1 broker (CONNECT, SUBSCRIBE, PUBLISH QoS 0/1,
+PING, DISCONNECT) that publishes encrypted device reports the same way the Tuya
+cloud does, and records what the clients publish (e.g. WebRTC offers on the IPC sink topic).
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import random
+import re
+import socket
+import socketserver
+import string
+import struct
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+from Crypto.Cipher import AES
+
+from fleet import (
+    DEVICE_DP_COUNT,
+    get_dp_code,
+)
+
+from custom_components.xtend_tuya.multi_manager.shared.device import (
+    XTDevice,
+)
+
+MOCK_ACCESS_ID = "mock_access_id"
+MOCK_ACCESS_SECRET = "mock_access_secret_0123456789abc"
+MOCK_UID = "mock_uid"
+MOCK_TOKEN_TTL = 7200
+MOCK_MQTT_PASSWORD = "mock_mqtt_password_0123456789abc"
+MOCK_SHARING_HOME_ID = "1000"
+MOCK_SHARING_SCENE_COUNT = 5
+#Length of the nonce of the AES-GCM encrypted sharing payloads, and of its base64 encoding
+SHARING_NONCE_LENGTH = 12
+SHARING_NONCE_B64_LENGTH = 16
+
+#Error codes returned by the Tuya OpenAPI
+TUYA_CODE_SIGN_INVALID = 1004
+TUYA_CODE_TOKEN_INVALID = 1010
+TUYA_CODE_URI_PATH_INVALID = 1108
+
+MQTT_CONNECT = 1
+MQTT_CONNACK = 2
+MQTT_PUBLISH = 3
+MQTT_PUBACK = 4
+MQTT_SUBSCRIBE = 8
+MQTT_SUBACK = 9
+MQTT_UNSUBSCRIBE = 10
+MQTT_UNSUBACK = 11
+MQTT_PINGREQ = 12
+MQTT_PINGRESP = 13
+MQTT_DISCONNECT = 14
+
+@dataclass
+class XTMockCloudBehaviour:
+    #Delay (in seconds) added to every answer, plus a random jitter in [0, latency_jitter]
+    latency: float = 0
+    latency_jitter: float = 0
+    #Requests per second above which the server answers HTTP 429, 0 disables the throttling
+    max_requests_per_second: float = 0
+    #Portion of the requests answered with failure_status
+    failure_rate: float = 0
+    failure_status: int = 500
+    #Portion of the requests that only get an answer after hang_duration (client timeouts)
+    hang_rate: float = 0
+    hang_duration: float = 15
+    #Only the paths containing one of these strings are affected by the failures, all of them if empty
+    failure_paths: tuple[str, ...] = ()
+    seed: int = 1
+
+class XTMockTuyaCloud:
+    def __init__(
+        self,
+        devices: list[XTDevice],
+        behaviour: XTMockCloudBehaviour | None = None,
+        broker: XTMockMQTTBroker | None = None,
+        access_id: str = MOCK_ACCESS_ID,
+        access_secret: str = MOCK_ACCESS_SECRET,
+        token_ttl: int = MOCK_TOKEN_TTL,
+    ) -> None:
+        self.devices: dict[str, XTDevice] = {device.id: device for device in devices}
+        self.behaviour = behaviour or XTMockCloudBehaviour()
+        self.broker = broker
+        self.access_id = access_id
+        self.access_secret = access_secret
+        self.token_ttl = token_ttl
+        #Access token => (refresh token, expiration time in ms)
+        self.tokens: dict[str, tuple[str, int]] = {}
+        self.refresh_tokens: set[str] = set()
+        #Sharing access token => (refresh token, expiration time in ms)
+        self.sharing_tokens: dict[str, tuple[str, int]] = {}
+        self.sharing_commands: list[tuple[str, dict]] = []
+        self.triggered_scenes: list[str] = []
+        self.request_counts: dict[str, int] = {}
+        self.issued_properties: list[tuple[str, dict]] = []
+        self.door_operations: list[str] = []
+        self.random = random.Random(self.behaviour.seed)
+        self.lock = threading.Lock()
+        self.request_times: list[float] = []
+        self.server: ThreadingHTTPServer | None = None
+        self.routes: list[tuple[str, re.Pattern, Any]] = [
+            ("POST", re.compile(r"^/v1\.0/iot-01/associated-users/actions/authorized-login$"), self._login),
+            ("POST", re.compile(r"^/v1\.0/iot-03/users/login$"), self._login),
+            ("GET", re.compile(r"^/v1\.0/token/(?P<refresh_token>[^/]+)$"), self._refresh_token),
+            ("POST", re.compile(r"^/v1\.0/iot-03/users/token/(?P<refresh_token>[^/]+)$"), self._refresh_token),
+            ("POST", re.compile(r"^/v1\.0/(iot-03/open-hub/access-config|open-hub/access/config)$"), self._mqtt_config),
+            ("GET", re.compile(r"^/v1\.0/users/(?P<uid>[^/]+)/devices$"), self._device_list),
+            ("GET", re.compile(r"^/v1\.0/devices/(?P<device_id>[^/]+)$"), self._device_info),
+            ("GET", re.compile(r"^/v2\.0/cloud/thing/(?P<device_id>[^/]+)$"), self._thing_info),
+            ("GET", re.compile(r"^/v1\.0/(iot-03/)?devices/(?P<device_id>[^/]+)/status$"), self._device_status),
+            ("GET", re.compile(r"^/v1\.0/(iot-03/)?devices/(?P<device_id>[^/]+)/specifications?$"), self._device_specification),
+            ("POST", re.compile(r"^/v1\.0/(iot-03/)?devices/(?P<device_id>[^/]+)/commands$"), self._device_commands),
+            ("GET", re.compile(r"^/v2\.0/cloud/thing/(?P<device_id>[^/]+)/model$"), self._thing_model),
+            ("GET", re.compile(r"^/v2\.0/cloud/thing/(?P<device_id>[^/]+)/shadow/properties$"), self._shadow_properties),
+            ("POST", re.compile(r"^/v2\.0/cloud/thing/(?P<device_id>[^/]+)/shadow/properties/issue$"), self._issue_properties),
+            ("GET", re.compile(r"^/v1\.0/devices/(?P<device_id>[^/]+)/webrtc-configs$"), self._webrtc_configs),
+            ("GET", re.compile(r"^/v1\.0/devices/(?P<device_id>[^/]+)/door-lock/remote-unlocks$"), self._remote_unlocks),
+            ("POST", re.compile(r"^/v1\.0/devices/(?P<device_id>[^/]+)/door-lock/password-ticket$"), self._password_ticket),
+            ("POST", re.compile(r"^/v1\.0/smart-lock/devices/(?P<device_id>[^/]+)/password-free/door-operate$"), self._door_operate),
+        ]
+        self.sharing_routes: list[tuple[str, re.Pattern, Any]] = [
+            ("GET", re.compile(r"^/v1\.0/m/token/(?P<refresh_token>[^/]+)$"), self._sharing_refresh_token),
+            ("POST", re.compile(r"^/v1\.0/m/token/terminal/expire$"), self._sharing_acknowledge),
+            ("POST", re.compile(r"^/v1\.0/m/life/home-assistant/qrcode/versions$"), self._sharing_acknowledge),
+            ("GET", re.compile(r"^/v1\.0/m/life/users/homes$"), self._sharing_homes),
+            ("GET", re.compile(r"^/v1\.0/m/thing/ha/(?P<device_id>[^/]+)/room$"), self._sharing_room),
+            ("GET", re.compile(r"^/v1\.0/m/life/ha/home/devices$"), self._sharing_home_devices),
+            ("GET", re.compile(r"^/v1\.0/m/life/ha/devices/detail$"), self._sharing_device_details),
+            ("GET", re.compile(r"^/v1\.1/m/life/(?P<device_id>[^/]+)/specifications$"), self._sharing_specification),
+            ("GET", re.compile(r"^/v1\.0/m/life/devices/(?P<device_id>[^/]+)/status$"), self._sharing_strategy),
+            ("GET", re.compile(r"^/v1\.0/m/life/ha/(?P<device_id>[^/]+)/code/custom-type$"), self._sharing_custom_type),
+            ("GET", re.compile(r"^/v1\.0/m/life/ha/(?P<device_id>[^/]+)/dp-report-types$"), self._sharing_report_types),
+            ("POST", re.compile(r"^/v1\.1/m/thing/(?P<device_id>[^/]+)/commands$"), self._sharing_commands),
+            ("POST", re.compile(r"^/v1\.0/m/ipc/(?P<device_id>[^/]+)/stream/actions/allocate$"), self._sharing_stream_allocate),
+            ("POST", re.compile(r"^/v1\.0/m/life/ha/access/config$"), self._sharing_mqtt_config),
+            ("GET", re.compile(r"^/v1\.0/m/scene/ha/home/scenes$"), self._sharing_scenes),
+            ("POST", re.compile(r"^/v1\.0/m/scene/ha/trigger$"), self._sharing_trigger_scene),
+        ]
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def start(self) -> XTMockTuyaCloud:
+        cloud = self
+
+        class XTMockTuyaCloudHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            #The headers and the body are written separately, don't let Nagle delay the body
+            disable_nagle_algorithm = True
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _handle(self) -> None:
+                content_length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(content_length) if content_length else b""
+                status, payload = cloud.handle(self.command, self.path, body, self.headers)
+                content = json.dumps(payload).encode("utf8")
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(content)))
+                    self.end_headers()
+                    self.wfile.write(content)
+                except (BrokenPipeError, ConnectionResetError):
+                    #The client stopped waiting (timeout of a hanging request)
+                    self.close_connection = True
+
+            do_GET = _handle
+            do_POST = _handle
+            do_PUT = _handle
+            do_DELETE = _handle
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), XTMockTuyaCloudHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def handle(self, method: str, raw_path: str, body: bytes, headers: Any) -> tuple[int, dict[str, Any]]:
+        url = urlsplit(raw_path)
+        now = time.monotonic()
+        sharing = "X-requestId" in headers
+        routes = self.sharing_routes if sharing else self.routes
+        with self.lock:
+            template = self._get_route_name(routes, method, url.path)
+            self.request_counts[template] = self.request_counts.get(template, 0) + 1
+            throttled = self._is_throttled(now)
+            failure_draw = self.random.random()
+            hang_draw = self.random.random()
+            jitter = self.random.random() * self.behaviour.latency_jitter
+        if self.behaviour.latency or jitter:
+            time.sleep(self.behaviour.latency + jitter)
+        if throttled:
+            return 429, {"success": False, "code": 429, "msg": "too many requests", "t": self._now_ms()}
+        if self._is_failure_path(url.path):
+            if failure_draw < self.behaviour.failure_rate:
+                return self.behaviour.failure_status, {"success": False, "code": self.behaviour.failure_status, "msg": "injected failure", "t": self._now_ms()}
+            if hang_draw < self.behaviour.hang_rate:
+                time.sleep(self.behaviour.hang_duration)
+        if sharing:
+            return self._handle_sharing(method, url.path, url.query, body, headers)
+        if error := self._check_request(method, url.path, url.query, body, headers):
+            return 200, error
+        params = dict(parse_qsl(url.query))
+        request_body = json.loads(body) if body else {}
+        return 200, self._dispatch(self.routes, method, url.path, params, request_body)
+
+    def _handle_sharing(self, method: str, path: str, query: str, body: bytes, headers: Any) -> tuple[int, dict[str, Any]]:
+        secret, error = self._check_sharing_request(path, query, body, headers)
+        if error:
+            return 200, error
+        query_encdata = dict(parse_qsl(query)).get("encdata")
+        body_encdata = json.loads(body).get("encdata") if body else None
+        params = json.loads(_sharing_decrypt(query_encdata, secret)) if query_encdata else {}
+        request_body = json.loads(_sharing_decrypt(body_encdata, secret)) if body_encdata else {}
+        response = self._dispatch(self.sharing_routes, method, path, params, request_body)
+        if response.get("result"):
+            response["result"] = _sharing_encrypt(json.dumps(response["result"]), secret)
+        return 200, response
+
+    def _dispatch(self, routes: list[tuple[str, re.Pattern, Any]], method: str, path: str, params: dict, body: dict) -> dict[str, Any]:
+        for route_method, route_path, route_handler in routes:
+            if route_method != method:
+                continue
+            if match := route_path.match(path):
+                return self._success(route_handler(params=params, body=body, **match.groupdict()))
+        return self._error(TUYA_CODE_URI_PATH_INVALID, "uri path invalid")
+
+    def _get_route_name(self, routes: list[tuple[str, re.Pattern, Any]], method: str, path: str) -> str:
+        for route_method, route_path, route_handler in routes:
+            if route_method == method and route_path.match(path):
+                return f"{method} {route_handler.__name__.lstrip('_')}"
+        return f"{method} unknown"
+
+    def _is_throttled(self, now: float) -> bool:
+        #Must be called with the lock held, sliding window of one second
+        if not self.behaviour.max_requests_per_second:
+            return False
+        while self.request_times and now - self.request_times[0] > 1:
+            self.request_times.pop(0)
+        if len(self.request_times) >= self.behaviour.max_requests_per_second:
+            return True
+        self.request_times.append(now)
+        return False
+
+    def _is_failure_path(self, path: str) -> bool:
+        if not self.behaviour.failure_paths:
+            return True
+        return any(failure_path in path for failure_path in self.behaviour.failure_paths)
+
+    def _check_request(self, method: str, path: str, query: str, body: bytes, headers: Any) -> dict[str, Any] | None:
+        #Same signature as XTIOTOpenAPI._calculate_sign
+        access_token = headers.get("access_token", "")
+        #An empty body is signed as an empty string even when requests sends "{}"
+        signed_body = b"" if body in (b"", b"{}") else body
+        str_to_sign = method + "\n" + hashlib.sha256(signed_body).hexdigest().lower() + "\n\n" + path
+        if query:
+            str_to_sign += "?" + "&".join(f"{key}={value}" for key, value in sorted(parse_qsl(query)))
+        message = headers.get("client_id", "") + access_token + headers.get("t", "") + str_to_sign
+        expected_sign = hmac.new(self.access_secret.encode("utf8"), msg=message.encode("utf8"), digestmod=hashlib.sha256).hexdigest().upper()
+        if headers.get("client_id") != self.access_id or not hmac.compare_digest(expected_sign, headers.get("sign", "")):
+            return self._error(TUYA_CODE_SIGN_INVALID, "sign invalid")
+        if "/token/" in path or path.endswith("/login") or path.endswith("/authorized-login"):
+            return None
+        with self.lock:
+            token = self.tokens.get(access_token)
+        if token is None or token[1] < self._now_ms():
+            return self._error(TUYA_CODE_TOKEN_INVALID, "token invalid")
+        return None
+
+    def _check_sharing_request(self, path: str, query: str, body: bytes, headers: Any) -> tuple[str | None, dict[str, Any] | None]:
+        #Same signature as tuya_sharing's CustomerApi: the request key is derived from the refresh token of the access token
+        access_token = headers.get("X-token", "")
+        with self.lock:
+            token = self.sharing_tokens.get(access_token)
+        if token is None:
+            return None, self._error(TUYA_CODE_TOKEN_INVALID, "token invalid")
+        request_id = headers.get("X-requestId", "")
+        hash_key = hashlib.md5((request_id + token[0]).encode("utf8")).hexdigest()
+        secret = hmac.new(request_id.encode("utf8"), hash_key.encode("utf8"), hashlib.sha256).hexdigest()[:16]
+        sign_str = "||".join(
+            f"{header}={headers.get(header)}"
+            for header in ("X-appKey", "X-requestId", "X-sid", "X-time", "X-token")
+            if headers.get(header)
+        )
+        sign_str += dict(parse_qsl(query)).get("encdata", "")
+        if body:
+            sign_str += json.loads(body).get("encdata", "")
+        expected_sign = hmac.new(hash_key.encode("utf8"), sign_str.encode("utf8"), hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(expected_sign, headers.get("X-sign", "")):
+            return None, self._error(TUYA_CODE_SIGN_INVALID, "sign invalid")
+        if not path.startswith("/v1.0/m/token/") and token[1] < self._now_ms():
+            return None, self._error(TUYA_CODE_TOKEN_INVALID, "token invalid")
+        return secret, None
+
+    def _now_ms(self) -> int:
+        return int(time.time() * 1000)
+
+    def _success(self, result: Any) -> dict[str, Any]:
+        return {"success": True, "result": result, "t": self._now_ms()}
+
+    def _error(self, code: int, msg: str) -> dict[str, Any]:
+        return {"success": False, "code": code, "msg": msg, "t": self._now_ms()}
+
+    def _get_device(self, device_id: str) -> XTDevice:
+        return self.devices[device_id]
+
+    def _new_token(self) -> dict[str, Any]:
+        access_token = uuid.uuid4().hex
+        refresh_token = uuid.uuid4().hex
+        with self.lock:
+            self.tokens[access_token] = (refresh_token, self._now_ms() + self.token_ttl * 1000)
+            self.refresh_tokens.add(refresh_token)
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "expire_time": self.token_ttl,
+            "uid": MOCK_UID,
+            "platform_url": self.endpoint,
+        }
+
+    def _login(self, params: dict, body: dict) -> dict[str, Any]:
+        return self._new_token()
+
+    def _refresh_token(self, params: dict, body: dict, refresh_token: str) -> dict[str, Any]:
+        with self.lock:
+            self.refresh_tokens.discard(refresh_token)
+        return self._new_token()
+
+    def _mqtt_config(self, params: dict, body: dict) -> dict[str, Any]:
+        port = self.broker.port if self.broker is not None else 0
+        return {
+            "url": f"tcp://127.0.0.1:{port}",
+            "client_id": f"mock_{body.get('topics', 'device')}_{uuid.uuid4().hex[:8]}",
+            "username": f"cloud_{MOCK_UID}",
+            "password": MOCK_MQTT_PASSWORD,
+            "source_topic": {body.get("topics", "device"): f"cloud/token/in/{body.get('topics', 'device')}/{MOCK_UID}"},
+            "sink_topic": {"ipc": "/av/moto/moto_id/u/{device_id}"},
+            "expire_time": MOCK_TOKEN_TTL,
+        }
+
+    def _get_device_dict(self, device: XTDevice) -> dict[str, Any]:
+        return {
+            "id": device.id,
+            "name": device.name,
+            "local_key": "mock_local_key",
+            "category": device.category,
+            "product_id": device.product_id,
+            "product_name": f"Product {device.product_id}",
+            "sub": False,
+            "uuid": device.id,
+            "asset_id": "mock_asset",
+            "online": device.online,
+            "icon": "",
+            "ip": "127.0.0.1",
+            "time_zone": "+00:00",
+            "active_time": 0,
+            "create_time": 0,
+            "update_time": 0,
+            "status": [{"code": code, "value": value} for code, value in device.status.items()],
+        }
+
+    def _device_list(self, params: dict, body: dict, uid: str) -> list[dict[str, Any]]:
+        if params.get("from") == "sharing":
+            return []
+        return [self._get_device_dict(device) for device in self.devices.values()]
+
+    def _device_info(self, params: dict, body: dict, device_id: str) -> dict[str, Any]:
+        return self._get_device_dict(self._get_device(device_id))
+
+    def _thing_info(self, params: dict, body: dict, device_id: str) -> dict[str, Any]:
+        device_dict = self._get_device_dict(self._get_device(device_id))
+        device_dict["is_online"] = device_dict["online"]
+        return device_dict
+
+    def _device_status(self, params: dict, body: dict, device_id: str) -> list[dict[str, Any]]:
+        return [{"code": code, "value": value} for code, value in self._get_device(device_id).status.items()]
+
+    def _device_specification(self, params: dict, body: dict, device_id: str) -> dict[str, Any]:
+        device = self._get_device(device_id)
+        return {
+            "category": device.category,
+            "functions": [{"code": function.code, "type": function.type, "values": function.values} for function in device.function.values()],
+            "status": [{"code": status_range.code, "type": status_range.type, "values": status_range.values} for status_range in device.status_range.values()],
+        }
+
+    def _device_commands(self, params: dict, body: dict, device_id: str) -> bool:
+        return True
+
+    def _thing_model(self, params: dict, body: dict, device_id: str) -> dict[str, Any]:
+        return {"model": self._get_device(device_id).data_model}
+
+    def _shadow_properties(self, params: dict, body: dict, device_id: str) -> dict[str, Any]:
+        device = self._get_device(device_id)
+        return {
+            "properties": [
+                {"code": get_dp_code(dp_id), "dp_id": dp_id, "time": self._now_ms(), "value": device.status.get(get_dp_code(dp_id), 0)}
+                for dp_id in range(1, DEVICE_DP_COUNT + 1)
+            ]
+        }
+
+    def _issue_properties(self, params: dict, body: dict, device_id: str) -> dict[str, Any]:
+        with self.lock:
+            self.issued_properties.append((device_id, body))
+        return {}
+
+    def _webrtc_configs(self, params: dict, body: dict, device_id: str) -> dict[str, Any]:
+        return {
+            "audio_attributes": {"call_mode": [1, 2], "hardware_capability": [1]},
+            "auth": uuid.uuid4().hex,
+            "id": device_id,
+            "moto_id": "mock_moto",
+            "p2p_config": {
+                "ices": [
+                    {"urls": "stun:127.0.0.1:3478"},
+                    {"urls": "turn:127.0.0.1:3478", "username": "mock_user", "credential": "mock_password", "ttl": 600},
+                ],
+            },
+            "skill": json.dumps({"videos": [
+                {"streamType": 2, "width": 1920, "height": 1080},
+                {"streamType": 4, "width": 640, "height": 360},
+            ]}),
+            "supports_webrtc": True,
+        }
+
+    def _remote_unlocks(self, params: dict, body: dict, device_id: str) -> list[dict[str, Any]]:
+        return [{"remote_unlock_type": "remoteUnlockWithoutPwd", "open": True}]
+
+    def _password_ticket(self, params: dict, body: dict, device_id: str) -> dict[str, Any]:
+        return {"ticket_id": uuid.uuid4().hex, "ticket_key": uuid.uuid4().hex, "expire_time": 300}
+
+    def _door_operate(self, params: dict, body: dict, device_id: str) -> bool:
+        with self.lock:
+            self.door_operations.append(device_id)
+        return True
+
+    def new_sharing_token(self) -> dict[str, Any]:
+        #Token info of a sharing account, as stored in the config entry (CustomerTokenInfo)
+        access_token = uuid.uuid4().hex
+        refresh_token = uuid.uuid4().hex
+        with self.lock:
+            self.sharing_tokens[access_token] = (refresh_token, self._now_ms() + self.token_ttl * 1000)
+        return {
+            "t": self._now_ms(),
+            "expire_time": self.token_ttl,
+            "uid": MOCK_UID,
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+        }
+
+    def _sharing_refresh_token(self, params: dict, body: dict, refresh_token: str) -> dict[str, Any]:
+        with self.lock:
+            for access_token, token in list(self.sharing_tokens.items()):
+                if token[0] == refresh_token:
+                    del self.sharing_tokens[access_token]
+        token_info = self.new_sharing_token()
+        return {
+            "expireTime": token_info["expire_time"],
+            "uid": token_info["uid"],
+            "accessToken": token_info["access_token"],
+            "refreshToken": token_info["refresh_token"],
+        }
+
+    def _sharing_acknowledge(self, params: dict, body: dict) -> bool:
+        return True
+
+    def _sharing_homes(self, params: dict, body: dict) -> list[dict[str, Any]]:
+        return [{"ownerId": MOCK_SHARING_HOME_ID, "name": "Mock home"}]
+
+    def _sharing_room(self, params: dict, body: dict, device_id: str) -> dict[str, Any]:
+        return {"id": "1", "name": "Mock room", "displayOrder": 0}
+
+    def _sharing_home_devices(self, params: dict, body: dict) -> list[dict[str, Any]]:
+        if params.get("homeId") != MOCK_SHARING_HOME_ID:
+            return []
+        return [self._get_device_dict(device) for device in self.devices.values()]
+
+    def _sharing_device_details(self, params: dict, body: dict) -> list[dict[str, Any]]:
+        device_ids = params.get("devIds", "").split(",")
+        return [self._get_device_dict(self.devices[device_id]) for device_id in device_ids if device_id in self.devices]
+
+    def _sharing_specification(self, params: dict, body: dict, device_id: str) -> dict[str, Any]:
+        device = self._get_device(device_id)
+        return {
+            "category": device.category,
+            "functions": [
+                {"code": function.code, "type": function.type, "values": function.values, "desc": "", "name": function.code}
+                for function in device.function.values()
+            ],
+            "status": [{"code": status_range.code, "type": status_range.type, "values": status_range.values} for status_range in device.status_range.values()],
+        }
+
+    def _sharing_strategy(self, params: dict, body: dict, device_id: str) -> dict[str, Any]:
+        device = self._get_device(device_id)
+        return {
+            "productKey": device.product_id,
+            "dpStatusRelationDTOS": [
+                {
+                    "dpId": dp_id,
+                    "supportLocal": True,
+                    "valueConvert": strategy["value_convert"],
+                    "statusCode": strategy["status_code"],
+                    "statusFormat": strategy["config_item"]["statusFormat"],
+                    "valueDesc": strategy["config_item"]["valueDesc"],
+                    "valueType": strategy["config_item"]["valueType"],
+                    "enumMappingMap": {},
+                }
+                for dp_id, strategy in device.local_strategy.items()
+            ],
+        }
+
+    def _sharing_custom_type(self, params: dict, body: dict, device_id: str) -> bool:
+        return False
+
+    def _sharing_report_types(self, params: dict, body: dict, device_id: str) -> list[dict[str, Any]]:
+        return []
+
+    def _sharing_commands(self, params: dict, body: dict, device_id: str) -> bool:
+        with self.lock:
+            self.sharing_commands.append((device_id, body))
+        return True
+
+    def _sharing_stream_allocate(self, params: dict, body: dict, device_id: str) -> dict[str, Any]:
+        return {"url": f"rtsp://127.0.0.1/{device_id}/{body.get('type', 'rtsp')}"}
+
+    def _sharing_mqtt_config(self, params: dict, body: dict) -> dict[str, Any]:
+        port = self.broker.port if self.broker is not None else 0
+        return {
+            "url": f"tcp://127.0.0.1:{port}",
+            "clientId": f"mock_sharing_{uuid.uuid4().hex[:8]}",
+            "username": f"cloud_{MOCK_UID}",
+            "password": MOCK_MQTT_PASSWORD,
+            "expireTime": MOCK_TOKEN_TTL,
+            "topic": {
+                "ownerId": {"sub": "cloud/m/ha/owner/{ownerId}"},
+                "devId": {"sub": "cloud/m/ha/device/{devId}"},
+            },
+        }
+
+    def _sharing_scenes(self, params: dict, body: dict) -> list[dict[str, Any]]:
+        if params.get("homeId") != MOCK_SHARING_HOME_ID:
+            return []
+        return [
+            {"scene_id": f"scene{index}", "name": f"Scene {index}", "enabled": True, "actions": []}
+            for index in range(MOCK_SHARING_SCENE_COUNT)
+        ]
+
+    def _sharing_trigger_scene(self, params: dict, body: dict) -> bool:
+        with self.lock:
+            self.triggered_scenes.append(body.get("sceneId"))
+        return True
+
+def _sharing_encrypt(data: str, secret: str) -> str:
+    #Same layout as tuya_sharing's _aes_gcm_encrypt: base64 of the nonce followed by base64 of the ciphertext and tag
+    nonce = "".join(random.choices(string.ascii_letters + string.digits, k=SHARING_NONCE_LENGTH)).encode("utf8")
+    cipher = AES.new(secret.encode("utf8"), AES.MODE_GCM, nonce=nonce)
+    ciphertext, tag = cipher.encrypt_and_digest(data.encode("utf8"))
+    return (base64.b64encode(nonce) + base64.b64encode(ciphertext + tag)).decode("utf8")
+
+def _sharing_decrypt(data: str, secret: str) -> str:
+    nonce = base64.b64decode(data[:SHARING_NONCE_B64_LENGTH])
+    payload = base64.b64decode(data[SHARING_NONCE_B64_LENGTH:])
+    cipher = AES.new(secret.encode("utf8"), AES.MODE_GCM, nonce=nonce)
+    return cipher.decrypt_and_verify(payload[:-16], payload[-16:]).decode("utf8")
+
+def encrypt_smart_home_message(data: dict[str, Any], password: str = MOCK_MQTT_PASSWORD) -> str:
+    #Reverse of TuyaOpenMQ._decode_mq_message for the SMART_HOME projects (AES-ECB, PKCS7 padding)
+    plaintext = json.dumps(data).encode("utf8")
+    padding = 16 - len(plaintext) % 16
+    cipher = AES.new(password[8:24].encode("utf8"), AES.MODE_ECB)
+    return base64.b64encode(cipher.encrypt(plaintext + bytes([padding]) * padding)).decode("utf8")
+
+def make_device_report_payload(device_id: str, status: list[dict[str, Any]]) -> bytes:
+    t = int(time.time() * 1000)
+    data = {"devId": device_id, "status": status}
+    return json.dumps({"protocol": 4, "pv": "2.0", "sign": "", "t": t, "data": encrypt_smart_home_message(data)}).encode("utf8")
+
+def _encode_remaining_length(length: int) -> bytes:
+    encoded = bytearray()
+    while True:
+        byte = length % 128
+        length //= 128
+        if length:
+            byte |= 0x80
+        encoded.append(byte)
+        if not length:
+            return bytes(encoded)
+
+def _encode_string(value: str) -> bytes:
+    encoded = value.encode("utf8")
+    return struct.pack("!H", len(encoded)) + encoded
+
+def _topic_matches(topic_filter: str, topic: str) -> bool:
+    filter_levels = topic_filter.split("/")
+    topic_levels = topic.split("/")
+    for index, filter_level in enumerate(filter_levels):
+        if filter_level == "#":
+            return True
+        if index >= len(topic_levels):
+            return False
+        if filter_level != "+" and filter_level != topic_levels[index]:
+            return False
+    return len(filter_levels) == len(topic_levels)
+
+class XTMockMQTTConnection:
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.subscriptions: set[str] = set()
+        self.write_lock = threading.Lock()
+
+    def send(self, packet_type: int, flags: int, payload: bytes) -> None:
+        with self.write_lock:
+            self.sock.sendall(bytes([(packet_type << 4) | flags]) + _encode_remaining_length(len(payload)) + payload)
+
+class XTMockMQTTBroker:
+    def __init__(self, username: str | None = None, password: str | None = None) -> None:
+        #Credentials checked on CONNECT when set
+        self.username = username
+        self.password = password
+        self.connections: list[XTMockMQTTConnection] = []
+        self.received: list[tuple[str, bytes]] = []
+        self.lock = threading.Lock()
+        self.subscribed = threading.Condition(self.lock)
+        self.server: socketserver.ThreadingTCPServer | None = None
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    def start(self) -> XTMockMQTTBroker:
+        broker = self
+
+        class XTMockMQTTHandler(socketserver.BaseRequestHandler):
+            def handle(self) -> None:
+                broker._serve(self.request)
+
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), XTMockMQTTHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        with self.lock:
+            connections = list(self.connections)
+        for connection in connections:
+            try:
+                connection.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def wait_for_subscription(self, topic: str, timeout: float = 10) -> bool:
+        with self.subscribed:
+            return self.subscribed.wait_for(
+                lambda: any(_topic_matches(topic_filter, topic) for connection in self.connections for topic_filter in connection.subscriptions),
+                timeout,
+            )
+
+    def publish(self, topic: str, payload: bytes) -> int:
+        #Delivered with QoS 0, returns the number of subscribers that received the message
+        packet = _encode_string(topic) + payload
+        with self.lock:
+            connections = [
+                connection for connection in self.connections
+                if any(_topic_matches(topic_filter, topic) for topic_filter in connection.subscriptions)
+            ]
+        for connection in connections:
+            try:
+                connection.send(MQTT_PUBLISH, 0, packet)
+            except OSError:
+                continue
+        return len(connections)
+
+    def _read_exactly(self, sock: socket.socket, length: int) -> bytes:
+        data = bytearray()
+        while len(data) < length:
+            chunk = sock.recv(length - len(data))
+            if not chunk:
+                raise ConnectionError
+            data.extend(chunk)
+        return bytes(data)
+
+    def _read_packet(self, sock: socket.socket) -> tuple[int, int, bytes]:
+        header = self._read_exactly(sock, 1)[0]
+        multiplier = 1
+        length = 0
+        while True:
+            byte = self._read_exactly(sock, 1)[0]
+            length += (byte & 0x7F) * multiplier
+            multiplier *= 128
+            if not byte & 0x80:
+                break
+        return header >> 4, header & 0x0F, self._read_exactly(sock, length)
+
+    def _serve(self, sock: socket.socket) -> None:
+        connection = XTMockMQTTConnection(sock)
+        try:
+            packet_type, _, payload = self._read_packet(sock)
+            if packet_type != MQTT_CONNECT or not self._accept_connect(payload):
+                connection.send(MQTT_CONNACK, 0, b"\x00\x05")
+                return
+            connection.send(MQTT_CONNACK, 0, b"\x00\x00")
+            with self.lock:
+                self.connections.append(connection)
+            while True:
+                packet_type, flags, payload = self._read_packet(sock)
+                if packet_type == MQTT_PUBLISH:
+                    self._on_publish(connection, flags, payload)
+                elif packet_type == MQTT_SUBSCRIBE:
+                    self._on_subscribe(connection, payload)
+                elif packet_type == MQTT_UNSUBSCRIBE:
+                    connection.send(MQTT_UNSUBACK, 0, payload[:2])
+                elif packet_type == MQTT_PINGREQ:
+                    connection.send(MQTT_PINGRESP, 0, b"")
+                elif packet_type == MQTT_DISCONNECT:
+                    return
+        except (ConnectionError, OSError):
+            return
+        finally:
+            with self.lock:
+                if connection in self.connections:
+                    self.connections.remove(connection)
+
+    def _accept_connect(self, payload: bytes) -> bool:
+        if self.username is None:
+            return True
+        #Variable header: protocol name, level, flags, keep alive
+        protocol_name_length = struct.unpack("!H", payload[:2])[0]
+        offset = 2 + protocol_name_length
+        connect_flags = payload[offset + 1]
+        offset += 4
+        fields: list[str] = []
+        while offset < len(payload):
+            field_length = struct.unpack("!H", payload[offset:offset + 2])[0]
+            fields.append(payload[offset + 2:offset + 2 + field_length].decode("utf8"))
+            offset += 2 + field_length
+        #Client id, [will topic, will message], username, password
+        credentials = fields[3:] if connect_flags & 0x04 else fields[1:]
+        return credentials == [self.username, self.password]
+
+    def _on_publish(self, connection: XTMockMQTTConnection, flags: int, payload: bytes) -> None:
+        qos = (flags >> 1) & 0x03
+        topic_length = struct.unpack("!H", payload[:2])[0]
+        topic = payload[2:2 + topic_length].decode("utf8")
+        offset = 2 + topic_length
+        if qos:
+            packet_id = payload[offset:offset + 2]
+            offset += 2
+            connection.send(MQTT_PUBACK, 0, packet_id)
+        with self.lock:
+            self.received.append((topic, payload[offset:]))
+        self.publish(topic, payload[offset:])
+
+    def _on_subscribe(self, connection: XTMockMQTTConnection, payload: bytes) -> None:
+        packet_id = payload[:2]
+        offset = 2
+        granted = bytearray()
+        topic_filters: list[str] = []
+        while offset < len(payload):
+            topic_length = struct.unpack("!H", payload[offset:offset + 2])[0]
+            topic_filters.append(payload[offset + 2:offset + 2 + topic_length].decode("utf8"))
+            offset += 2 + topic_length + 1
+            granted.append(0)
+        connection.send(MQTT_SUBACK, 0, packet_id + bytes(granted))
+        with self.subscribed:
+            connection.subscriptions.update(topic_filters)
+            self.subscribed.notify_all()
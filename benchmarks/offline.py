@@ -0,0 +1,99 @@
+"""Stand-ins for the integration requirements that are not installed.
+
+The startup and memory benchmarks only run the integration's own code (device
+classes, merge, CloudFixes, MultiManager.update_device_cache), but importing it
+goes through the package __init__ and const.py, which import Home Assistant and
+the Tuya SDKs. Importing this module before fleet.py replaces every requirement
+that can't be imported with a stub module, so those benchmarks run on a bare
+Python. Installed requirements are used as is.
+
+Stub modules return a stub class for any attribute: it can be subclassed,
+instantiated with any arguments, used as a decorator (it returns the decorated
+function) and its attributes are stub classes too. Nothing the benchmarks measure
+calls into them.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+import types
+from importlib.abc import Loader, MetaPathFinder
+from importlib.machinery import ModuleSpec
+
+#Top level packages imported by the integration modules the offline benchmarks load
+STUBBED_PACKAGES: tuple[str, ...] = (
+    "homeassistant",
+    "tuya_sharing",
+    "tuya_iot",
+    "voluptuous",
+    "aiohttp",
+    "multidict",
+)
+
+class _XTStubMeta(type):
+    def __getattr__(cls, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return _XTStubMeta(name, (XTStub,), {})
+
+    def __call__(cls, *args, **kwargs):
+        #Decorators (callback, dataclass-like helpers) hand the decorated object back
+        if len(args) == 1 and not kwargs and callable(args[0]):
+            return args[0]
+        return super().__call__(*args, **kwargs)
+
+    def __or__(cls, other):
+        return cls
+
+    def __ror__(cls, other):
+        return cls
+
+    def __getitem__(cls, item):
+        return cls
+
+    def __iter__(cls):
+        return iter(())
+
+class XTStub(metaclass=_XTStubMeta):
+    def __init__(self, *args, **kwargs) -> None:
+        pass
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return _XTStubMeta(name, (XTStub,), {})()
+
+class XTStubModule(types.ModuleType):
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = _XTStubMeta(name, (XTStub,), {})
+        setattr(self, name, value)
+        return value
+
+class XTStubFinder(MetaPathFinder, Loader):
+    def __init__(self, packages: set[str]) -> None:
+        self.packages = packages
+
+    def find_spec(self, fullname: str, path, target=None) -> ModuleSpec | None:
+        if fullname.split(".")[0] in self.packages:
+            return ModuleSpec(fullname, self, is_package=True)
+        return None
+
+    def create_module(self, spec: ModuleSpec) -> types.ModuleType:
+        module = XTStubModule(spec.name)
+        module.__path__ = []
+        return module
+
+    def exec_module(self, module: types.ModuleType) -> None:
+        pass
+
+def install_stubs(packages: tuple[str, ...] = STUBBED_PACKAGES) -> list[str]:
+    """Stub the packages that can't be imported, return their names."""
+    missing = [package for package in packages if package not in sys.modules and importlib.util.find_spec(package) is None]
+    if missing:
+        sys.meta_path.insert(0, XTStubFinder(set(missing)))
+    return missing
+
+STUBBED: list[str] = install_stubs()
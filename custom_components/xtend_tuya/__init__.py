@@ -21,6 +21,9 @@ from .multi_manager.multi_manager import (
 from .multi_manager.shared.shared_classes import (
     HomeAssistantXTData,
 )
+from .multi_manager.shared.descriptor_string_pool import (
+    XTDescriptorStringPool,
+)
 
 from .util import (
     get_config_entry_runtime_data
@@ -128,9 +131,12 @@ async def async_unload_entry(hass: HomeAssistant, entry: XTConfigEntry) -> bool:
     """Unloading the Tuya platforms."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         tuya = entry.runtime_data
+        await hass.async_add_executor_job(tuya.manager.command_queue.flush_all)
         if tuya.manager.mq is not None:
             tuya.manager.mq.stop()
         tuya.manager.remove_device_listeners()
+        #Only filled during update_device_cache, drop what an interrupted update left behind
+        XTDescriptorStringPool.clear()
     return unload_ok
 
 
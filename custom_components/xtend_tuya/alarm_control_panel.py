@@ -24,7 +24,8 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .util import (
-    merge_device_descriptors
+    get_merged_descriptors,
+    DeviceDescriptorIndex,
 )
 
 from .multi_manager.multi_manager import XTConfigEntry
@@ -65,9 +66,12 @@ async def async_setup_entry(
     """Set up Tuya alarm dynamically through Tuya discovery."""
     hass_data = entry.runtime_data
 
-    merged_descriptors = ALARM
-    for new_descriptor in entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.ALARM_CONTROL_PANEL):
-        merged_descriptors = merge_device_descriptors(merged_descriptors, new_descriptor)
+    merged_descriptors = get_merged_descriptors(
+        Platform.ALARM_CONTROL_PANEL,
+        ALARM,
+        entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.ALARM_CONTROL_PANEL),
+    )
+    descriptor_index = DeviceDescriptorIndex(merged_descriptors)
 
     @callback
     def async_discover_device(device_map) -> None:
@@ -76,12 +80,10 @@ async def async_setup_entry(
         device_ids = [*device_map]
         for device_id in device_ids:
             if device := hass_data.manager.device_map.get(device_id, None):
-                if descriptions := merged_descriptors.get(device.category):
-                    entities.extend(
-                        TuyaAlarmEntity(device, hass_data.manager, description)
-                        for description in descriptions
-                        if description.key in device.status
-                    )
+                entities.extend(
+                    TuyaAlarmEntity(device, hass_data.manager, description)
+                    for description in descriptor_index.get_descriptions_to_discover(device, device.status)
+                )
         async_add_entities(entities)
 
     hass_data.manager.register_device_descriptors("alarm_control", merged_descriptors)
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import base64
+import binascii
 from dataclasses import dataclass
 import json
 import struct
-from typing import Any, Literal, Self, overload
+from typing import Any, Callable, Literal, Self, overload
 
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
@@ -29,6 +29,30 @@ _DPTYPE_MAPPING: dict[str, DPType] = {
     "value": DPType.INTEGER,
 }
 
+# String to enum lookups, XT DPCodes take precedence over the ones from the core integration
+_DPCODE_LOOKUP: dict[str, DPCode | DPCode_tuya] = {
+    **{dpcode.value: dpcode for dpcode in DPCode_tuya},
+    **{dpcode.value: dpcode for dpcode in DPCode},
+}
+_DPTYPE_LOOKUP: dict[str, DPType] = {
+    **_DPTYPE_MAPPING,
+    **{dptype.value: dptype for dptype in DPType},
+}
+
+# Parsed EnumTypeData/IntegerTypeData per device id, keyed by (code, dptype, prefer_function)
+_TYPE_DATA_CACHE: dict[
+    str,
+    dict[tuple[str, DPType, bool], tuple[str, Any, Any, "EnumTypeData | IntegerTypeData"]],
+] = {}
+
+# Decoded JSON/RAW status values per device id, keyed by (code, decoder)
+# Each entry keeps the raw value it was decoded from, a new report replaces that value
+_DECODED_VALUE_CACHE: dict[str, dict[tuple[str, Callable[[Any], Any]], tuple[Any, Any]]] = {}
+
+# RAW electricity layout: voltage (2 bytes), current (3 bytes), power (3 bytes), big endian
+_ELECTRICITY_RAW_STRUCT = struct.Struct(">HBHBH")
+_ELECTRICITY_RAW_PHASES: tuple[str, ...] = (DPCode.PHASE_A, DPCode.PHASE_B, DPCode.PHASE_C)
+
 
 @dataclass
 class IntegerTypeData:
@@ -133,15 +157,28 @@ class ElectricityTypeData:
     @classmethod
     def from_raw(cls, data: str) -> Self:
         """Decode base64 string and return a ElectricityTypeData object."""
-        raw = base64.b64decode(data)
-        if len(raw) < 8:
-            return cls(electriccurrent=None, power=None, voltage=None)
-        voltage = struct.unpack(">H", raw[0:2])[0] / 10.0
-        electriccurrent = struct.unpack(">L", b"\x00" + raw[2:5])[0] / 1000.0
-        power = struct.unpack(">L", b"\x00" + raw[5:8])[0] / 1000.0
-        return cls(
-            electriccurrent=str(electriccurrent), power=str(power), voltage=str(voltage)
-        )
+        return cls.from_raw_batch([data])[0]
+
+    @classmethod
+    def from_raw_batch(cls, data: list[str]) -> list[Self]:
+        """Decode several base64 strings (e.g. all the phases of a report) at once."""
+        unpack_from = _ELECTRICITY_RAW_STRUCT.unpack_from
+        size = _ELECTRICITY_RAW_STRUCT.size
+        results: list[Self] = []
+        #Same decoding as base64.b64decode without its argument conversions
+        for raw in map(binascii.a2b_base64, data):
+            if len(raw) < size:
+                results.append(cls(electriccurrent=None, power=None, voltage=None))
+                continue
+            voltage, current_high, current_low, power_high, power_low = unpack_from(raw)
+            results.append(
+                cls(
+                    electriccurrent=str(((current_high << 16) | current_low) / 1000.0),
+                    power=str(((power_high << 16) | power_low) / 1000.0),
+                    voltage=str(voltage / 10.0),
+                )
+            )
+        return results
 
 
 class TuyaEntity(Entity):
@@ -211,10 +248,10 @@ class TuyaEntity(Entity):
             return None
 
         if isinstance(dpcodes, str):
-            try:
-                dpcodes = (DPCode(dpcodes),)
-            except ValueError:
-                dpcodes = (DPCode_tuya(dpcodes),)
+            if (dpcode := _DPCODE_LOOKUP.get(dpcodes)) is None:
+                # Unknown code, let the enum raise the usual ValueError
+                dpcode = DPCode_tuya(dpcodes)
+            dpcodes = (dpcode,)
         elif not isinstance(dpcodes, tuple):
             dpcodes = (dpcodes,)
 
@@ -228,6 +265,9 @@ class TuyaEntity(Entity):
             order.append("status")
 
         for dpcode in dpcodes:
+            if dptype in (DPType.ENUM, DPType.INTEGER):
+                if type_data := self._get_cached_type_data(dpcode, dptype, prefer_function, order):
+                    return type_data
             for key in order:
                 if dpcode not in getattr(self.device, key):
                     continue
@@ -241,6 +281,7 @@ class TuyaEntity(Entity):
                         )
                     ):
                         continue
+                    self._set_cached_type_data(dpcode, dptype, prefer_function, key, enum_type)
                     return enum_type
 
                 if (
@@ -254,6 +295,7 @@ class TuyaEntity(Entity):
                             )
                         ):
                             continue
+                        self._set_cached_type_data(dpcode, dptype, prefer_function, key, integer_type)
                         return integer_type
                     except TypeError:
                         LOGGER.warning(
@@ -265,6 +307,76 @@ class TuyaEntity(Entity):
 
         return None
 
+    def _get_cached_type_data(
+        self, dpcode: DPCode, dptype: DPType, prefer_function: bool, order: list[str]
+    ) -> EnumTypeData | IntegerTypeData | None:
+        """Return the cached type data if the device specification didn't change."""
+        device_cache = _TYPE_DATA_CACHE.get(self.device.id)
+        if not device_cache:
+            return None
+        if not (cached := device_cache.get((dpcode, dptype, prefer_function))):
+            return None
+        key, spec_item, values, type_data = cached
+        if (
+            getattr(self.device, key).get(dpcode) is not spec_item
+            or spec_item.values is not values
+            or spec_item.type != dptype
+            or any(dpcode in getattr(self.device, other_key) for other_key in order[: order.index(key)])
+        ):
+            # The specification was replaced or rewritten, parse it again
+            device_cache.pop((dpcode, dptype, prefer_function), None)
+            return None
+        return type_data
+
+    def _set_cached_type_data(
+        self,
+        dpcode: DPCode,
+        dptype: DPType,
+        prefer_function: bool,
+        key: str,
+        type_data: EnumTypeData | IntegerTypeData,
+    ) -> None:
+        """Store the parsed type data along with the specification it was parsed from."""
+        spec_item = getattr(self.device, key)[dpcode]
+        _TYPE_DATA_CACHE.setdefault(self.device.id, {})[
+            (dpcode, dptype, prefer_function)
+        ] = (key, spec_item, spec_item.values, type_data)
+
+    def get_decoded_value(self, dpcode: DPCode | str, decoder: Callable[[Any], Any]) -> Any:
+        """Return the decoded status value, shared by all the entities of the device."""
+        if (value := self.device.status.get(dpcode)) is None:
+            return None
+        device_cache = _DECODED_VALUE_CACHE.setdefault(self.device.id, {})
+        cache_key = (dpcode, decoder)
+        if (cached := device_cache.get(cache_key)) is not None and cached[0] is value:
+            return cached[1]
+        decoded_value = decoder(value)
+        device_cache[cache_key] = (value, decoded_value)
+        return decoded_value
+
+    def get_decoded_electricity_raw(self, dpcode: DPCode | str) -> ElectricityTypeData | None:
+        """Return the decoded RAW electricity value, decoding all the phases of the report at once."""
+        if (value := self.device.status.get(dpcode)) is None:
+            return None
+        device_cache = _DECODED_VALUE_CACHE.setdefault(self.device.id, {})
+        decoder = ElectricityTypeData.from_raw
+        if (cached := device_cache.get((dpcode, decoder))) is not None and cached[0] is value:
+            return cached[1]
+        codes: list[str] = [dpcode]
+        values: list[Any] = [value]
+        for phase in _ELECTRICITY_RAW_PHASES:
+            if phase == dpcode or not isinstance(phase_value := self.device.status.get(phase), str):
+                continue
+            if (cached := device_cache.get((phase, decoder))) is not None and cached[0] is phase_value:
+                continue
+            codes.append(phase)
+            values.append(phase_value)
+        for code, raw_value, decoded_value in zip(
+            codes, values, ElectricityTypeData.from_raw_batch(values)
+        ):
+            device_cache[(code, decoder)] = (raw_value, decoded_value)
+        return device_cache[(dpcode, decoder)][1]
+
     def get_dptype(
         self, dpcode: DPCode | None, prefer_function: bool = False
     ) -> DPType | None:
@@ -289,10 +401,7 @@ class TuyaEntity(Entity):
         Sometimes, we get ill-formed DPTypes from the cloud,
         this fixes them and maps them to the correct DPType.
         """
-        try:
-            return DPType(type)
-        except ValueError:
-            return _DPTYPE_MAPPING.get(type)
+        return _DPTYPE_LOOKUP.get(type)
 
     async def async_added_to_hass(self) -> None:
         """Call when entity is added to hass."""
@@ -303,6 +412,12 @@ class TuyaEntity(Entity):
                 self.async_write_ha_state,
             )
         )
+        self.async_on_remove(self._clear_device_caches)
+
+    def _clear_device_caches(self) -> None:
+        """Drop the cached data of the device, the remaining entities rebuild it on demand."""
+        _TYPE_DATA_CACHE.pop(self.device.id, None)
+        _DECODED_VALUE_CACHE.pop(self.device.id, None)
 
     def _send_command(self, commands: list[dict[str, Any]]) -> None:
         """Send command to the device."""
@@ -16,7 +16,8 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from .util import (
-    merge_device_descriptors
+    get_merged_descriptors,
+    DeviceDescriptorIndex,
 )
 
 from .multi_manager.multi_manager import XTConfigEntry
@@ -116,9 +117,15 @@ async def async_setup_entry(
     """Set up Tuya binary sensor dynamically through Tuya discovery."""
     hass_data = entry.runtime_data
 
-    merged_descriptors = BINARY_SENSORS
-    for new_descriptor in entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.BINARY_SENSOR):
-        merged_descriptors = merge_device_descriptors(merged_descriptors, new_descriptor)
+    merged_descriptors = get_merged_descriptors(
+        Platform.BINARY_SENSOR,
+        BINARY_SENSORS,
+        entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.BINARY_SENSOR),
+    )
+    descriptor_index = DeviceDescriptorIndex(
+        merged_descriptors,
+        lambda description: description.dpcode or description.key,
+    )
 
     @callback
     def async_discover_device(device_map) -> None:
@@ -127,15 +134,12 @@ async def async_setup_entry(
         device_ids = [*device_map]
         for device_id in device_ids:
             if device := hass_data.manager.device_map.get(device_id, None):
-                if descriptions := merged_descriptors.get(device.category):
-                    for description in descriptions:
-                        dpcode = description.dpcode or description.key
-                        if dpcode in device.status:
-                            entities.append(
-                                TuyaBinarySensorEntity(
-                                    device, hass_data.manager, description
-                                )
-                            )
+                for description in descriptor_index.get_descriptions_to_discover(device, device.status):
+                    entities.append(
+                        TuyaBinarySensorEntity(
+                            device, hass_data.manager, description
+                        )
+                    )
 
         async_add_entities(entities)
 
@@ -13,7 +13,8 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .util import (
-    merge_device_descriptors
+    get_merged_descriptors,
+    DeviceDescriptorIndex,
 )
 
 from .multi_manager.multi_manager import XTConfigEntry
@@ -70,9 +71,20 @@ async def async_setup_entry(
     """Set up Tuya buttons dynamically through Tuya discovery."""
     hass_data = entry.runtime_data
 
-    merged_descriptors = BUTTONS
-    for new_descriptor in entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.BUTTON):
-        merged_descriptors = merge_device_descriptors(merged_descriptors, new_descriptor)
+    merged_descriptors = get_merged_descriptors(
+        Platform.BUTTON,
+        BUTTONS,
+        entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.BUTTON),
+    )
+    descriptor_index = DeviceDescriptorIndex(merged_descriptors)
+    #Reset buttons are discovered from the state they reset (only the first one is looked at)
+    reset_descriptor_index = DeviceDescriptorIndex(
+        {
+            category: [description for description in descriptions if description.vf_reset_state]
+            for category, descriptions in merged_descriptors.items()
+        },
+        lambda description: description.vf_reset_state[0],
+    )
 
     @callback
     def async_discover_device(device_map) -> None:
@@ -81,20 +93,14 @@ async def async_setup_entry(
         device_ids = [*device_map]
         for device_id in device_ids:
             if device := hass_data.manager.device_map.get(device_id):
-                if descriptions := merged_descriptors.get(device.category):
-                    entities.extend(
-                        TuyaButtonEntity(device, hass_data.manager, description)
-                        for description in descriptions
-                        if description.key in device.status
-                    )
-                    for description in descriptions:
-                        if description.vf_reset_state:
-                            for reset_state in description.vf_reset_state:
-                                if reset_state in device.status:
-                                    entities.extend(
-                                        [TuyaButtonEntity(device, hass_data.manager, description)]
-                                    )
-                                break
+                entities.extend(
+                    TuyaButtonEntity(device, hass_data.manager, description)
+                    for description in descriptor_index.get_descriptions_to_discover(device, device.status)
+                )
+                entities.extend(
+                    TuyaButtonEntity(device, hass_data.manager, description)
+                    for description in reset_descriptor_index.get_descriptions_to_discover(device, device.status)
+                )
 
         async_add_entities(entities)
 
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
+
 from tuya_sharing import CustomerDevice, Manager
 
 from homeassistant.const import Platform
@@ -12,28 +15,43 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .util import (
+    get_merged_descriptors,
     append_lists
 )
 
 from .multi_manager.multi_manager import XTConfigEntry
 from .base import TuyaEntity
-from .const import TUYA_DISCOVERY_NEW, DPCode
+from .const import (
+    TUYA_DISCOVERY_NEW,
+    CONF_SNAPSHOT_MAX_AGE,
+    DEFAULT_SNAPSHOT_MAX_AGE,
+    DPCode,
+)
 
 # All descriptions can be found here:
 # https://developer.tuya.com/en/docs/iot/standarddescription?id=K9i5ql6waswzq
 CAMERAS: tuple[str, ...] = (
 )
 
+# Allocated stream URLs are signed for a limited time, renew them before they expire
+STREAM_URL_VALIDITY = 300
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: XTConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up Tuya cameras dynamically through Tuya discovery."""
     hass_data = entry.runtime_data
-
-    merged_categories = CAMERAS
-    for new_descriptor in entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.CAMERA):
-        merged_categories = tuple(append_lists(merged_categories, new_descriptor))
+    snapshot_max_age: int = DEFAULT_SNAPSHOT_MAX_AGE
+    if entry.options is not None:
+        snapshot_max_age = entry.options.get(CONF_SNAPSHOT_MAX_AGE, DEFAULT_SNAPSHOT_MAX_AGE)
+
+    merged_categories = get_merged_descriptors(
+        Platform.CAMERA,
+        CAMERAS,
+        entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.CAMERA),
+        lambda merged, new: tuple(append_lists(merged, new)),
+    )
 
     @callback
     def async_discover_device(device_map) -> None:
@@ -43,7 +61,7 @@ async def async_setup_entry(
         for device_id in device_ids:
             if device := hass_data.manager.device_map.get(device_id):
                 if device.category in merged_categories:
-                    entities.append(TuyaCameraEntity(device, hass_data.manager))
+                    entities.append(TuyaCameraEntity(device, hass_data.manager, snapshot_max_age))
 
         async_add_entities(entities)
 
@@ -65,11 +83,17 @@ class TuyaCameraEntity(TuyaEntity, CameraEntity):
         self,
         device: CustomerDevice,
         device_manager: Manager,
+        snapshot_max_age: int = DEFAULT_SNAPSHOT_MAX_AGE,
     ) -> None:
         """Init Tuya Camera."""
         super().__init__(device, device_manager)
         CameraEntity.__init__(self)
         self._attr_model = device.product_name
+        self._snapshot_max_age = snapshot_max_age
+        self._stream_source: tuple[float, str] | None = None
+        self._stream_source_lock = asyncio.Lock()
+        self._snapshots: dict[tuple[int | None, int | None], tuple[float, bytes]] = {}
+        self._snapshot_tasks: dict[tuple[int | None, int | None], asyncio.Task[bytes | None]] = {}
 
     @property
     def is_recording(self) -> bool:
@@ -83,25 +107,59 @@ class TuyaCameraEntity(TuyaEntity, CameraEntity):
 
     async def stream_source(self) -> str | None:
         """Return the source of the stream."""
-        return await self.hass.async_add_executor_job(
-            self.device_manager.get_device_stream_allocate,
-            self.device.id,
-            "rtsp",
-        )
+        async with self._stream_source_lock:
+            if self._stream_source is not None and self._stream_source[0] > time.monotonic():
+                return self._stream_source[1]
+            stream_source = await self.hass.async_add_executor_job(
+                self.device_manager.get_device_stream_allocate,
+                self.device.id,
+                "rtsp",
+            )
+            if stream_source:
+                self._stream_source = (time.monotonic() + STREAM_URL_VALIDITY, stream_source)
+            else:
+                self._stream_source = None
+            return stream_source
 
     async def async_camera_image(
         self, width: int | None = None, height: int | None = None
     ) -> bytes | None:
         """Return a still image response from the camera."""
+        snapshot_key = (width, height)
+        if (
+            snapshot := self._snapshots.get(snapshot_key)
+        ) is not None and time.monotonic() - snapshot[0] < self._snapshot_max_age:
+            return snapshot[1]
+        # Concurrent requests for the same snapshot share a single ffmpeg run
+        if (snapshot_task := self._snapshot_tasks.get(snapshot_key)) is None:
+            snapshot_task = self.hass.async_create_task(
+                self._async_grab_camera_image(width, height)
+            )
+            self._snapshot_tasks[snapshot_key] = snapshot_task
+            snapshot_task.add_done_callback(
+                lambda _: self._snapshot_tasks.pop(snapshot_key, None)
+            )
+        return await asyncio.shield(snapshot_task)
+
+    async def _async_grab_camera_image(
+        self, width: int | None, height: int | None
+    ) -> bytes | None:
+        """Grab a still image from the stream with ffmpeg."""
         stream_source = await self.stream_source()
         if not stream_source:
             return None
-        return await ffmpeg.async_get_image(
+        image = await ffmpeg.async_get_image(
             self.hass,
             stream_source,
             width=width,
             height=height,
         )
+        if not image:
+            # The stream URL might have been revoked, allocate a new one next time
+            self._stream_source = None
+            return None
+        self._snapshots[(width, height)] = (time.monotonic(), image)
+        return image
 
     def enable_motion_detection(self) -> None:
         """Enable motion detection in the camera."""
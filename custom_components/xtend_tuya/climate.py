@@ -24,6 +24,7 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .util import (
+    get_merged_descriptors,
     append_dictionnaries
 )
 
@@ -60,9 +61,12 @@ async def async_setup_entry(
     """Set up Tuya climate dynamically through Tuya discovery."""
     hass_data = entry.runtime_data
     
-    merged_descriptions = CLIMATE_DESCRIPTIONS
-    for new_descriptor in entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.CLIMATE):
-        merged_descriptions = append_dictionnaries(merged_descriptions, new_descriptor)
+    merged_descriptions = get_merged_descriptors(
+        Platform.CLIMATE,
+        CLIMATE_DESCRIPTIONS,
+        entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.CLIMATE),
+        append_dictionnaries,
+    )
 
     @callback
     def async_discover_device(device_map) -> None:
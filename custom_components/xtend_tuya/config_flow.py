@@ -6,7 +6,6 @@ from collections.abc import Mapping
 from typing import Any
 
 from tuya_sharing import LoginControl
-from tuya_iot import AuthType, TuyaOpenAPI
 import voluptuous as vol
 
 from homeassistant.core import callback
@@ -41,6 +40,11 @@ from .const import (
     CONF_COUNTRY_CODE,
     CONF_PASSWORD,
     CONF_USERNAME,
+    CONF_OPTIMISTIC_STATE,
+    CONF_SNAPSHOT_MAX_AGE,
+    CONF_PERFORMANCE_MONITORING,
+    CONF_API_TELEMETRY_SENSOR,
+    DEFAULT_SNAPSHOT_MAX_AGE,
     SMARTLIFE_APP,
     TUYA_COUNTRIES,
     TUYA_SMART_APP,
@@ -61,6 +65,9 @@ class TuyaOptionFlow(OptionsFlow):
     @staticmethod
     def _try_login(user_input: dict[str, Any]) -> tuple[dict[Any, Any], dict[str, Any]]:
         """Try login."""
+        #Only needed when the OpenAPI account is configured, keep the IOT SDK out of the startup imports
+        from tuya_iot import AuthType, TuyaOpenAPI
+
         response = {}
 
         country = [
@@ -78,6 +85,10 @@ class TuyaOptionFlow(OptionsFlow):
             CONF_PASSWORD: user_input[CONF_PASSWORD],
             CONF_COUNTRY_CODE: country.country_code,
             CONF_USE_OPEN_API: user_input[CONF_USE_OPEN_API],
+            CONF_OPTIMISTIC_STATE: user_input.get(CONF_OPTIMISTIC_STATE, False),
+            CONF_SNAPSHOT_MAX_AGE: user_input.get(CONF_SNAPSHOT_MAX_AGE, DEFAULT_SNAPSHOT_MAX_AGE),
+            CONF_PERFORMANCE_MONITORING: user_input.get(CONF_PERFORMANCE_MONITORING, False),
+            CONF_API_TELEMETRY_SENSOR: user_input.get(CONF_API_TELEMETRY_SENSOR, False),
         }
         if (
                not data[CONF_USE_OPEN_API]
@@ -188,6 +199,22 @@ class TuyaOptionFlow(OptionsFlow):
                         CONF_PASSWORD, 
                         default=user_input.get(CONF_PASSWORD, self.options.get(CONF_PASSWORD, ""))
                     ): str,
+                    vol.Optional(
+                        CONF_OPTIMISTIC_STATE, 
+                        default=user_input.get(CONF_OPTIMISTIC_STATE, self.options.get(CONF_OPTIMISTIC_STATE, False))
+                    ): bool,
+                    vol.Optional(
+                        CONF_SNAPSHOT_MAX_AGE, 
+                        default=user_input.get(CONF_SNAPSHOT_MAX_AGE, self.options.get(CONF_SNAPSHOT_MAX_AGE, DEFAULT_SNAPSHOT_MAX_AGE))
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Optional(
+                        CONF_PERFORMANCE_MONITORING, 
+                        default=user_input.get(CONF_PERFORMANCE_MONITORING, self.options.get(CONF_PERFORMANCE_MONITORING, False))
+                    ): bool,
+                    vol.Optional(
+                        CONF_API_TELEMETRY_SENSOR, 
+                        default=user_input.get(CONF_API_TELEMETRY_SENSOR, self.options.get(CONF_API_TELEMETRY_SENSOR, False))
+                    ): bool,
                 }
             ),
             errors=errors,
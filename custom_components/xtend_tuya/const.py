@@ -2,12 +2,11 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass, field
 from enum import StrEnum, IntFlag
 import logging
-
-from tuya_iot import TuyaCloudOpenAPIEndpoint
+from typing import Any
 
 from homeassistant.components.sensor import SensorDeviceClass
 from homeassistant.const import (
@@ -49,6 +48,12 @@ CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
 CONF_COUNTRY_CODE = "country_code"
 CONF_APP_TYPE = "tuya_app_type"
+CONF_OPTIMISTIC_STATE = "optimistic_state"
+CONF_SNAPSHOT_MAX_AGE = "snapshot_max_age"
+CONF_PERFORMANCE_MONITORING = "performance_monitoring"
+CONF_API_TELEMETRY_SENSOR = "api_telemetry_sensor"
+
+DEFAULT_SNAPSHOT_MAX_AGE = 30
 
 TUYA_CLIENT_ID = "HA_3y9q4ak7g4ephrvke"
 TUYA_SCHEMA = "haauthorize"
@@ -71,6 +76,10 @@ SMARTLIFE_APP = "smartlife"
 MESSAGE_SOURCE_TUYA_IOT = "tuya_iot"
 MESSAGE_SOURCE_TUYA_SHARING = "tuya_sharing"
 
+#Same values as tuya_iot.device, kept here so that the core does not import the IOT SDK
+PROTOCOL_DEVICE_REPORT = 4
+PROTOCOL_OTHER = 20
+
 PLATFORMS = [
     Platform.ALARM_CONTROL_PANEL,
     Platform.BINARY_SENSOR,
@@ -92,10 +101,27 @@ PLATFORMS = [
     Platform.VACUUM,
 ]
 
+#Options without which the tuya_iot plugin can't set up its account
+TUYA_IOT_REQUIRED_OPTIONS: tuple[str, ...] = (
+    CONF_AUTH_TYPE,
+    CONF_ENDPOINT_OT,
+    CONF_ACCESS_ID,
+    CONF_ACCESS_SECRET,
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    CONF_COUNTRY_CODE,
+    CONF_APP_TYPE,
+)
+
 class AllowedPlugins:
     @staticmethod
-    def get_plugins_to_load() -> list[str]:
-        return [MESSAGE_SOURCE_TUYA_SHARING, MESSAGE_SOURCE_TUYA_IOT]
+    def get_plugins_to_load(options: Mapping[str, Any] | None = None) -> list[str]:
+        #A plugin whose account isn't configured is not imported at all, so that a sharing-only
+        #entry never loads tuya_iot and its IPC/WebRTC/paho stack
+        plugins = [MESSAGE_SOURCE_TUYA_SHARING]
+        if options is not None and all(option in options for option in TUYA_IOT_REQUIRED_OPTIONS):
+            plugins.append(MESSAGE_SOURCE_TUYA_IOT)
+        return plugins
 
 class VirtualStates(IntFlag):
     """Virtual states"""
@@ -782,6 +808,17 @@ for uom in UNITS:
         for unit_alias in uom.aliases:
             DEVICE_CLASS_UNITS[device_class][unit_alias] = uom
 
+class TuyaCloudOpenAPIEndpoint:
+    """Tuya Cloud Open API Endpoint (same values as tuya_iot.TuyaCloudOpenAPIEndpoint)."""
+
+    CHINA = "https://openapi.tuyacn.com"
+    AMERICA = "https://openapi.tuyaus.com"
+    AMERICA_AZURE = "https://openapi-ueaz.tuyaus.com"
+    EUROPE = "https://openapi.tuyaeu.com"
+    EUROPE_MS = "https://openapi-weaz.tuyaeu.com"
+    INDIA = "https://openapi.tuyain.com"
+
+
 @dataclass
 class Country:
     """Describe a supported country."""
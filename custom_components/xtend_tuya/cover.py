@@ -21,7 +21,8 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .util import (
-    merge_device_descriptors
+    get_merged_descriptors,
+    DeviceDescriptorIndex,
 )
 
 from .multi_manager.multi_manager import XTConfigEntry
@@ -98,9 +99,12 @@ async def async_setup_entry(
     """Set up Tuya cover dynamically through Tuya discovery."""
     hass_data = entry.runtime_data
 
-    merged_descriptors = COVERS
-    for new_descriptor in entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.COVER):
-        merged_descriptors = merge_device_descriptors(merged_descriptors, new_descriptor)
+    merged_descriptors = get_merged_descriptors(
+        Platform.COVER,
+        COVERS,
+        entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.COVER),
+    )
+    descriptor_index = DeviceDescriptorIndex(merged_descriptors)
 
     @callback
     def async_discover_device(device_map) -> None:
@@ -109,15 +113,12 @@ async def async_setup_entry(
         device_ids = [*device_map]
         for device_id in device_ids:
             if device := hass_data.manager.device_map.get(device_id):
-                if descriptions := merged_descriptors.get(device.category):
-                    entities.extend(
-                        TuyaCoverEntity(device, hass_data.manager, description)
-                        for description in descriptions
-                        if (
-                            description.key in device.function
-                            or description.key in device.status_range
-                        )
+                entities.extend(
+                    TuyaCoverEntity(device, hass_data.manager, description)
+                    for description in descriptor_index.get_descriptions_to_discover(
+                        device, [*device.function, *device.status_range]
                     )
+                )
 
         async_add_entities(entities)
 
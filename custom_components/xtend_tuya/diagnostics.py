@@ -6,18 +6,37 @@ from contextlib import suppress
 import json
 from typing import Any, cast
 
-from homeassistant.components.diagnostics import REDACTED
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.device_registry import DeviceEntry
 from homeassistant.util import dt as dt_util
 
-from .multi_manager.multi_manager import XTConfigEntry
+from .multi_manager.multi_manager import XTConfigEntry, MultiManager
 from .const import DOMAIN, DPCode
 from .multi_manager.shared.device import (
     XTDevice,
 )
 
+# These statuses may contain sensitive information
+REDACTED_STATUS_CODES = {DPCode.ALARM_MESSAGE, DPCode.MOVEMENT_DETECT_PIC}
+
+# Keys of the raw MQTT messages that may contain credentials or personal data
+TO_REDACT_MESSAGE = {
+    "auth",
+    "ip",
+    "lat",
+    "localKey",
+    "local_key",
+    "lon",
+    "ownerId",
+    "password",
+    "sdp",
+    "ticket",
+    "token",
+    "uid",
+}
+
 
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: XTConfigEntry
@@ -52,6 +71,10 @@ def _async_get_diagnostics(
         "mqtt_connected": mqtt_connected,
         "disabled_by": entry.disabled_by,
         "disabled_polling": entry.pref_disable_polling,
+        "command_queue": hass_data.manager.command_queue.get_statistics(),
+        "optimistic_pending_states": hass_data.manager.optimistic_state_handler.get_pending_states(),
+        "performance": hass_data.manager.performance_monitor.get_statistics(),
+        "api_telemetry": hass_data.manager.api_telemetry.get_statistics(),
     }
 
     if device:
@@ -65,12 +88,35 @@ def _async_get_diagnostics(
             devices=[
                 _async_device_as_dict(hass, device)
                 for device in hass_data.manager.device_map.values()
-            ]
+            ],
+            message_trace=_async_redacted_message_trace(hass_data.manager),
         )
 
     return data
 
 
+@callback
+def _async_redacted_message_trace(manager: MultiManager) -> list[dict[str, Any]]:
+    """Return the recorded MQTT messages without their sensitive information."""
+    trace: list[dict[str, Any]] = []
+    for entry in manager.performance_monitor.get_message_trace():
+        message = json.loads(entry["message"])
+        data = message.get("data")
+        if isinstance(data, dict) and isinstance(data.get("status"), list):
+            device = manager.device_map.get(data.get("devId"))
+            for item in data["status"]:
+                if not isinstance(item, dict):
+                    continue
+                code = item.get("code")
+                if code is None and device is not None:
+                    # Reports of the sharing SDK only carry the dpId
+                    code = device.local_strategy.get(item.get("dpId"), {}).get("status_code")
+                if code in REDACTED_STATUS_CODES:
+                    item["value"] = REDACTED
+        trace.append({**entry, "message": async_redact_data(message, TO_REDACT_MESSAGE)})
+    return trace
+
+
 @callback
 def _async_device_as_dict(
     hass: HomeAssistant, device: XTDevice
@@ -119,7 +165,7 @@ def _async_device_as_dict(
     # Gather Tuya states
     for dpcode, value in device.status.items():
         # These statuses may contain sensitive information, redact these..
-        if dpcode in {DPCode.ALARM_MESSAGE, DPCode.MOVEMENT_DETECT_PIC}:
+        if dpcode in REDACTED_STATUS_CODES:
             data["status"][dpcode] = REDACTED
             continue
 
@@ -22,6 +22,7 @@ from homeassistant.util.percentage import (
 )
 
 from .util import (
+    get_merged_descriptors,
     append_sets
 )
 
@@ -39,9 +40,12 @@ async def async_setup_entry(
     """Set up tuya fan dynamically through tuya discovery."""
     hass_data = entry.runtime_data
 
-    merged_categories = TUYA_SUPPORT_TYPE
-    for new_descriptor in entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.FAN):
-        merged_categories = append_sets(merged_categories, new_descriptor)
+    merged_categories = get_merged_descriptors(
+        Platform.FAN,
+        TUYA_SUPPORT_TYPE,
+        entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.FAN),
+        append_sets,
+    )
 
     @callback
     def async_discover_device(device_map) -> None:
@@ -17,6 +17,7 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .util import (
+    get_merged_descriptors,
     append_dictionnaries
 )
 
@@ -46,9 +47,12 @@ async def async_setup_entry(
     """Set up Tuya (de)humidifier dynamically through Tuya discovery."""
     hass_data = entry.runtime_data
 
-    merged_categories = HUMIDIFIERS
-    for new_descriptor in entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.HUMIDIFIER):
-        merged_categories = append_dictionnaries(merged_categories, new_descriptor)
+    merged_categories = get_merged_descriptors(
+        Platform.HUMIDIFIER,
+        HUMIDIFIERS,
+        entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.HUMIDIFIER),
+        append_dictionnaries,
+    )
 
     @callback
     def async_discover_device(device_map) -> None:
@@ -23,7 +23,8 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .util import (
-    merge_device_descriptors
+    get_merged_descriptors,
+    DeviceDescriptorIndex,
 )
 
 from .multi_manager.multi_manager import XTConfigEntry
@@ -102,9 +103,12 @@ async def async_setup_entry(
     """Set up tuya light dynamically through tuya discovery."""
     hass_data = entry.runtime_data
 
-    merged_descriptors = LIGHTS
-    for new_descriptor in entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.LIGHT):
-        merged_descriptors = merge_device_descriptors(merged_descriptors, new_descriptor)
+    merged_descriptors = get_merged_descriptors(
+        Platform.LIGHT,
+        LIGHTS,
+        entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.LIGHT),
+    )
+    descriptor_index = DeviceDescriptorIndex(merged_descriptors)
 
     @callback
     def async_discover_device(device_map):
@@ -113,12 +117,10 @@ async def async_setup_entry(
         device_ids = [*device_map]
         for device_id in device_ids:
             if device := hass_data.manager.device_map.get(device_id):
-                if descriptions := merged_descriptors.get(device.category):
-                    entities.extend(
-                        TuyaLightEntity(device, hass_data.manager, description)
-                        for description in descriptions
-                        if description.key in device.status
-                    )
+                entities.extend(
+                    TuyaLightEntity(device, hass_data.manager, description)
+                    for description in descriptor_index.get_descriptions_to_discover(device, device.status)
+                )
 
         async_add_entities(entities)
 
@@ -424,10 +426,10 @@ class TuyaLightEntity(TuyaEntity, LightEntity):
         ):
             return None
 
-        if not (status_data := self.device.status[self._color_data_dpcode]):
+        if not self.device.status[self._color_data_dpcode]:
             return None
 
-        if not (status := json.loads(status_data)):
+        if not (status := self.get_decoded_value(self._color_data_dpcode, json.loads)):
             return None
 
         return ColorData(
@@ -18,6 +18,7 @@ from .const import (
     DPCode,
 )
 from .util import (
+    get_merged_descriptors,
     append_dictionnaries,
 )
 from .base import TuyaEntity
@@ -54,9 +55,12 @@ async def async_setup_entry(
     """Set up Tuya binary sensor dynamically through Tuya discovery."""
     hass_data = entry.runtime_data
 
-    merged_descriptors = LOCKS
-    for new_descriptor in entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.LOCK):
-        merged_descriptors = append_dictionnaries(merged_descriptors, new_descriptor)
+    merged_descriptors = get_merged_descriptors(
+        Platform.LOCK,
+        LOCKS,
+        entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.LOCK),
+        append_dictionnaries,
+    )
 
     @callback
     def async_discover_device(device_map) -> None:
@@ -137,15 +141,15 @@ class TuyaLockEntity(TuyaEntity, LockEntity):
                 return self.device.status[str(code)]
         return None
 
-    def lock(self, **kwargs: Any) -> None:
+    async def async_lock(self, **kwargs: Any) -> None:
         """Lock the lock."""
-        if self.device_manager.send_lock_unlock_command(self.device.id, True):
+        if await self.device_manager.async_send_lock_unlock_command(self.device.id, True):
             if not self.entity_description.temporary_unlock:
                 self._attr_is_locking = True
     
-    def unlock(self, **kwargs: Any) -> None:
+    async def async_unlock(self, **kwargs: Any) -> None:
         """Unlock the lock."""
-        if self.device_manager.send_lock_unlock_command(self.device.id, False):
+        if await self.device_manager.async_send_lock_unlock_command(self.device.id, False):
             if not self.entity_description.temporary_unlock:
                 self._attr_is_unlocking = True
     
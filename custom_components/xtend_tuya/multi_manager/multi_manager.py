@@ -8,14 +8,13 @@ from typing import Any, Literal, Optional
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 
-from tuya_iot.device import (
-    PROTOCOL_DEVICE_REPORT,
-    PROTOCOL_OTHER,
-)
-
 from ..const import (
     LOGGER,
+    PROTOCOL_DEVICE_REPORT,
+    PROTOCOL_OTHER,
     AllowedPlugins,
+    CONF_OPTIMISTIC_STATE,
+    CONF_PERFORMANCE_MONITORING,
 )
 
 from .shared.import_stub import (
@@ -41,6 +40,10 @@ from .shared.cloud_fix import (
     CloudFixes,
 )
 
+from .shared.descriptor_string_pool import (
+    XTDescriptorStringPool,
+)
+
 from .shared.multi_source_handler import (
     MultiSourceHandler,
 )
@@ -53,6 +56,27 @@ from .shared.multi_device_listener import (
     MultiDeviceListener,
 )
 
+from .shared.multi_command_queue import (
+    MultiCommandQueue,
+)
+
+from .shared.multi_performance_monitor import (
+    XTPerformanceMonitor,
+    STAGE_ON_MESSAGE,
+    STARTUP_STAGE_ACCOUNT_CACHE,
+    STARTUP_STAGE_CONVERT,
+    STARTUP_STAGE_MERGE,
+    STARTUP_STAGE_CLOUD_FIXES,
+)
+
+from .shared.multi_api_telemetry import (
+    XTAPITelemetry,
+)
+
+from .shared.multi_optimistic_state_handler import (
+    XTOptimisticStateHandler,
+)
+
 from .shared.multi_virtual_state_handler import (
     XTVirtualStateHandler,
 )
@@ -83,6 +107,11 @@ class MultiManager:  # noqa: F811
         self.is_ready_for_messages = False
         self.pending_messages: list[tuple[str, str]] = []
         self.devices_shared: dict[str, XTDevice] = {}
+        self.scene_id_to_account: dict[str, XTDeviceManagerInterface] = {}
+        self.command_queue = MultiCommandQueue(self, self._send_regular_commands)
+        self.optimistic_state_handler = XTOptimisticStateHandler(self)
+        self.performance_monitor = XTPerformanceMonitor(self)
+        self.api_telemetry = XTAPITelemetry()
 
     @property
     def device_map(self):
@@ -98,9 +127,13 @@ class MultiManager:  # noqa: F811
         return None
 
     async def setup_entry(self, hass: HomeAssistant, config_entry: XTConfigEntry) -> None:
+        if config_entry.options is not None:
+            self.optimistic_state_handler.enabled = bool(config_entry.options.get(CONF_OPTIMISTIC_STATE, False))
+            self.performance_monitor.set_enabled(bool(config_entry.options.get(CONF_PERFORMANCE_MONITORING, False)))
+
         #Load all the plugins
         #subdirs = await self.hass.async_add_executor_job(os.listdir, os.path.dirname(__file__))
-        subdirs = AllowedPlugins.get_plugins_to_load()
+        subdirs = AllowedPlugins.get_plugins_to_load(config_entry.options)
         for directory in subdirs:
             if os.path.isdir(os.path.dirname(__file__) + os.sep + directory):
                 load_path = f".{directory}.init"
@@ -131,14 +164,21 @@ class MultiManager:  # noqa: F811
     
     def update_device_cache(self):
         self.is_ready_for_messages = False
+        monitor_time = self.performance_monitor.start()
         for key, manager in self.accounts.items():
             manager.update_device_cache()
+            monitor_time = self.performance_monitor.stop_startup_stage(
+                f"{STARTUP_STAGE_ACCOUNT_CACHE}_{key}", monitor_time, sum(len(device_map) for device_map in manager.get_available_device_maps())
+            )
 
             #New devices have been created in their own device maps
             #let's convert them to XTDevice
+            converted_count = 0
             for device_map in manager.get_available_device_maps():
                 for device_id in device_map:
                     device_map[device_id] = manager.convert_to_xt_device(device_map[device_id])
+                converted_count += len(device_map)
+            monitor_time = self.performance_monitor.stop_startup_stage(f"{STARTUP_STAGE_CONVERT}_{key}", monitor_time, converted_count)
         
         #Register all devices in the master device map
         self._update_master_device_map()
@@ -146,8 +186,12 @@ class MultiManager:  # noqa: F811
         #Now let's aggregate all of these devices into a single
         #"All functionnality" device
         self._merge_devices_from_multiple_sources()
+        monitor_time = self.performance_monitor.stop_startup_stage(STARTUP_STAGE_MERGE, monitor_time, len(self.device_map))
         for device in self.device_map.values():
             CloudFixes.apply_fixes(device)
+        #The devices now hold their final descriptors, free the intermediate ones
+        XTDescriptorStringPool.clear()
+        self.performance_monitor.stop_startup_stage(STARTUP_STAGE_CLOUD_FIXES, monitor_time, len(self.device_map))
         self._process_pending_messages()
 
     def _process_pending_messages(self):
@@ -181,6 +225,8 @@ class MultiManager:  # noqa: F811
                 to_be_merged.append(current_device)
     
     def unload(self):
+        self.command_queue.flush_all()
+        self.optimistic_state_handler.clear()
         for manager in self.accounts.values():
             manager.unload()
     
@@ -290,6 +336,9 @@ class MultiManager:  # noqa: F811
         if not dev_id:
             LOGGER.warning(f"dev_id {dev_id} not found!")
             return
+        monitor_start = self.performance_monitor.start()
+        self.performance_monitor.count_device_message(dev_id)
+        self.performance_monitor.record_message(source, msg)
         
         #self.device_watcher.report_message(dev_id, f"on_message ({source}) => {msg}")
 
@@ -297,10 +346,12 @@ class MultiManager:  # noqa: F811
         if status_list := self._get_status_list_from_message(msg):
             self.device_watcher.report_message(dev_id, f"On Message reporting ({source}): {msg}")
             self.multi_source_handler.register_status_list_from_source(dev_id, source, status_list)
+            self.optimistic_state_handler.on_status_report(dev_id, status_list)
             #self.device_watcher.report_message(dev_id, f"on_message ({source}) status list => {status_list}")
         
         if source in self.accounts:
             self.accounts[source].on_message(new_message)
+        self.performance_monitor.stop(STAGE_ON_MESSAGE, monitor_start)
 
     def _get_device_id_from_message(self, msg: str) -> str | None:
         protocol = msg.get("protocol", 0)
@@ -334,12 +385,23 @@ class MultiManager:  # noqa: F811
                         data["devId"] = dev_id
         return msg
 
-    def query_scenes(self) -> list:
+    def query_scenes(self) -> list | None:
+        #None when an account couldn't query its scenes, so that the callers don't take them as deleted
         return_list = []
         for account in self.accounts.values():
-            return_list = append_lists(return_list, account.query_scenes())
+            account_scenes = account.query_scenes()
+            if account_scenes is None:
+                return None
+            if not account_scenes:
+                continue
+            for scene in account_scenes:
+                self.scene_id_to_account[scene.scene_id] = account
+            return_list = append_lists(return_list, account_scenes)
         return return_list
 
+    async def async_query_scenes(self) -> list | None:
+        return await self.hass.async_add_executor_job(self.query_scenes)
+
     def send_commands(
             self, device_id: str, commands: list[dict[str, Any]]
     ):
@@ -368,8 +430,14 @@ class MultiManager:  # noqa: F811
             self.virtual_function_handler.process_virtual_function(device_id, virtual_function_commands)
 
         if regular_commands:
-            for account in self.accounts.values():
-                account.send_commands(device_id, regular_commands)
+            self.command_queue.queue_commands(device_id, regular_commands)
+            self.optimistic_state_handler.apply_commands(device_id, regular_commands)
+
+    def _send_regular_commands(
+            self, device_id: str, commands: list[dict[str, Any]]
+    ):
+        for account in self.accounts.values():
+            account.send_commands(device_id, commands)
 
     def get_device_stream_allocate(
             self, device_id: str, stream_type: Literal["flv", "hls", "rtmp", "rtsp"]
@@ -385,12 +453,23 @@ class MultiManager:  # noqa: F811
             if account.send_lock_unlock_command(device_id, lock):
                 return True
         return False
+
+    async def async_send_lock_unlock_command(
+            self, device_id: str, lock: bool
+    ) -> bool:
+        return await self.hass.async_add_executor_job(self.send_lock_unlock_command, device_id, lock)
     
     def inform_device_has_an_entity(self, device_id: str):
         for account in self.accounts.values():
             account.inform_device_has_an_entity(device_id)
     
     def trigger_scene(self, home_id: str, scene_id: str):
+        if account := self.scene_id_to_account.get(scene_id):
+            if account.trigger_scene(home_id, scene_id):
+                return
         for account in self.accounts.values():
             if account.trigger_scene(home_id, scene_id):
-                return
\ No newline at end of file
+                return
+
+    async def async_trigger_scene(self, home_id: str, scene_id: str):
+        await self.hass.async_add_executor_job(self.trigger_scene, home_id, scene_id)
\ No newline at end of file
@@ -7,6 +7,9 @@ from .device import (
     XTDeviceFunction,
     XTDeviceStatusRange,
 )
+from .descriptor_string_pool import (
+    XTDescriptorStringPool,
+)
 from ...const import (
     LOGGER,  # noqa: F401
 )
@@ -26,10 +29,20 @@ class CloudFixes:
         CloudFixes._fix_missing_local_strategy_enum_mapping_map(device)
         CloudFixes._fix_missing_range_values_using_local_strategy(device)
         CloudFixes._fix_missing_aliases_using_status_format(device)
+        CloudFixes._intern_descriptors(device)
 
         #This causes some entities to disappear, instead we know update all local alias statuses
         #CloudFixes._remove_status_that_are_local_strategy_aliases(device)
 
+    def _intern_descriptors(device: XTDevice):
+        #Share the descriptors with the other devices of the same product
+        for local_strategy in device.local_strategy.values():
+            if config_item := local_strategy.get("config_item"):
+                XTDescriptorStringPool.intern_dict(config_item)
+            for key in ("status_code", "value_convert"):
+                if key in local_strategy:
+                    local_strategy[key] = XTDescriptorStringPool.intern(local_strategy[key])
+
     def _unify_added_attributes(device: XTDevice):
         for dpId in device.local_strategy:
             if device.local_strategy[dpId].get("property_update") is None:
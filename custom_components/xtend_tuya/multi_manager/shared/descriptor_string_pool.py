@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import Any
+
+class XTDescriptorStringPool:
+    #Pool of the final value descriptor strings (valueDesc, statusFormat, values, etc.)
+    #Devices of the same product end up referencing the same string objects,
+    #a device specific fix produces a new string and leaves the other devices untouched.
+    #Only the strings are shared: the specification objects and config_item dicts holding them
+    #stay per device since the merge, CloudFixes and the virtual states modify them in place.
+    #A plain dict is used instead of sys.intern (interned strings are immortal on recent CPython)
+    #and it is cleared once the devices are loaded so that descriptors no device uses anymore can be freed
+    _pool: dict[str, str] = {}
+
+    def intern(value: Any) -> Any:
+        if type(value) is str:
+            return XTDescriptorStringPool._pool.setdefault(value, value)
+        return value
+
+    def intern_dict(dictionary: dict) -> dict:
+        #Intern the keys and string values of a descriptor dict (and its nested dicts) in place
+        for key in list(dictionary):
+            value = dictionary.pop(key)
+            if isinstance(value, dict):
+                value = XTDescriptorStringPool.intern_dict(value)
+            dictionary[XTDescriptorStringPool.intern(key)] = XTDescriptorStringPool.intern(value)
+        return dictionary
+
+    def clear() -> None:
+        #The devices keep referencing their descriptors, only the pool's references are dropped
+        XTDescriptorStringPool._pool.clear()
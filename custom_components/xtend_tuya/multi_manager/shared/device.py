@@ -1,17 +1,31 @@
 from __future__ import annotations
 
 from typing import Any, Optional
-from types import SimpleNamespace
 from dataclasses import dataclass, field
 import copy
 
-@dataclass
+from .descriptor_string_pool import (
+    XTDescriptorStringPool,
+)
+
+#Specification fields whose strings repeat across devices of the same product
+_INTERNED_FIELDS = frozenset(("code", "type", "values"))
+
+def _set_interned_attr(instance: Any, name: str, value: Any) -> None:
+    if name in _INTERNED_FIELDS and type(value) is str:
+        value = XTDescriptorStringPool.intern(value)
+    object.__setattr__(instance, name, value)
+
+@dataclass(slots=True)
 class XTDeviceStatusRange:
     code: str
     type: str
     values: str
     dp_id: int = None
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        _set_interned_attr(self, name, value)
+
     def __repr__(self) -> str:
         return f"StatusRange(code={self.code}, type={self.type}, values={self.values}, dp_id={self.dp_id})"
 
@@ -34,7 +48,7 @@ class XTDeviceStatusRange:
             dp_id = None
         return XTDeviceStatusRange(code=code, type=type, values=values, dp_id=dp_id)
 
-@dataclass
+@dataclass(slots=True)
 class XTDeviceFunction:
     code: str
     type: str
@@ -42,6 +56,9 @@ class XTDeviceFunction:
     name: str = None
     values: dict[str, Any] = field(default_factory=dict)
     dp_id: int = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        _set_interned_attr(self, name, value)
     
     def __repr__(self) -> str:
         return f"Function(code={self.code}, type={self.type}, desc={self.desc}, name={self.name}, values={self.values}, dp_id={self.dp_id})"
@@ -73,7 +90,35 @@ class XTDeviceFunction:
             dp_id = None
         return XTDeviceFunction(code=code, type=type, desc=desc, name=name, values=values, dp_id=dp_id)
 
-class XTDevice(SimpleNamespace):
+class XTDevice:
+    #Fields that every device has are stored in slots, any other field sent by the cloud goes in __dict__
+    __slots__ = (
+        "id",
+        "name",
+        "local_key",
+        "category",
+        "product_id",
+        "product_name",
+        "sub",
+        "uuid",
+        "asset_id",
+        "online",
+        "icon",
+        "ip",
+        "time_zone",
+        "active_time",
+        "create_time",
+        "update_time",
+        "set_up",
+        "support_local",
+        "local_strategy",
+        "status",
+        "function",
+        "status_range",
+        "force_open_api",
+        "data_model",
+        "__dict__",
+    )
     id: str
     name: str
     local_key: str
@@ -90,24 +135,37 @@ class XTDevice(SimpleNamespace):
     active_time: int
     create_time: int
     update_time: int
-    local_key: str
-    set_up: Optional[bool] = False
-    support_local: Optional[bool] = False
+    set_up: Optional[bool]
+    support_local: Optional[bool]
     local_strategy: dict[int, dict[str, Any]]
 
     status: dict[str, Any]
     function: dict[str, XTDeviceFunction]
     status_range: dict[str, XTDeviceStatusRange]
 
-    force_open_api: Optional[bool] = False
-    data_model: Optional[str] = ""
+    force_open_api: Optional[bool]
+    data_model: Optional[str]
 
     def __init__(self, **kwargs: Any) -> None:
+        self.set_up = False
+        self.support_local = False
+        self.force_open_api = False
+        self.data_model = ""
         self.local_strategy = {}
         self.status = {}
         self.function = {}
         self.status_range = {}
-        super().__init__(**kwargs)
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+    def get_fields(self) -> dict[str, Any]:
+        """Return all the fields of the device, the fixed ones and the overflow ones."""
+        fields: dict[str, Any] = {}
+        for slot in XTDevice.__slots__:
+            if slot != "__dict__" and hasattr(self, slot):
+                fields[slot] = getattr(self, slot)
+        fields.update(self.__dict__)
+        return fields
 
     def __eq__(self, other):
         """If devices are the same one."""
@@ -130,7 +188,10 @@ class XTDevice(SimpleNamespace):
         return f"Device {self.name}:\r\n{function_str}{status_range_str}{status_str}{local_strategy_str}"
 
     def from_compatible_device(device: Any):
-        new_device = XTDevice(**(device.__dict__))
+        if isinstance(device, XTDevice):
+            new_device = XTDevice(**device.get_fields())
+        else:
+            new_device = XTDevice(**(device.__dict__))
         
         #Reuse the references from the original device
         if hasattr(device, "local_strategy"):
@@ -154,4 +215,13 @@ class XTDevice(SimpleNamespace):
                 dest_device.status[code] = value"""
 
     def get_copy(self) -> XTDevice:
-        return copy.deepcopy(self)
\ No newline at end of file
+        return copy.deepcopy(self)
+
+    def get_shared_copy(self) -> XTDevice:
+        #Copy the containers and the specification entries but share their contents (values, etc.)
+        #local_strategy stays shared with the original until it is replaced
+        new_device = copy.copy(self)
+        new_device.status = dict(self.status)
+        new_device.status_range = {code: copy.copy(status_range) for code, status_range in self.status_range.items()}
+        new_device.function = {code: copy.copy(function) for code, function in self.function.items()}
+        return new_device
\ No newline at end of file
@@ -47,8 +47,8 @@ class XTDeviceManagerInterface(ABC):
     def on_message(self, msg: str):
         pass
 
-    def query_scenes(self) -> list:
-        pass
+    def query_scenes(self) -> list | None:
+        return []
 
     def get_device_stream_allocate(
             self, device_id: str, stream_type: Literal["flv", "hls", "rtmp", "rtsp"]
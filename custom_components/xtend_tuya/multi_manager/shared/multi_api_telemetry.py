@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import functools
+import re
+import threading
+from collections import deque
+from typing import Any
+
+#Number of latency samples kept per endpoint to compute the percentiles
+API_TELEMETRY_LATENCY_SAMPLES = 256
+API_TELEMETRY_PERCENTILES: tuple[int, ...] = (50, 90, 99)
+
+API_PATH_VERSION_SEGMENT = re.compile(r"^v\d+(\.\d+)*$")
+API_PATH_ID_PLACEHOLDER = "{id}"
+
+@functools.lru_cache(maxsize=1024)
+def get_api_path_template(path: str) -> str:
+    #Replace the identifiers of a path (device ids, home ids, tokens, etc.) by a placeholder
+    #so that /v2.0/cloud/thing/bf1234/model and /v2.0/cloud/thing/bf5678/model share their counters
+    path = path.split("?", 1)[0]
+    segments = path.split("/")
+    for index, segment in enumerate(segments):
+        if (
+            any(char.isdigit() for char in segment)
+            and not API_PATH_VERSION_SEGMENT.match(segment)
+        ):
+            segments[index] = API_PATH_ID_PLACEHOLDER
+    return "/".join(segments)
+
+class XTAPIEndpointStatistics:
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total_latency: float = 0
+        self.latencies: deque[float] = deque(maxlen=API_TELEMETRY_LATENCY_SAMPLES)
+        self.error_codes: dict[str, int] = {}
+        self.bytes_sent: int = 0
+        self.bytes_received: int = 0
+
+    def get_percentiles(self) -> dict[str, float | None]:
+        samples = sorted(self.latencies)
+        percentiles: dict[str, float | None] = {}
+        for percentile in API_TELEMETRY_PERCENTILES:
+            if samples:
+                index = min(len(samples) - 1, (len(samples) * percentile) // 100)
+                percentiles[f"p{percentile}_ms"] = round(samples[index], 1)
+            else:
+                percentiles[f"p{percentile}_ms"] = None
+        return percentiles
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "average_ms": round(self.total_latency / self.count, 1) if self.count else None,
+            **self.get_percentiles(),
+            "errors": dict(self.error_codes),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+        }
+
+class XTAPITelemetry:
+    def __init__(self) -> None:
+        self.endpoints: dict[tuple[str, str, str], XTAPIEndpointStatistics] = {}
+        self.token_refreshes: dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def _get_endpoint(self, source: str, method: str, path: str) -> XTAPIEndpointStatistics:
+        #Must be called with the lock held
+        key = (source, method, get_api_path_template(path))
+        endpoint = self.endpoints.get(key)
+        if endpoint is None:
+            endpoint = XTAPIEndpointStatistics()
+            self.endpoints[key] = endpoint
+        return endpoint
+
+    def record_call(self, source: str, method: str, path: str, latency: float, error_code: Any | None = None) -> None:
+        with self.lock:
+            endpoint = self._get_endpoint(source, method, path)
+            endpoint.count += 1
+            latency_ms = latency * 1000
+            endpoint.total_latency += latency_ms
+            endpoint.latencies.append(latency_ms)
+            if error_code is not None:
+                error_code = str(error_code)
+                endpoint.error_codes[error_code] = endpoint.error_codes.get(error_code, 0) + 1
+
+    def record_transfer(self, source: str, method: str, path: str, bytes_sent: int, bytes_received: int) -> None:
+        with self.lock:
+            endpoint = self._get_endpoint(source, method, path)
+            endpoint.bytes_sent += bytes_sent
+            endpoint.bytes_received += bytes_received
+
+    def record_token_refresh(self, source: str) -> None:
+        with self.lock:
+            self.token_refreshes[source] = self.token_refreshes.get(source, 0) + 1
+
+    def get_total_count(self) -> int:
+        with self.lock:
+            return sum(endpoint.count for endpoint in self.endpoints.values())
+
+    def get_statistics(self, max_endpoints: int | None = None) -> dict[str, Any]:
+        #Endpoints are sorted from the most to the least called
+        with self.lock:
+            endpoints: dict[str, dict[str, Any]] = {}
+            for (source, method, template), endpoint in sorted(self.endpoints.items(), key=lambda item: item[1].count, reverse=True)[:max_endpoints]:
+                endpoints[f"{source} {method} {template}"] = endpoint.as_dict()
+            return {
+                "token_refreshes": dict(self.token_refreshes),
+                "endpoints": endpoints,
+            }
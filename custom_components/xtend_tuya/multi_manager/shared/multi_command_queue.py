@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable
+
+from ..multi_manager import (
+    MultiManager,
+)
+from ...const import (
+    LOGGER,  # noqa: F401
+)
+
+#Time window (in seconds) during which commands for the same device are coalesced
+COMMAND_COALESCING_WINDOW = 0.25
+
+class XTCommandQueueStatistics:
+    def __init__(self) -> None:
+        self.commands_received: int = 0
+        self.commands_coalesced: int = 0
+        self.commands_sent: int = 0
+        self.requests_sent: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "commands_received": self.commands_received,
+            "commands_coalesced": self.commands_coalesced,
+            "commands_sent": self.commands_sent,
+            "requests_sent": self.requests_sent,
+        }
+
+class XTDeviceCommandQueue:
+    def __init__(self, device_id: str) -> None:
+        self.device_id = device_id
+        #Commands indexed by DP code, insertion order is the order of the first command for each code
+        self.pending_commands: dict[str, dict[str, Any]] = {}
+        self.timer: threading.Timer | None = None
+
+class MultiCommandQueue:
+    def __init__(self, multi_manager: MultiManager, send_callback: Callable[[str, list[dict[str, Any]]], None], window: float = COMMAND_COALESCING_WINDOW) -> None:
+        self.multi_manager = multi_manager
+        self.send_callback = send_callback
+        self.window = window
+        self.device_queues: dict[str, XTDeviceCommandQueue] = {}
+        self.statistics = XTCommandQueueStatistics()
+        self.lock = threading.Lock()
+
+    def queue_commands(self, device_id: str, commands: list[dict[str, Any]]) -> None:
+        if not commands:
+            return
+        if self.window <= 0:
+            with self.lock:
+                self.statistics.commands_received += len(commands)
+            self._send(device_id, commands)
+            return
+        with self.lock:
+            device_queue = self.device_queues.get(device_id)
+            if device_queue is None:
+                device_queue = XTDeviceCommandQueue(device_id)
+                self.device_queues[device_id] = device_queue
+            for command in commands:
+                self.statistics.commands_received += 1
+                command_code = str(command["code"])
+                if command_code in device_queue.pending_commands:
+                    #Keep the position of the first command but use the latest value
+                    self.statistics.commands_coalesced += 1
+                device_queue.pending_commands[command_code] = command
+            if device_queue.timer is None:
+                device_queue.timer = threading.Timer(self.window, self.flush, args=(device_id,))
+                device_queue.timer.daemon = True
+                device_queue.timer.start()
+
+    def flush(self, device_id: str) -> None:
+        with self.lock:
+            device_queue = self.device_queues.get(device_id)
+            if device_queue is None:
+                return
+            if device_queue.timer is not None:
+                device_queue.timer.cancel()
+                device_queue.timer = None
+            commands = list(device_queue.pending_commands.values())
+            device_queue.pending_commands.clear()
+        self._send(device_id, commands)
+
+    def flush_all(self) -> None:
+        with self.lock:
+            device_ids = list(self.device_queues)
+        for device_id in device_ids:
+            self.flush(device_id)
+
+    def _send(self, device_id: str, commands: list[dict[str, Any]]) -> None:
+        if not commands:
+            return
+        #Flushes run on the timer threads and the callers' threads, the counters are shared
+        with self.lock:
+            self.statistics.commands_sent += len(commands)
+            self.statistics.requests_sent += 1
+        self.multi_manager.device_watcher.report_message(device_id, f"Flushing queued commands: {commands}")
+        try:
+            self.send_callback(device_id, commands)
+        except Exception as e:
+            LOGGER.warning(f"Sending queued commands {commands} to {device_id} failed: {e}")
+
+    def get_statistics(self) -> dict[str, int]:
+        with self.lock:
+            return self.statistics.as_dict()
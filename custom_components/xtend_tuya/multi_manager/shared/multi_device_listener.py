@@ -15,8 +15,13 @@ from ..multi_manager import (
     XTDevice,
 )
 
+from .multi_performance_monitor import (
+    STAGE_UPDATE_DEVICE,
+)
+
 from ...util import (
-    append_lists
+    append_lists,
+    DeviceDescriptorIndex,
 )
 
 
@@ -26,10 +31,12 @@ class MultiDeviceListener:
         self.hass = hass
 
     def update_device(self, device: XTDevice):
+        monitor_start = self.multi_manager.performance_monitor.start()
         signal_list: list[str] = []
         for account in self.multi_manager.accounts.values():
             signal_list = append_lists(signal_list, account.on_update_device(device))
         self.trigger_device_discovery(device, signal_list)
+        self.multi_manager.performance_monitor.stop(STAGE_UPDATE_DEVICE, monitor_start)
 
     def trigger_device_discovery(self, device: XTDevice, signal_list: list[str]):
         for signal in signal_list:
@@ -37,6 +44,7 @@ class MultiDeviceListener:
 
     def add_device(self, device: XTDevice):
         self.hass.add_job(self.async_remove_device, device.id)
+        DeviceDescriptorIndex.forget_device(device.id)
         signal_list: list[str] = []
         for account in self.multi_manager.accounts.values():
             signal_list = append_lists(signal_list, account.on_add_device(device))
@@ -45,6 +53,7 @@ class MultiDeviceListener:
 
     def remove_device(self, device_id: str):
         #log_stack("DeviceListener => async_remove_device")
+        DeviceDescriptorIndex.forget_device(device_id)
         device_registry = dr.async_get(self.hass)
         identifiers: set = {}
         account_identifiers: set = {}
@@ -63,6 +72,7 @@ class MultiDeviceListener:
     def async_remove_device(self, device_id: str) -> None:
         """Remove device from Home Assistant."""
         #log_stack("DeviceListener => async_remove_device")
+        DeviceDescriptorIndex.forget_device(device_id)
         device_registry = dr.async_get(self.hass)
         device_entry = device_registry.async_get_device(
             identifiers={(DOMAIN_ORIG, device_id), (DOMAIN, device_id)}
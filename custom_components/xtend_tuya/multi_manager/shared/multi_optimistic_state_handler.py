@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+from ..multi_manager import (
+    MultiManager,
+)
+from ...const import (
+    LOGGER,  # noqa: F401
+)
+
+#Time (in seconds) after which a commanded value that was not confirmed by a report is rolled back
+OPTIMISTIC_STATE_TIMEOUT = 5
+
+class XTOptimisticPendingState:
+    def __init__(self, code: str, previous_value: Any, commanded_value: Any) -> None:
+        self.code = code
+        self.previous_value = previous_value
+        self.commanded_value = commanded_value
+        self.timer: threading.Timer | None = None
+
+class XTOptimisticStateHandler:
+    def __init__(self, multi_manager: MultiManager, timeout: float = OPTIMISTIC_STATE_TIMEOUT) -> None:
+        self.multi_manager = multi_manager
+        self.timeout = timeout
+        self.enabled: bool = False
+        self.pending_states: dict[str, dict[str, XTOptimisticPendingState]] = {}
+        self.lock = threading.Lock()
+
+    def get_pending_states(self) -> dict[str, dict[str, Any]]:
+        #Commanded values that are shown but not yet confirmed by a report, per device
+        with self.lock:
+            return {
+                device_id: {
+                    code: {"commanded_value": pending_state.commanded_value, "previous_value": pending_state.previous_value}
+                    for code, pending_state in device_pending.items()
+                }
+                for device_id, device_pending in self.pending_states.items()
+            }
+
+    def apply_commands(self, device_id: str, commands: list[dict[str, Any]]) -> None:
+        if not self.enabled:
+            return
+        device = self.multi_manager.device_map.get(device_id, None)
+        if not device:
+            return
+        applied = False
+        with self.lock:
+            device_pending = self.pending_states.setdefault(device_id, {})
+            for command in commands:
+                code = str(command["code"])
+                if code not in device.status:
+                    continue
+                previous_value = device.status[code]
+                if current_pending := device_pending.get(code):
+                    #Keep the last confirmed value to be able to roll back to it
+                    previous_value = current_pending.previous_value
+                    current_pending.timer.cancel()
+                pending_state = XTOptimisticPendingState(code, previous_value, command["value"])
+                pending_state.timer = threading.Timer(self.timeout, self._on_timeout, args=(device_id, pending_state))
+                pending_state.timer.daemon = True
+                device_pending[code] = pending_state
+                device.status[code] = command["value"]
+                pending_state.timer.start()
+                applied = True
+        if applied:
+            self.multi_manager.device_watcher.report_message(device_id, f"Optimistic states applied: {commands}", device)
+            self.multi_manager.multi_device_listener.update_device(device)
+
+    def on_status_report(self, device_id: str, status_list: list) -> None:
+        if device_id not in self.pending_states:
+            return
+        with self.lock:
+            device_pending = self.pending_states.get(device_id)
+            if not device_pending:
+                return
+            for item in status_list:
+                code, _, _, result_ok = self.multi_manager._read_code_dpid_value_from_state(device_id, item, False, False)
+                if not result_ok or code is None:
+                    continue
+                #The reported value is the truth, it will be applied by the regular report processing
+                if pending_state := device_pending.pop(code, None):
+                    pending_state.timer.cancel()
+            if not device_pending:
+                self.pending_states.pop(device_id, None)
+
+    def _on_timeout(self, device_id: str, pending_state: XTOptimisticPendingState) -> None:
+        device = self.multi_manager.device_map.get(device_id, None)
+        with self.lock:
+            device_pending = self.pending_states.get(device_id, {})
+            if device_pending.get(pending_state.code) is not pending_state:
+                #Already reconciled or superseded by a newer command
+                return
+            device_pending.pop(pending_state.code)
+            if not device_pending:
+                self.pending_states.pop(device_id, None)
+            if not device or device.status.get(pending_state.code) != pending_state.commanded_value:
+                return
+            device.status[pending_state.code] = pending_state.previous_value
+        self.multi_manager.device_watcher.report_message(device_id, f"Optimistic state of {pending_state.code} rolled back to {pending_state.previous_value}", device)
+        self.multi_manager.multi_device_listener.update_device(device)
+
+    def clear(self) -> None:
+        with self.lock:
+            for device_pending in self.pending_states.values():
+                for pending_state in device_pending.values():
+                    pending_state.timer.cancel()
+            self.pending_states.clear()
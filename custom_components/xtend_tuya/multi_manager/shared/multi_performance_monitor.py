@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import bisect
+import json
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from ..multi_manager import (
+    MultiManager,
+)
+
+#Number of raw MQTT messages kept (config entry diagnostics) so that a real traffic trace can be replayed offline
+PERFORMANCE_MESSAGE_TRACE_SIZE = 500
+
+#Upper bounds (in milliseconds) of the latency histogram buckets, the last bucket is unbounded
+PERFORMANCE_HISTOGRAM_BUCKETS: tuple[float, ...] = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+STAGE_ON_MESSAGE = "on_message"
+STAGE_REPORT_CONVERT = "device_report_convert"
+STAGE_REPORT_FILTER = "device_report_filter"
+STAGE_REPORT_VIRTUAL_STATES = "device_report_virtual_states"
+STAGE_REPORT_APPLY = "device_report_apply"
+STAGE_UPDATE_DEVICE = "update_device"
+
+STARTUP_STAGE_ACCOUNT_CACHE = "account_device_cache"
+STARTUP_STAGE_CONVERT = "convert_to_xt_device"
+STARTUP_STAGE_MERGE = "merge_devices"
+STARTUP_STAGE_CLOUD_FIXES = "cloud_fixes"
+
+class XTLatencyHistogram:
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total: float = 0
+        self.max: float = 0
+        self.buckets: list[int] = [0] * (len(PERFORMANCE_HISTOGRAM_BUCKETS) + 1)
+
+    def add(self, duration_ms: float) -> None:
+        self.count += 1
+        self.total += duration_ms
+        if duration_ms > self.max:
+            self.max = duration_ms
+        self.buckets[bisect.bisect_left(PERFORMANCE_HISTOGRAM_BUCKETS, duration_ms)] += 1
+
+    def get_average(self) -> float | None:
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    def as_dict(self) -> dict[str, Any]:
+        buckets: dict[str, int] = {}
+        for index, bucket_count in enumerate(self.buckets):
+            if index < len(PERFORMANCE_HISTOGRAM_BUCKETS):
+                buckets[f"<={PERFORMANCE_HISTOGRAM_BUCKETS[index]}ms"] = bucket_count
+            else:
+                buckets[f">{PERFORMANCE_HISTOGRAM_BUCKETS[-1]}ms"] = bucket_count
+        average = self.get_average()
+        return {
+            "count": self.count,
+            "average_ms": round(average, 3) if average is not None else None,
+            "max_ms": round(self.max, 3),
+            "buckets": buckets,
+        }
+
+class XTPerformanceMonitor:
+    def __init__(self, multi_manager: MultiManager) -> None:
+        self.multi_manager = multi_manager
+        self.enabled: bool = False
+        self.start_time: float = time.monotonic()
+        self.stage_histograms: dict[str, XTLatencyHistogram] = {}
+        self.device_message_counts: dict[str, int] = {}
+        self.startup_durations: dict[str, dict[str, Any]] = {}
+        self.message_trace: deque[dict[str, Any]] = deque(maxlen=PERFORMANCE_MESSAGE_TRACE_SIZE)
+        self.lock = threading.Lock()
+
+    def set_enabled(self, enabled: bool) -> None:
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.start_time = time.monotonic()
+            self.stage_histograms.clear()
+            self.device_message_counts.clear()
+            self.message_trace.clear()
+
+    def start(self) -> float | None:
+        #Returns None when disabled so that stop() returns right away
+        if not self.enabled:
+            return None
+        return time.perf_counter()
+
+    def stop(self, stage: str, start: float | None) -> float | None:
+        if start is None:
+            return None
+        now = time.perf_counter()
+        with self.lock:
+            histogram = self.stage_histograms.get(stage)
+            if histogram is None:
+                histogram = XTLatencyHistogram()
+                self.stage_histograms[stage] = histogram
+            histogram.add((now - start) * 1000)
+        return now
+
+    def stop_startup_stage(self, stage: str, start: float | None, device_count: int) -> float | None:
+        #Startup stages run once per device cache update, keep their last duration instead of a histogram
+        if start is None:
+            return None
+        now = time.perf_counter()
+        duration_ms = (now - start) * 1000
+        with self.lock:
+            self.startup_durations[stage] = {
+                "duration_ms": round(duration_ms, 1),
+                "devices": device_count,
+                "per_device_ms": round(duration_ms / device_count, 3) if device_count else None,
+            }
+        return now
+
+    def count_device_message(self, device_id: str) -> None:
+        if not self.enabled:
+            return
+        with self.lock:
+            self.device_message_counts[device_id] = self.device_message_counts.get(device_id, 0) + 1
+
+    def record_message(self, source: str, msg: dict[str, Any]) -> None:
+        #The message is serialized right away as the handlers modify it in place
+        if not self.enabled:
+            return
+        entry = {
+            "t": round(time.monotonic() - self.start_time, 3),
+            "source": source,
+            "message": json.dumps(msg),
+        }
+        with self.lock:
+            self.message_trace.append(entry)
+
+    def get_message_trace(self) -> list[dict[str, Any]]:
+        with self.lock:
+            return list(self.message_trace)
+
+    def get_stage_average(self, stage: str) -> float | None:
+        with self.lock:
+            if histogram := self.stage_histograms.get(stage):
+                return histogram.get_average()
+        return None
+
+    def get_stage_statistics(self, stage: str) -> dict[str, Any] | None:
+        with self.lock:
+            if histogram := self.stage_histograms.get(stage):
+                return histogram.as_dict()
+        return None
+
+    def get_message_rate(self) -> float:
+        #Messages per minute, all devices included
+        elapsed = time.monotonic() - self.start_time
+        if elapsed <= 0:
+            return 0
+        with self.lock:
+            total_messages = sum(self.device_message_counts.values())
+        return total_messages * 60 / elapsed
+
+    def get_statistics(self) -> dict[str, Any]:
+        elapsed = time.monotonic() - self.start_time
+        with self.lock:
+            startup = dict(self.startup_durations)
+            stages = {stage: histogram.as_dict() for stage, histogram in self.stage_histograms.items()}
+            device_rates = {
+                device_id: round(message_count * 60 / elapsed, 3) if elapsed > 0 else None
+                for device_id, message_count in self.device_message_counts.items()
+            }
+        return {
+            "enabled": self.enabled,
+            "monitoring_duration_s": round(elapsed, 1),
+            "startup": startup,
+            "stages": stages,
+            "device_messages_per_minute": device_rates,
+        }
@@ -104,6 +104,7 @@ class XTTuyaIOTDeviceManagerInterface(XTDeviceManagerInterface):
             auth_type=auth_type,
         )
         api.set_dev_channel("hass")
+        api.telemetry = self.multi_manager.api_telemetry
         try:
             if auth_type == AuthType.CUSTOM:
                 response = await hass.async_add_executor_job(
@@ -150,12 +151,13 @@ class XTTuyaIOTDeviceManagerInterface(XTDeviceManagerInterface):
         self.iot_account.device_manager.remove_device_listener(self.multi_manager.multi_device_listener)
     
     def unload(self):
-        pass
+        self.iot_account.device_manager.ipc_manager.webrtc_manager.disconnect_all_sessions()
+        self.iot_account.device_manager.ipc_manager.webrtc_manager.clear_device_configs()
     
     def on_message(self, msg: str):
         self.iot_account.device_manager.on_message(msg)
     
-    def query_scenes(self) -> list:
+    def query_scenes(self) -> list | None:
         #return self.iot_account.home_manager.query_scenes()
         #Scenes should be handled by tuya_sharing
         return []
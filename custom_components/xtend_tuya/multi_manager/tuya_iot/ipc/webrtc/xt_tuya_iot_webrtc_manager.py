@@ -1,16 +1,100 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
+import threading
 import time
 import json
 
 from .....const import (
-    LOGGER,  # noqa: F401
+    LOGGER,
 )
 from ..xt_tuya_iot_ipc_manager import (
     XTIOTIPCManager,
 )
 
+#Validity (in seconds) of a WebRTC configuration whose ICE servers don't provide a TTL
+WEBRTC_CONFIG_DEFAULT_TTL = 600
+#Portion of the validity after which a cached WebRTC configuration is refreshed in the background
+WEBRTC_CONFIG_REFRESH_RATIO = 0.8
+#Time (in seconds) without any viewer after which a cached WebRTC configuration stops being refreshed
+WEBRTC_CONFIG_IDLE_TIMEOUT = 1800
+
+SDP_ENDLINE = "\r\n"
+SDP_CANDIDATE_PREFIX = "a=candidate:"
+SDP_END_OF_CANDIDATES = "a=end-of-candidates"
+
+def split_sdp_candidates(sdp: str) -> tuple[str, list[str]]:
+    """Return the SDP without its candidate/end-of-candidates lines and the unique candidate lines."""
+    kept_lines: list[str] = []
+    #Dict used as an ordered set
+    candidates: dict[str, None] = {}
+    lines = sdp.split(SDP_ENDLINE)
+    #Last element is what follows the last line ending (empty if the SDP ends with one)
+    trailing = lines.pop()
+    for line in lines:
+        if line.startswith(SDP_CANDIDATE_PREFIX):
+            candidates[line + SDP_ENDLINE] = None
+        elif line != SDP_END_OF_CANDIDATES:
+            kept_lines.append(line)
+    kept_lines.append(trailing)
+    return SDP_ENDLINE.join(kept_lines), list(candidates)
+
+def join_sdp_candidates(sdp: str, candidates: list[str]) -> str:
+    """Append the candidate lines and the end-of-candidates line to an SDP."""
+    if not candidates:
+        return sdp
+    return "".join([sdp, *candidates, SDP_END_OF_CANDIDATES, SDP_ENDLINE])
+
+class XTIOTWebRTCConfig:
+    def __init__(self, config: dict[str, any], ttl: int) -> None:
+        self.config = config
+        self.ttl = ttl
+        self.valid_until = datetime.now() + timedelta(0, ttl)
+        self.stream_types: tuple[int, int, int] | None = None
+        self.refresh_timer: threading.Timer | None = None
+
+    def is_valid(self) -> bool:
+        return self.valid_until > datetime.now()
+
+    def get_stream_types(self) -> tuple[int, int, int] | None:
+        #Parse the skill only once per configuration: (any, highest resolution, lowest resolution)
+        if self.stream_types is None:
+            self.stream_types = XTIOTWebRTCConfig._parse_stream_types(self.config.get("skill"))
+        return self.stream_types
+
+    @staticmethod
+    def _parse_stream_types(skill: str | None) -> tuple[int, int, int] | None:
+        any_stream_type = 1
+        highest_res_stream_type = any_stream_type
+        cur_highest = 0
+        lowest_res_stream_type = any_stream_type
+        cur_lowest = 0
+        if not skill:
+            return None
+        try:
+            skill_json: dict = json.loads(skill)
+            video_list: list[dict[str, any]] = skill_json.get("videos")
+            if video_list:
+                for video_details in video_list:
+                    if (
+                            "streamType" in video_details
+                        and "width" in video_details
+                        and "height" in video_details
+                    ):
+                        any_stream_type = video_details["streamType"]
+                        width = int(video_details["width"])
+                        height = int(video_details["height"])
+                        cur_value = width * height
+                        if cur_highest < cur_value:
+                            cur_highest = cur_value
+                            highest_res_stream_type = video_details["streamType"]
+                        if cur_lowest == 0 or cur_lowest > cur_value:
+                            cur_lowest = cur_value
+                            lowest_res_stream_type = video_details["streamType"]
+        except Exception:
+            return (any_stream_type, any_stream_type, any_stream_type)
+        return (any_stream_type, highest_res_stream_type, lowest_res_stream_type)
+
 class XTIOTWebRTCSession:
     webrtc_config: dict[str, any]
     original_offer: str
@@ -45,9 +129,20 @@ class XTIOTWebRTCSession:
             "\r\nEND DEBUG INFO"
             )
 
+#Every session is negotiated with the camera for a single viewer: the media flows directly between the viewer
+#and the camera, only the signaling goes through here so there is no media to fan out locally.
+#Viewers share a camera session by watching the same go2rtc stream (see docs/configure_go2rtc.md)
 class XTIOTWebRTCManager:
     def __init__(self, ipc_manager: XTIOTIPCManager) -> None:
         self.sdp_exchange: dict[str, XTIOTWebRTCSession] = {}
+        self.device_configs: dict[str, XTIOTWebRTCConfig] = {}
+        self.device_config_last_used: dict[str, float] = {}
+        self.device_config_lock = threading.Lock()
+        #Held while a device configuration is fetched so that only one request per device reaches the cloud
+        self.device_config_refresh_locks: dict[str, threading.Lock] = {}
+        #Device of each session that sent an offer and wasn't disconnected yet
+        self.active_sessions: dict[str, str] = {}
+        self.active_session_lock = threading.Lock()
         self.ipc_manager = ipc_manager
     
     def get_webrtc_session(self, session_id: str) -> XTIOTWebRTCSession | None:
@@ -78,12 +173,49 @@ class XTIOTWebRTCManager:
 
     def set_config(self, session_id: str, config: dict[str, any]):
         self._create_session_if_necessary(session_id)
+        self.sdp_exchange[session_id].webrtc_config = config
 
+    def _format_config(self, config: dict[str, any]) -> None:
         #Format ICE Servers so that they can be used by GO2RTC
         p2p_config: dict = config.get("p2p_config", {})
         if ices := p2p_config.get("ices"):
             p2p_config["ices"] = json.dumps(ices).replace(': ', ':').replace(', ', ',')
-        self.sdp_exchange[session_id].webrtc_config = config
+
+    def _get_config_ttl(self, config: dict[str, any]) -> int:
+        #The configuration is as valid as the shortest lived ICE server credentials
+        ttl_list: list[int] = []
+        p2p_config: dict = config.get("p2p_config", {})
+        ices = p2p_config.get("ices")
+        if isinstance(ices, list):
+            for ice in ices:
+                if isinstance(ice, dict) and (ice_ttl := ice.get("ttl")):
+                    try:
+                        ttl_list.append(int(ice_ttl))
+                    except (TypeError, ValueError):
+                        continue
+        if ttl_list:
+            return min(ttl_list)
+        return WEBRTC_CONFIG_DEFAULT_TTL
+
+    def _reset_sdp_exchange(self, session_id: str) -> None:
+        #A new offer starts a new negotiation, drop the answer of the previous one
+        self._create_session_if_necessary(session_id)
+        session = self.sdp_exchange[session_id]
+        session.answer = {}
+        session.final_answer = None
+        session.answer_candidates = []
+        session.has_all_candidates = False
+
+    def disconnect_all_sessions(self) -> None:
+        #Free the camera session slots of the viewers that are still connected
+        with self.active_session_lock:
+            active_sessions = dict(self.active_sessions)
+            self.active_sessions.clear()
+        for session_id, device_id in active_sessions.items():
+            try:
+                self._send_disconnect(device_id, session_id)
+            except Exception as e:
+                LOGGER.warning(f"Could not disconnect WebRTC session {session_id} of {device_id}: {e}")
 
     def set_sdp_offer(self, session_id: str, offer: str) -> None:
         self._create_session_if_necessary(session_id)
@@ -102,14 +234,76 @@ class XTIOTWebRTCManager:
         if current_exchange := self.get_webrtc_session(session_id):
             if current_exchange.webrtc_config:
                 return current_exchange.webrtc_config
-        
-        webrtc_config = self.ipc_manager.api.get(f"/v1.0/devices/{device_id}/webrtc-configs")
-        if webrtc_config.get("success"):
-            result = webrtc_config.get("result")
-            self.set_config(session_id, result)
-            return result
+
+        if device_config := self.get_device_config(device_id):
+            self.set_config(session_id, device_config.config)
+            return device_config.config
         return None
-    
+
+    def get_device_config(self, device_id: str) -> XTIOTWebRTCConfig | None:
+        with self.device_config_lock:
+            device_config = self.device_configs.get(device_id)
+            self.device_config_last_used[device_id] = time.monotonic()
+        if device_config is not None and device_config.is_valid():
+            return device_config
+        return self._refresh_device_config(device_id)
+
+    def _on_device_config_refresh_timer(self, device_id: str) -> None:
+        with self.device_config_lock:
+            last_used = self.device_config_last_used.get(device_id)
+        if last_used is None or time.monotonic() - last_used > WEBRTC_CONFIG_IDLE_TIMEOUT:
+            #Nobody watched this camera lately, let the configuration expire and fetch it again on demand
+            LOGGER.debug(f"Stopped refreshing the WebRTC configuration of idle device {device_id}")
+            return
+        try:
+            self._refresh_device_config(device_id)
+        except Exception as e:
+            LOGGER.warning(f"Background refresh of the WebRTC configuration of {device_id} failed: {e}")
+
+    def _refresh_device_config(self, device_id: str) -> XTIOTWebRTCConfig | None:
+        with self.device_config_lock:
+            known_config = self.device_configs.get(device_id)
+            refresh_lock = self.device_config_refresh_locks.setdefault(device_id, threading.Lock())
+        with refresh_lock:
+            with self.device_config_lock:
+                current_config = self.device_configs.get(device_id)
+            if current_config is not None and current_config is not known_config and current_config.is_valid():
+                #Fetched by the timer or another viewer while this one was waiting
+                return current_config
+            return self._fetch_device_config(device_id)
+
+    def _fetch_device_config(self, device_id: str) -> XTIOTWebRTCConfig | None:
+        webrtc_config = self.ipc_manager.api.get(f"/v1.0/devices/{device_id}/webrtc-configs")
+        if not webrtc_config or not webrtc_config.get("success"):
+            LOGGER.warning(f"Could not fetch the WebRTC configuration of {device_id}: {webrtc_config}")
+            return None
+        result = webrtc_config.get("result")
+        if not isinstance(result, dict):
+            LOGGER.warning(f"Invalid WebRTC configuration received for {device_id}: {result}")
+            return None
+        ttl = self._get_config_ttl(result)
+        self._format_config(result)
+        device_config = XTIOTWebRTCConfig(result, ttl)
+        #Keep the configuration warm so that new viewers don't wait for the cloud
+        device_config.refresh_timer = threading.Timer(ttl * WEBRTC_CONFIG_REFRESH_RATIO, self._on_device_config_refresh_timer, args=(device_id,))
+        device_config.refresh_timer.daemon = True
+        with self.device_config_lock:
+            if previous_config := self.device_configs.get(device_id):
+                if previous_config.refresh_timer is not None:
+                    previous_config.refresh_timer.cancel()
+            self.device_configs[device_id] = device_config
+        device_config.refresh_timer.start()
+        return device_config
+
+    def clear_device_configs(self) -> None:
+        with self.device_config_lock:
+            for device_config in self.device_configs.values():
+                if device_config.refresh_timer is not None:
+                    device_config.refresh_timer.cancel()
+            self.device_configs.clear()
+            self.device_config_last_used.clear()
+            self.device_config_refresh_locks.clear()
+
     def get_ice_servers(self, device_id: str, session_id: str, format: str) -> None:
         if config := self.get_config(device_id, session_id):
             p2p_config: dict = config.get("p2p_config", {})
@@ -138,66 +332,34 @@ class XTIOTWebRTCManager:
 
     def _get_stream_type(self, device_id: str, session_id: str, requested_channel: str) -> int:
         any_stream_type = 1
-        highest_res_stream_type = any_stream_type
-        cur_highest = 0
-        lowest_res_stream_type = any_stream_type
-        cur_lowest = 0
-        if webrtc_config := self.get_config(device_id, session_id):
-            if skill := webrtc_config.get("skill"):
-                try:
-                    skill_json: dict = json.loads(skill)
-                    video_list: list[dict[str, any]] = skill_json.get("videos")
-                    if video_list:
-                        for video_details in video_list:
-                            if (
-                                    "streamType" in video_details
-                                and "width" in video_details
-                                and "height" in video_details
-                            ):
-                                any_stream_type = video_details["streamType"]
-                                width = int(video_details["width"])
-                                height = int(video_details["height"])
-                                cur_value = width * height
-                                if cur_highest < cur_value:
-                                    cur_highest = cur_value
-                                    highest_res_stream_type = video_details["streamType"]
-                                if cur_lowest == 0 or cur_lowest > cur_value:
-                                    cur_lowest = cur_value
-                                    lowest_res_stream_type = video_details["streamType"]
-                    if requested_channel == "high":
-                        return highest_res_stream_type
-                    elif requested_channel == "low":
-                        return lowest_res_stream_type
-                    else:
-                        return int(requested_channel)
-                except Exception:
-                    return any_stream_type
+        if self.get_config(device_id, session_id):
+            device_config = self.device_configs.get(device_id)
+            if device_config is None or (stream_types := device_config.get_stream_types()) is None:
+                return any_stream_type
+            any_stream_type, highest_res_stream_type, lowest_res_stream_type = stream_types
+            if requested_channel == "high":
+                return highest_res_stream_type
+            elif requested_channel == "low":
+                return lowest_res_stream_type
+            try:
+                return int(requested_channel)
+            except Exception:
+                return any_stream_type
         return any_stream_type
 
     def get_sdp_answer(self, device_id: str, session_id: str, sdp_offer: str, channel: str, wait_for_answers: int = 5) -> str | None:
         sleep_step = 0.01
         sleep_count: int = int(wait_for_answers / sleep_step)
-        ENDLINE = "\r\n"
-        self.set_original_sdp_offer(session_id, sdp_offer)
         if webrtc_config := self.get_config(device_id, session_id):
+            stream_type = self._get_stream_type(device_id, session_id, channel)
+            with self.active_session_lock:
+                self.active_sessions[session_id] = device_id
+            self._reset_sdp_exchange(session_id)
+            self.set_original_sdp_offer(session_id, sdp_offer)
             auth_token = webrtc_config.get("auth")
             moto_id =  webrtc_config.get("moto_id")
             topic: str = None
-            offer_candidates = []
-            candidate_found = True
-            while candidate_found:
-                offset = sdp_offer.find("a=candidate:")
-                if offset == -1:
-                    candidate_found = False
-                    break
-                end_offset = sdp_offer.find(ENDLINE, offset) + len(ENDLINE)
-                if end_offset <= offset:
-                    break
-                candidate_str = sdp_offer[offset:end_offset]
-                if candidate_str not in offer_candidates:
-                    offer_candidates.append(candidate_str)
-                sdp_offer = sdp_offer.replace(candidate_str, "")
-            sdp_offer = sdp_offer.replace("a=end-of-candidates" + ENDLINE, "")
+            sdp_offer, offer_candidates = split_sdp_candidates(sdp_offer)
             self.set_sdp_offer(session_id, sdp_offer)
             for topic in self.ipc_manager.ipc_mq.mq_config.sink_topic.values():
                 topic = topic.replace("{device_id}", device_id)
@@ -220,11 +382,11 @@ class XTIOTWebRTCManager:
                             "sdp":f"{sdp_offer}",
                             "auth":f"{auth_token}",
                             "mode":"webrtc",
-                            "stream_type":self._get_stream_type(device_id, session_id, channel),
+                            "stream_type":stream_type,
                         }
                     },
                 }
-                self.ipc_manager.publish_to_ipc_mqtt(topic, json.dumps(payload))
+                messages: list[tuple[str, str]] = [(topic, json.dumps(payload))]
                 if offer_candidates:
                     for candidate in offer_candidates:
                         payload = {
@@ -247,7 +409,8 @@ class XTIOTWebRTCManager:
                                 }
                             },
                         }
-                        self.ipc_manager.publish_to_ipc_mqtt(topic, json.dumps(payload))
+                        messages.append((topic, json.dumps(payload)))
+                self.ipc_manager.publish_batch_to_ipc_mqtt(messages)
                 for _ in range(sleep_count):
                     if session := self.get_webrtc_session(session_id):
                         if session.has_all_candidates:
@@ -277,12 +440,10 @@ class XTIOTWebRTCManager:
                     self.ipc_manager.publish_to_ipc_mqtt(topic, json.dumps(payload))
                 if session := self.get_webrtc_session(session_id):
                     #Format SDP answer and send it back
-                    sdp_answer: str = session.answer.get("sdp", "")
-                    candidates: str = ""
-                    if session.answer_candidates:
-                        for candidate in session.answer_candidates:
-                            candidates += candidate.get("candidate", "")
-                        sdp_answer += candidates + "a=end-of-candidates" + ENDLINE
+                    sdp_answer: str = join_sdp_candidates(
+                        session.answer.get("sdp", ""),
+                        [candidate.get("candidate", "") for candidate in session.answer_candidates],
+                    )
                     session.final_answer = f"{sdp_answer}"
                     return sdp_answer
             
@@ -292,6 +453,11 @@ class XTIOTWebRTCManager:
         return None
     
     def delete_webrtc_session(self, device_id: str, session_id: str) -> str | None:
+        with self.active_session_lock:
+            self.active_sessions.pop(session_id, None)
+        return self._send_disconnect(device_id, session_id)
+
+    def _send_disconnect(self, device_id: str, session_id: str) -> str | None:
         if webrtc_config := self.get_config(device_id, session_id):
             moto_id =  webrtc_config.get("moto_id")
             payload = {
@@ -313,8 +479,10 @@ class XTIOTWebRTCManager:
                     }
                 },
             }
-            for topic in self.ipc_manager.ipc_mq.mq_config.sink_topic.values():
-                self.ipc_manager.publish_to_ipc_mqtt(topic, json.dumps(payload))
+            payload_str = json.dumps(payload)
+            self.ipc_manager.publish_batch_to_ipc_mqtt(
+                [(topic, payload_str) for topic in self.ipc_manager.ipc_mq.mq_config.sink_topic.values()]
+            )
             return ""
         return None
     
@@ -341,7 +509,9 @@ class XTIOTWebRTCManager:
                     }
                 },
             }
-            for topic in self.ipc_manager.ipc_mq.mq_config.sink_topic.values():
-                self.ipc_manager.publish_to_ipc_mqtt(topic, json.dumps(payload))
+            payload_str = json.dumps(payload)
+            self.ipc_manager.publish_batch_to_ipc_mqtt(
+                [(topic, payload_str) for topic in self.ipc_manager.ipc_mq.mq_config.sink_topic.values()]
+            )
             return ""
         return None
\ No newline at end of file
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import time
+
 from tuya_iot import (
     TuyaOpenAPI,
 )
@@ -25,6 +27,9 @@ from .webrtc.xt_tuya_iot_webrtc_manager import (
     XTIOTWebRTCManager,
 )
 
+#Overall time (in seconds) to wait for the publish acknowledgements of a batch
+IPC_PUBLISH_TIMEOUT = 10
+
 class XTIOTIPCManager:  # noqa: F811
     def __init__(self, api: TuyaOpenAPI, multi_manager: MultiManager) -> None:
         self.multi_manager = multi_manager
@@ -39,6 +44,24 @@ class XTIOTIPCManager:  # noqa: F811
         return self.ipc_mq.mq_config.username.split("cloud_")[1]
 
     def publish_to_ipc_mqtt(self, topic: str, msg: str):
-        LOGGER.warning(f"Publishing to IPC: {msg}")
-        publish_result = self.ipc_mq.client.publish(topic=topic, payload=msg)
-        publish_result.wait_for_publish(10)
\ No newline at end of file
+        self.publish_batch_to_ipc_mqtt([(topic, msg)])
+
+    def publish_batch_to_ipc_mqtt(self, messages: list[tuple[str, str]], timeout: float = IPC_PUBLISH_TIMEOUT) -> bool:
+        #Publish everything first, then wait for all the acknowledgements with a single deadline
+        publish_results = []
+        for topic, msg in messages:
+            LOGGER.debug(f"Publishing to IPC: {msg}")
+            publish_results.append(self.ipc_mq.client.publish(topic=topic, payload=msg))
+        deadline = time.monotonic() + timeout
+        for publish_result in publish_results:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                publish_result.wait_for_publish(remaining)
+            except (ValueError, RuntimeError) as e:
+                LOGGER.debug(f"Publishing to IPC failed: {e}")
+        all_published = all(publish_result.is_published() for publish_result in publish_results)
+        if not all_published:
+            LOGGER.debug(f"Not all IPC messages were acknowledged within {timeout}s")
+        return all_published
\ No newline at end of file
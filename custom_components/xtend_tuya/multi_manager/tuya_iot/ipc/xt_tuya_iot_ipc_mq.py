@@ -63,7 +63,7 @@ class XTIOTOpenMQIPC(XTIOTOpenMQ):
             },
         )
 
-        if response.get("success", False) is False:
+        if not response or response.get("success", False) is False:
             log_stack(f"_get_mqtt_config failed: {response}")
             return None
 
@@ -5,11 +5,17 @@ https://github.com/tuya/tuya-iot-python-sdk
 
 from __future__ import annotations
 import json
+import threading
+import time
 from tuya_iot import (
     TuyaDeviceManager,
     TuyaOpenAPI,
     TuyaOpenMQ,
 )
+from tuya_iot.device import (
+    TuyaDeviceFunction,
+    TuyaDeviceStatusRange,
+)
 from typing import Any
 
 from ...const import (
@@ -30,11 +36,22 @@ from ..shared.merging_manager import (
 from ..multi_manager import (
     MultiManager,  # noqa: F811
 )
+from ..shared.multi_performance_monitor import (
+    STAGE_REPORT_CONVERT,
+    STAGE_REPORT_FILTER,
+    STAGE_REPORT_VIRTUAL_STATES,
+    STAGE_REPORT_APPLY,
+)
 from ...base import TuyaEntity
 from .ipc.xt_tuya_iot_ipc_manager import (
     XTIOTIPCManager
 )
 
+#Time (in seconds) during which the remote unlock capabilities of a lock are reused
+LOCK_REMOTE_UNLOCK_TYPES_TTL = 3600
+#Safety margin (in seconds) before the expiration of a prefetched unlock ticket
+LOCK_TICKET_EXPIRATION_MARGIN = 10
+
 
 class XTIOTDeviceManager(TuyaDeviceManager):
     def __init__(self, multi_manager: MultiManager, api: TuyaOpenAPI, mq: TuyaOpenMQ) -> None:
@@ -44,6 +61,11 @@ class XTIOTDeviceManager(TuyaDeviceManager):
         mq.add_message_listener(self.forward_message_to_multi_manager)
         self.multi_manager = multi_manager
         self.ipc_manager = XTIOTIPCManager(api, multi_manager)
+        self.lock_remote_unlock_types: dict[str, tuple[float, list[str]]] = {}
+        self.lock_tickets: dict[str, tuple[float, str]] = {}
+        #Devices whose ticket prefetch is running
+        self.lock_ticket_prefetches: set[str] = set()
+        self.lock_ticket_lock = threading.Lock()
 
     def forward_message_to_multi_manager(self, msg:str):
         self.multi_manager.on_message(MESSAGE_SOURCE_TUYA_IOT, msg)
@@ -59,7 +81,7 @@ class XTIOTDeviceManager(TuyaDeviceManager):
         except Exception as e:
             LOGGER.warning(f"get_device_info failed, trying other method {e}")
             response = self.api.get(f"/v2.0/cloud/thing/{device_id}")
-            if response["success"]:
+            if response and response.get("success", False):
                 result = response["result"]
                 result["online"] = result["is_online"]
                 return response
@@ -78,13 +100,13 @@ class XTIOTDeviceManager(TuyaDeviceManager):
         except Exception as e:
             LOGGER.warning(f"get_device_status failed, trying other method {e}")
             response = self.api.get(f"/v1.0/iot-03/devices/{device_id}/status")
-            if response["success"]:
+            if response and response.get("success", False):
                 return response
 
     #Copy of the Tuya original method with some minor modifications
     def update_device_list_in_smart_home_mod(self):
         response = self.api.get(f"/v1.0/users/{self.api.token_info.uid}/devices")
-        if response["success"]:
+        if response and response.get("success", False):  #CHANGED
             for item in response["result"]:
                 device = XTDevice(**item)               #CHANGED
                 status = {}
@@ -109,7 +131,7 @@ class XTIOTDeviceManager(TuyaDeviceManager):
     def get_devices_from_sharing(self) -> dict[str, XTDevice]:
         return_dict: dict[str, XTDevice] = {}
         response = self.api.get(f"/v1.0/users/{self.api.token_info.uid}/devices?from=sharing")
-        if response["success"]:
+        if response and response.get("success", False):
             for item in response["result"]:
                 device = XTDevice(**item)
                 status = {}
@@ -126,12 +148,13 @@ class XTIOTDeviceManager(TuyaDeviceManager):
         self.update_device_list_in_smart_home_mod()
     
     def update_device_function_cache(self, devIds: list = []):
-        super().update_device_function_cache(devIds)
+        self._update_device_specification_cache(devIds)
         for device_id in self.device_map:
             device = self.device_map[device_id]
             device_open_api = self.get_open_api_device(device)
-            self.multi_manager.device_watcher.report_message(device_id, f"About to merge {device} and {device_open_api}", device)
-            XTMergingManager.merge_devices(device, device_open_api)
+            if device_open_api is not None:
+                self.multi_manager.device_watcher.report_message(device_id, f"About to merge {device} and {device_open_api}", device)
+                XTMergingManager.merge_devices(device, device_open_api)
             self.multi_manager.virtual_state_handler.apply_init_virtual_states(device)
 
     def on_message(self, msg: str):
@@ -146,9 +169,14 @@ class XTIOTDeviceManager(TuyaDeviceManager):
         if not device:
             return
         self.multi_manager.device_watcher.report_message(device_id, f"[IOT]On device report: {status}", device)
+        performance_monitor = self.multi_manager.performance_monitor
+        monitor_time = performance_monitor.start()
         status_new = self.multi_manager.convert_device_report_status_list(device_id, status)
+        monitor_time = performance_monitor.stop(STAGE_REPORT_CONVERT, monitor_time)
         status_new = self.multi_manager.multi_source_handler.filter_status_list(device_id, MESSAGE_SOURCE_TUYA_IOT, status_new)
+        monitor_time = performance_monitor.stop(STAGE_REPORT_FILTER, monitor_time)
         status_new = self.multi_manager.virtual_state_handler.apply_virtual_states_to_status_list(device, status_new)
+        monitor_time = performance_monitor.stop(STAGE_REPORT_VIRTUAL_STATES, monitor_time)
         for item in status:
             if "code" in item and "value" in item:
                 code = item["code"]
@@ -163,15 +191,56 @@ class XTIOTDeviceManager(TuyaDeviceManager):
                 for alias in device.local_strategy[item["dpId"]]["status_code_alias"]:
                     value = item["value"]
                     device.status[alias] = value
+        performance_monitor.stop(STAGE_REPORT_APPLY, monitor_time)
 
         super()._on_device_report(device_id, [])
 
+    #Copy of the Tuya original update_device_function_cache that skips the devices whose specification couldn't be fetched
+    def _update_device_specification_cache(self, devIds: list = []):
+        device_map = (
+            filter(lambda d: d.id in devIds, self.device_map.values())
+            if devIds
+            else self.device_map.values()
+        )
+
+        for device in device_map:
+            response = self.get_device_specification(device.id)
+            if response and response.get("success"):    #CHANGED
+                result = response.get("result", {})
+                function_map = {}
+                for function in result["functions"]:
+                    code = function["code"]
+                    function_map[code] = TuyaDeviceFunction(**function)
+
+                status_range = {}
+                for status in result["status"]:
+                    code = status["code"]
+                    status_range[code] = TuyaDeviceStatusRange(**status)
+
+                device.function = function_map
+                device.status_range = status_range
+
     def _update_device_list_info_cache(self, devIds: list[str]):
         response = self.get_device_list_info(devIds)
+        if not response:
+            return
         result = response.get("result", {})
         for item in result.get("list", []):
             device_id = item["id"]
             self.device_map[device_id] = XTDevice(**item)
+
+    def _update_device_list_status_cache(self, devIds: list[str]):
+        response = self.get_device_list_status(devIds)
+        if not response:
+            return
+        for item in response.get("result", []):
+            device_id = item["id"]
+            for status in item["status"]:
+                if "code" in status and "value" in status:
+                    code = status["code"]
+                    value = status["value"]
+                    device = self.device_map[device_id]
+                    device.status[code] = value
     
     def get_open_api_device(self, device: XTDevice) -> XTDevice | None:
         device_properties = XTDevice.from_compatible_device(device)
@@ -181,7 +250,7 @@ class XTIOTDeviceManager(TuyaDeviceManager):
         device_properties.local_strategy = {}
         response = self.api.get(f"/v2.0/cloud/thing/{device.id}/shadow/properties")
         response2 = self.api.get(f"/v2.0/cloud/thing/{device.id}/model")
-        if not response.get("success") or not response2.get("success"):
+        if not response or not response2 or not response.get("success") or not response2.get("success"):
             LOGGER.warning(f"Response1: {response}")
             LOGGER.warning(f"Response2: {response2}")
             return
@@ -286,10 +355,72 @@ class XTIOTDeviceManager(TuyaDeviceManager):
                 self.api.post(f"/v2.0/cloud/thing/{device_id}/shadow/properties/issue", {"properties": property_str}
         )
     
+    def get_lock_remote_unlock_types(self, device_id: str) -> list[str]:
+        if cached := self.lock_remote_unlock_types.get(device_id):
+            fetch_time, supported_unlock_types = cached
+            if time.monotonic() - fetch_time < LOCK_REMOTE_UNLOCK_TYPES_TTL:
+                return supported_unlock_types
+        supported_unlock_types: list[str] = []
+        remote_unlock_types = self.api.get(f"/v1.0/devices/{device_id}/door-lock/remote-unlocks")
+        self.multi_manager.device_watcher.report_message(device_id, f"API remote unlock types: {remote_unlock_types}", self.device_map[device_id])
+        if remote_unlock_types and remote_unlock_types.get("success", False):
+            results = remote_unlock_types.get("result", [])
+            for result in results:
+                if result.get("open", False):
+                    if supported_unlock_type := result.get("remote_unlock_type", None):
+                        supported_unlock_types.append(supported_unlock_type)
+            self.lock_remote_unlock_types[device_id] = (time.monotonic(), supported_unlock_types)
+        return supported_unlock_types
+
+    def _fetch_lock_ticket(self, device_id: str) -> tuple[float, str] | None:
+        ticket = self.api.post(f"/v1.0/devices/{device_id}/door-lock/password-ticket")
+        self.multi_manager.device_watcher.report_message(device_id, f"API remote unlock ticket: {ticket}", self.device_map[device_id])
+        if ticket and ticket.get("success", False):
+            result = ticket.get("result", {})
+            if ticket_id := result.get("ticket_id", None):
+                expire_time = result.get("expire_time", 0)
+                return time.monotonic() + expire_time - LOCK_TICKET_EXPIRATION_MARGIN, ticket_id
+        return None
+
+    def prefetch_lock_ticket(self, device_id: str) -> None:
+        try:
+            if ticket := self._fetch_lock_ticket(device_id):
+                with self.lock_ticket_lock:
+                    self.lock_tickets[device_id] = ticket
+        finally:
+            with self.lock_ticket_lock:
+                self.lock_ticket_prefetches.discard(device_id)
+
+    def _get_lock_ticket(self, device_id: str) -> tuple[str | None, bool]:
+        #Return the ticket and whether it was prefetched
+        #Tickets are single use, a prefetched one is consumed even if it turns out to be invalid
+        with self.lock_ticket_lock:
+            prefetched_ticket = self.lock_tickets.pop(device_id, None)
+        if prefetched_ticket is not None and prefetched_ticket[0] > time.monotonic():
+            return prefetched_ticket[1], True
+        if ticket := self._fetch_lock_ticket(device_id):
+            return ticket[1], False
+        return None, False
+
+    def _schedule_lock_ticket_prefetch(self, device_id: str) -> None:
+        with self.lock_ticket_lock:
+            if device_id in self.lock_ticket_prefetches:
+                return
+            cached_ticket = self.lock_tickets.get(device_id)
+            if cached_ticket is not None and cached_ticket[0] > time.monotonic():
+                return
+            self.lock_ticket_prefetches.add(device_id)
+        prefetch_thread = threading.Thread(target=self.prefetch_lock_ticket, args=(device_id,), daemon=True)
+        prefetch_thread.start()
+
+    def _send_door_operation(self, device_id: str, ticket_id: str, open: str) -> bool:
+        lock_operation = self.api.post(f"/v1.0/smart-lock/devices/{device_id}/password-free/door-operate", {"ticket_id": ticket_id, "open": open})
+        self.multi_manager.device_watcher.report_message(device_id, f"API remote unlock operation result: {lock_operation}", self.device_map[device_id])
+        return bool(lock_operation and lock_operation.get("success", False))
+
     def send_lock_unlock_command(
             self, device_id: str, lock: bool
     ) -> bool:
-        supported_unlock_types: list[str] = []
         if lock:
             open = "false"
         else:
@@ -297,21 +428,19 @@ class XTIOTDeviceManager(TuyaDeviceManager):
 
         self.multi_manager.device_watcher.report_message(device_id, f"Sending lock/unlock command open: {open}", self.device_map[device_id])
 
-        remote_unlock_types = self.api.get(f"/v1.0/devices/{device_id}/door-lock/remote-unlocks")
-        self.multi_manager.device_watcher.report_message(device_id, f"API remote unlock types: {remote_unlock_types}", self.device_map[device_id])
-        if remote_unlock_types.get("success", False):
-            results = remote_unlock_types.get("result", [])
-            for result in results:
-                if result.get("open", False):
-                    if supported_unlock_type := result.get("remote_unlock_type", None):
-                        supported_unlock_types.append(supported_unlock_type)
-        if "remoteUnlockWithoutPwd" in supported_unlock_types:
-            ticket = self.api.post(f"/v1.0/devices/{device_id}/door-lock/password-ticket")
-            self.multi_manager.device_watcher.report_message(device_id, f"API remote unlock ticket: {ticket}", self.device_map[device_id])
-            if ticket.get("success", False):
-                result = ticket.get("result", {})
-                if ticket_id := result.get("ticket_id", None):
-                    lock_operation = self.api.post(f"/v1.0/smart-lock/devices/{device_id}/password-free/door-operate", {"ticket_id": ticket_id, "open": open})
-                    self.multi_manager.device_watcher.report_message(device_id, f"API remote unlock operation result: {lock_operation}", self.device_map[device_id])
-                    return lock_operation.get("success", False)
+        if "remoteUnlockWithoutPwd" not in self.get_lock_remote_unlock_types(device_id):
+            #Not supported by the lock, the cached capabilities stay valid
+            return False
+        ticket_id, prefetched = self._get_lock_ticket(device_id)
+        if ticket_id:
+            success = self._send_door_operation(device_id, ticket_id, open)
+            if not success and prefetched:
+                #The cloud rejected the prefetched ticket (already consumed by _get_lock_ticket), retry once with a fresh one
+                if ticket := self._fetch_lock_ticket(device_id):
+                    success = self._send_door_operation(device_id, ticket[1], open)
+            if success:
+                self._schedule_lock_ticket_prefetch(device_id)
+                return True
+        #The ticket or the operation failed, the capabilities might have changed: fetch them again on the next try
+        self.lock_remote_unlock_types.pop(device_id, None)
         return False
\ No newline at end of file
@@ -8,6 +8,10 @@ from tuya_iot import (
 )
 from tuya_iot.openmq import (
     TuyaMQConfig,
+    TO_C_CUSTOM_MQTT_CONFIG_API,
+    TO_C_SMART_HOME_MQTT_CONFIG_API,
+    LINK_ID,
+    AuthType,
 )
 
 from ...const import (
@@ -21,7 +25,26 @@ class XTIOTOpenMQ(TuyaOpenMQ):
     def _get_mqtt_config(self) -> Optional[TuyaMQConfig]:
         if not self.api.is_connect():
             return None
-        return super()._get_mqtt_config()
+        #Copy of the Tuya original method that also handles requests without answer
+        response = self.api.post(
+            TO_C_CUSTOM_MQTT_CONFIG_API
+            if (self.api.auth_type == AuthType.CUSTOM)
+            else TO_C_SMART_HOME_MQTT_CONFIG_API,
+            {
+                "uid": self.api.token_info.uid,
+                "link_id": LINK_ID,
+                "link_type": "mqtt",
+                "topics": "device",
+                "msg_encrypted_version": "2.0"
+                if (self.api.auth_type == AuthType.CUSTOM)
+                else "1.0",
+            },
+        )
+
+        if not response or response.get("success", False) is False:
+            return None
+
+        return TuyaMQConfig(response)
 
     """def _on_connect(self, mqttc: mqtt.Client, user_data: Any, flags, rc):
         if rc == 0:
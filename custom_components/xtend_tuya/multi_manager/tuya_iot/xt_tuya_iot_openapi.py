@@ -13,10 +13,17 @@ from tuya_iot.tuya_enums import AuthType
 from tuya_iot.version import VERSION
 from ...const import (
     LOGGER,  # noqa: F401
+    MESSAGE_SOURCE_TUYA_IOT,
+)
+from ..shared.multi_api_telemetry import (
+    XTAPITelemetry,
 )
 
 TUYA_ERROR_CODE_TOKEN_INVALID = 1010
 
+#Time (in seconds) after which a request without answer from the cloud is abandoned
+TUYA_OPENAPI_REQUEST_TIMEOUT = 10
+
 TO_C_CUSTOM_REFRESH_TOKEN_API = "/v1.0/iot-03/users/token/"
 TO_C_SMART_HOME_REFRESH_TOKEN_API = "/v1.0/token/"
 
@@ -64,9 +71,11 @@ class XTIOTOpenAPI:
         access_secret: str,
         auth_type: AuthType = AuthType.SMART_HOME,
         lang: str = "en",
+        timeout: float = TUYA_OPENAPI_REQUEST_TIMEOUT,
     ) -> None:
         """Init TuyaOpenAPI."""
         self.session = requests.session()
+        self.timeout = timeout
 
         self.endpoint = endpoint
         self.access_id = access_id
@@ -83,6 +92,7 @@ class XTIOTOpenAPI:
         self.token_info: TuyaTokenInfo = None
 
         self.dev_channel: str = ""
+        self.telemetry: XTAPITelemetry | None = None
 
         self.__username = ""
         self.__password = ""
@@ -158,6 +168,8 @@ class XTIOTOpenAPI:
             return
 
         self.token_info.access_token = ""
+        if self.telemetry is not None:
+            self.telemetry.record_token_refresh(MESSAGE_SOURCE_TUYA_IOT)
 
         if self.auth_type == AuthType.CUSTOM:
             response = self.post(
@@ -168,6 +180,11 @@ class XTIOTOpenAPI:
                 TO_C_SMART_HOME_REFRESH_TOKEN_API + self.token_info.refresh_token
             )
 
+        if not response:
+            #Connect again on the next request
+            self.token_info = None
+            return
+
         self.token_info = TuyaTokenInfo(response)
 
     def set_dev_channel(self, dev_channel: str):
@@ -218,7 +235,7 @@ class XTIOTOpenAPI:
                 },
             )
         self.connecting = False
-        if not response["success"]:
+        if not response or not response.get("success", False):
             return response
 
         # Cache token info.
@@ -247,7 +264,7 @@ class XTIOTOpenAPI:
         params: dict[str, Any] | None = None,
         body: dict[str, Any] | None = None,
         first_pass: bool = True
-    ) -> dict[str, Any]:
+    ) -> dict[str, Any] | None:
 
         self.__refresh_access_token_if_need(path)
 
@@ -277,23 +294,42 @@ class XTIOTOpenAPI:
                 t = {int(time.time()*1000)}"
         ) """
 
-        response = self.session.request(
-            method, self.endpoint + path, params=params, json=body, headers=headers
-        )
+        request_start = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, self.endpoint + path, params=params, json=body, headers=headers, timeout=self.timeout
+            )
+        except requests.exceptions.RequestException as e:
+            #Timeouts and connection errors are answered like the other failed requests
+            if self.telemetry is not None:
+                self.telemetry.record_call(MESSAGE_SOURCE_TUYA_IOT, method, path, time.perf_counter() - request_start, type(e).__name__)
+            LOGGER.error(f"Request failed: method={method}, path={path}, error={type(e).__name__}: {e}")
+            return None
+        if self.telemetry is not None:
+            self.telemetry.record_transfer(MESSAGE_SOURCE_TUYA_IOT, method, path, len(response.request.body or b""), len(response.content))
 
         if response.ok is False:
+            if self.telemetry is not None:
+                self.telemetry.record_call(MESSAGE_SOURCE_TUYA_IOT, method, path, time.perf_counter() - request_start, f"http_{response.status_code}")
             LOGGER.error(
-                f"Response error: code={response.status_code}, body={response.body}"
+                f"Response error: code={response.status_code}, body={response.text}"
             )
             return None
 
         result = response.json()
+        if self.telemetry is not None:
+            self.telemetry.record_call(
+                MESSAGE_SOURCE_TUYA_IOT, method, path, time.perf_counter() - request_start,
+                None if result.get("success", False) else result.get("code", -1)
+            )
 
         """ LOGGER.debug(
             f"Response: {json.dumps(result, ensure_ascii=False, indent=2)}"
         ) """
 
         if result.get("code", -1) == TUYA_ERROR_CODE_TOKEN_INVALID:
+            if self.telemetry is not None:
+                self.telemetry.record_token_refresh(MESSAGE_SOURCE_TUYA_IOT)
             self.token_info = None
             self.connect(
                 self.__username, self.__password, self.__country_code, self.__schema
@@ -7,4 +7,6 @@ CONF_TERMINAL_ID = "terminal_id"
 CONF_TOKEN_INFO = "token_info"
 CONF_ENDPOINT = "endpoint"
 CONF_USER_CODE = "user_code"
-TUYA_CLIENT_ID = "HA_3y9q4ak7g4ephrvke"
\ No newline at end of file
+TUYA_CLIENT_ID = "HA_3y9q4ak7g4ephrvke"
+#Maximum number of requests (home device lists, device specifications/strategies) sent at the same time
+DEVICE_QUERY_MAX_WORKERS = 8
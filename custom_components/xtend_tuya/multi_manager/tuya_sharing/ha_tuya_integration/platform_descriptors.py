@@ -20,6 +20,10 @@ from ...ha_tuya_integration.tuya_integration_imports import (
     SWITCHES_TUYA
 )
 
+#Returned as module constants so that the merged descriptors can be memoized by identity
+LOCKS_TUYA: dict = {}
+VACUUMS_TUYA: list[str] = ["sd"]
+
 def get_tuya_platform_descriptors(platform: Platform) -> Any:
     match platform:
         case Platform.ALARM_CONTROL_PANEL:
@@ -41,7 +45,7 @@ def get_tuya_platform_descriptors(platform: Platform) -> Any:
         case Platform.LIGHT:
             return LIGHTS_TUYA
         case Platform.LOCK:
-            return {}
+            return LOCKS_TUYA
         case Platform.NUMBER:
             return NUMBERS_TUYA
         case Platform.SELECT:
@@ -53,4 +57,4 @@ def get_tuya_platform_descriptors(platform: Platform) -> Any:
         case Platform.SWITCH:
             return SWITCHES_TUYA
         case Platform.VACUUM:
-            return ["sd"]
\ No newline at end of file
+            return VACUUMS_TUYA
\ No newline at end of file
@@ -62,6 +62,7 @@ from .const import (
 )
 from .util import (
     get_overriden_tuya_integration_runtime_data,
+    instrument_customer_api,
 )
 from .ha_tuya_integration.platform_descriptors import (
     get_tuya_platform_descriptors
@@ -126,6 +127,7 @@ class XTTuyaSharingDeviceManagerInterface(XTDeviceManagerInterface):
                 token_listener,
             )
             sharing_device_manager.mq = None
+        instrument_customer_api(sharing_device_manager.customer_api, self.multi_manager.api_telemetry)
         sharing_device_manager.home_repository = HomeRepository(sharing_device_manager.customer_api)
         sharing_device_manager.device_repository = XTSharingDeviceRepository(sharing_device_manager.customer_api, sharing_device_manager, self.multi_manager)
         sharing_device_manager.scene_repository = SceneRepository(sharing_device_manager.customer_api)
@@ -178,7 +180,7 @@ class XTTuyaSharingDeviceManagerInterface(XTDeviceManagerInterface):
     def on_message(self, msg: str):
         self.sharing_account.device_manager.on_message(msg)
     
-    def query_scenes(self) -> list:
+    def query_scenes(self) -> list | None:
         #Regular Tuya scenes will be deleted by the cleanup_device_registry, readd them regardless of if we override or not
         return self.sharing_account.device_manager.query_scenes()
     
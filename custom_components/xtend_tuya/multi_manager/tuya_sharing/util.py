@@ -1,11 +1,28 @@
 from __future__ import annotations
 
+import functools
+import time
+from urllib.parse import urlsplit
+
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 
+from tuya_sharing.customerapi import (
+    CustomerApi,
+)
+from tuya_sharing.exceptions import (
+    ApiRequestException,
+)
+
 from .const import (
     DOMAIN_ORIG,
 )
+from ...const import (
+    MESSAGE_SOURCE_TUYA_SHARING,
+)
+from ..shared.multi_api_telemetry import (
+    XTAPITelemetry,
+)
 from ...util import (
     ConfigEntryRuntimeData,
     get_overriden_config_entry,
@@ -15,4 +32,50 @@ from ...util import (
 def get_overriden_tuya_integration_runtime_data(hass: HomeAssistant, entry: ConfigEntry) -> ConfigEntryRuntimeData | None:
     if (overriden_config_entry := get_overriden_config_entry(hass,entry, DOMAIN_ORIG)):
         return get_config_entry_runtime_data(hass, overriden_config_entry, DOMAIN_ORIG)
-    return None
\ No newline at end of file
+    return None
+
+SHARING_TOKEN_REFRESH_PATH = "/v1.0/m/token/"
+
+def instrument_customer_api(customer_api: CustomerApi, telemetry: XTAPITelemetry) -> None:
+    #The CustomerApi request method is private, wrap its public verbs and hook its session instead.
+    #The api can be shared with the Tuya integration and survive our reloads, only swap the telemetry in that case
+    already_instrumented = getattr(customer_api, "xt_api_telemetry", None) is not None
+    customer_api.xt_api_telemetry = telemetry
+    if already_instrumented:
+        return
+
+    def on_response(response, *args, **kwargs):
+        path = urlsplit(response.request.url).path
+        customer_api.xt_api_telemetry.record_transfer(
+            MESSAGE_SOURCE_TUYA_SHARING, response.request.method, path, len(response.request.body or b""), len(response.content)
+        )
+        if response.ok is False:
+            customer_api.xt_api_telemetry.record_call(
+                MESSAGE_SOURCE_TUYA_SHARING, response.request.method, path, response.elapsed.total_seconds(), f"http_{response.status_code}"
+            )
+
+    def get_wrapper(method: str, func):
+        @functools.wraps(func)
+        def wrapped(path: str, *args, **kwargs):
+            if path.startswith(SHARING_TOKEN_REFRESH_PATH):
+                customer_api.xt_api_telemetry.record_token_refresh(MESSAGE_SOURCE_TUYA_SHARING)
+            request_start = time.perf_counter()
+            try:
+                response = func(path, *args, **kwargs)
+            except ApiRequestException as e:
+                customer_api.xt_api_telemetry.record_call(MESSAGE_SOURCE_TUYA_SHARING, method, path, time.perf_counter() - request_start, e.error_code)
+                raise
+            except Exception as e:
+                customer_api.xt_api_telemetry.record_call(MESSAGE_SOURCE_TUYA_SHARING, method, path, time.perf_counter() - request_start, type(e).__name__)
+                raise
+            if response is not None:
+                #HTTP errors return None and are recorded by the session hook
+                customer_api.xt_api_telemetry.record_call(MESSAGE_SOURCE_TUYA_SHARING, method, path, time.perf_counter() - request_start)
+            return response
+        return wrapped
+
+    customer_api.session.hooks["response"].append(on_response)
+    customer_api.get = get_wrapper("GET", customer_api.get)
+    customer_api.post = get_wrapper("POST", customer_api.post)
+    customer_api.put = get_wrapper("PUT", customer_api.put)
+    customer_api.delete = get_wrapper("DELETE", customer_api.delete)
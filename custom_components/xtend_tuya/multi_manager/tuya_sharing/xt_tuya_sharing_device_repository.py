@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
 from tuya_sharing.customerapi import (
     CustomerApi,
 )
@@ -13,6 +16,9 @@ from tuya_sharing.device import (
 from ...const import (
     LOGGER,  # noqa: F401
 )
+from .const import (
+    DEVICE_QUERY_MAX_WORKERS,
+)
 
 from .xt_tuya_sharing_manager import (
     XTSharingDeviceManager,
@@ -31,6 +37,9 @@ class XTSharingDeviceRepository(DeviceRepository):
         super().__init__(customer_api)
         self.manager = manager
         self.multi_manager = multi_manager
+        #Strategy info per product id: (support_local, local_strategy)
+        self.product_strategy_cache: dict[str, tuple[bool, dict[int, dict]]] = {}
+        self.product_strategy_lock = threading.Lock()
 
     def update_device_specification(self, device: CustomerDevice):
         super().update_device_specification(device)
@@ -44,8 +53,22 @@ class XTSharingDeviceRepository(DeviceRepository):
     def query_devices_by_home(self, home_id: str) -> list[CustomerDevice]:
         response = self.api.get("/v1.0/m/life/ha/home/devices", {"homeId": home_id})
         return self._query_devices(response)
+
+    def query_home_device_list(self, home_id: str) -> list[CustomerDevice]:
+        #Devices of the home without their specification/strategy, see update_device_info
+        response = self.api.get("/v1.0/m/life/ha/home/devices", {"homeId": home_id})
+        return self._parse_devices(response)
     
     def _query_devices(self, response) -> list[CustomerDevice]:
+        _devices = self._parse_devices(response)
+        if not _devices:
+            return _devices
+        with ThreadPoolExecutor(max_workers=min(len(_devices), DEVICE_QUERY_MAX_WORKERS)) as executor:
+            #Consume the iterator so that exceptions are raised here
+            list(executor.map(self.update_device_info, _devices))
+        return _devices
+
+    def _parse_devices(self, response) -> list[CustomerDevice]:
         _devices = []
         if response["success"]:
             for item in response["result"]:
@@ -57,12 +80,31 @@ class XTSharingDeviceRepository(DeviceRepository):
                         value = item_status["value"]
                         status[code] = value
                 device.status = status
-                self.update_device_specification(device)
-                self.update_device_strategy_info(device)
                 _devices.append(device)
         return _devices
 
+    def update_device_info(self, device: CustomerDevice) -> None:
+        self.update_device_specification(device)
+        self.update_device_strategy_info(device)
+
+    def _copy_local_strategy(self, local_strategy: dict[int, dict]) -> dict[int, dict]:
+        return {
+            dp_id: {
+                **strategy,
+                "config_item": dict(strategy["config_item"]),
+                "status_code_alias": list(strategy["status_code_alias"]),
+            }
+            for dp_id, strategy in local_strategy.items()
+        }
+
     def _update_device_strategy_info_mod(self, device: CustomerDevice):
+        product_id = getattr(device, "product_id", None)
+        with self.product_strategy_lock:
+            cached_strategy = self.product_strategy_cache.get(product_id) if product_id else None
+        if cached_strategy is not None:
+            device.support_local = cached_strategy[0]
+            device.local_strategy = self._copy_local_strategy(cached_strategy[1])
+            return
         device_id = device.id
         response = self.api.get(f"/v1.0/m/life/devices/{device_id}/status")
         support_local = True
@@ -91,6 +133,8 @@ class XTSharingDeviceRepository(DeviceRepository):
             device.support_local = support_local
             #if support_local:                      #CHANGED
             device.local_strategy = dp_id_map       #CHANGED
+            with self.product_strategy_lock:
+                self.product_strategy_cache[pid] = (support_local, self._copy_local_strategy(dp_id_map))
 
     def update_device_strategy_info(self, device: CustomerDevice):
         #super().update_device_strategy_info(device)
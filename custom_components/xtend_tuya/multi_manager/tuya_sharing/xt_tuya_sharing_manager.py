@@ -3,6 +3,8 @@ This file contains all the code that inherit from Tuya integration
 """
 
 from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+import copy
 from typing import Any
 
 from tuya_sharing.manager import (
@@ -17,6 +19,14 @@ from tuya_sharing.home import (
     HomeRepository,
 )
 
+from tuya_sharing.device import (
+    CustomerDevice,
+)
+
+from tuya_sharing.scenes import (
+    SharingScene,
+)
+
 from .import_stub import (
     XTSharingDeviceManager,
 )
@@ -32,10 +42,23 @@ from ..multi_manager import (
 from ..shared.device import (
     XTDevice,
 )
+from ..shared.multi_performance_monitor import (
+    STAGE_REPORT_CONVERT,
+    STAGE_REPORT_FILTER,
+    STAGE_REPORT_VIRTUAL_STATES,
+    STAGE_REPORT_APPLY,
+)
 
 from .xt_tuya_sharing_device_repository import (
     XTSharingDeviceRepository
 )
+from .const import (
+    DEVICE_QUERY_MAX_WORKERS,
+)
+
+#Maximum number of homes whose scenes are queried at the same time
+SCENE_QUERY_MAX_WORKERS = 4
+SCENE_QUERY_API = "/v1.0/m/scene/ha/home/scenes"
 
 class XTSharingDeviceManager(Manager):  # noqa: F811
     def __init__(
@@ -55,6 +78,8 @@ class XTSharingDeviceManager(Manager):  # noqa: F811
         self.user_homes: list[SmartLifeHome] = []
         self.device_listeners = set()
         self.other_device_manager = other_device_manager
+        #Last scenes successfully queried per home, served when a query fails
+        self.last_home_scenes: dict[str, list] = {}
     
     @property
     def reuse_config(self) -> bool:
@@ -104,13 +129,79 @@ class XTSharingDeviceManager(Manager):  # noqa: F811
         return added_new_statuses
 
     def update_device_cache(self):
-        super().update_device_cache()
-        
-        for device in self.multi_manager.devices_shared.values():
-            if device.id not in self.device_map:
-                new_device = device.get_copy()
-                self.device_repository.update_device_strategy_info(new_device)
-                self.device_map[device.id] = new_device
+        self._update_home_devices_cache()
+
+        new_shared_devices = [device for device in self.multi_manager.devices_shared.values() if device.id not in self.device_map]
+        if not new_shared_devices:
+            return
+        with ThreadPoolExecutor(max_workers=min(len(new_shared_devices), DEVICE_QUERY_MAX_WORKERS)) as executor:
+            for new_device in executor.map(self._get_shared_device_copy, new_shared_devices):
+                self.device_map[new_device.id] = new_device
+
+    def _update_home_devices_cache(self):
+        #Same as the SDK's update_device_cache but the homes and the devices are queried concurrently.
+        #Home device lists and device specifications share one pool so that DEVICE_QUERY_MAX_WORKERS
+        #bounds the number of requests in flight on the customer API
+        self.user_homes = self.home_repository.query_homes()
+        self.device_map.clear()
+        if not self.user_homes:
+            return
+        #The SDK doesn't serialize token refreshes, refresh it once before the requests run concurrently
+        self.customer_api.refresh_access_token_if_need()
+        with ThreadPoolExecutor(max_workers=DEVICE_QUERY_MAX_WORKERS) as executor:
+            home_queries = [executor.submit(self.device_repository.query_home_device_list, home.id) for home in self.user_homes]
+            device_queries: dict[Future, CustomerDevice] = {}
+            for home_query in as_completed(home_queries):
+                for device in home_query.result():
+                    device_queries[executor.submit(self.device_repository.update_device_info, device)] = device
+            for device_query in as_completed(device_queries):
+                device_query.result()
+                device = device_queries[device_query]
+                self.device_map[device.id] = device
+
+    def _get_shared_device_copy(self, device: XTDevice) -> XTDevice:
+        new_device = device.get_shared_copy()
+        self.device_repository.update_device_strategy_info(new_device)
+        if new_device.local_strategy is device.local_strategy:
+            #The strategy couldn't be fetched, stop sharing it with the original device
+            new_device.local_strategy = copy.deepcopy(device.local_strategy)
+        return new_device
+
+    def query_scenes(self) -> list | None:
+        #None when the scenes couldn't be queried, as opposed to an empty list when there are none
+        home_ids = [home.id for home in self.user_homes]
+        if not home_ids:
+            return []
+        try:
+            self.customer_api.refresh_access_token_if_need()
+        except Exception as e:
+            LOGGER.warning(f"Querying scenes failed: {e}")
+            return None
+        with ThreadPoolExecutor(max_workers=min(len(home_ids), SCENE_QUERY_MAX_WORKERS)) as executor:
+            home_scenes = list(executor.map(self.query_home_scenes, home_ids))
+        if None in home_scenes:
+            return None
+        return [scene for scenes in home_scenes for scene in scenes]
+
+    def query_home_scenes(self, home_id: str) -> list | None:
+        #A failed query returns the last known scenes so that a transient error doesn't remove them (None if there are none).
+        #SceneRepository.query_scenes answers an unsuccessful response with no scenes, so the response is checked here
+        try:
+            response = self.customer_api.get(SCENE_QUERY_API, {"homeId": home_id})
+        except Exception as e:
+            response = None
+            LOGGER.warning(f"Querying scenes of home {home_id} failed: {e}")
+        if not response or not response.get("success", False):
+            if response:
+                LOGGER.warning(f"Querying scenes of home {home_id} failed: {response.get('code')} {response.get('msg')}")
+            return self.last_home_scenes.get(home_id)
+        scenes: list[SharingScene] = []
+        for item in response.get("result", []):
+            scene = SharingScene(**item)
+            scene.home_id = home_id
+            scenes.append(scene)
+        self.last_home_scenes[home_id] = scenes
+        return scenes
 
     def _on_device_other(self, device_id: str, biz_code: str, data: dict[str, Any]):
         self.multi_manager.device_watcher.report_message(device_id, f"[SHARING]On device other: {biz_code} <=> {data}")
@@ -121,10 +212,17 @@ class XTSharingDeviceManager(Manager):  # noqa: F811
         if not device:
             return
         self.multi_manager.device_watcher.report_message(device_id, f"[SHARING]On device report: {status}", device)
+        performance_monitor = self.multi_manager.performance_monitor
+        monitor_time = performance_monitor.start()
         status_new = self.multi_manager.convert_device_report_status_list(device_id, status)
+        monitor_time = performance_monitor.stop(STAGE_REPORT_CONVERT, monitor_time)
         status_new = self.multi_manager.multi_source_handler.filter_status_list(device_id, MESSAGE_SOURCE_TUYA_SHARING, status_new)
+        monitor_time = performance_monitor.stop(STAGE_REPORT_FILTER, monitor_time)
         status_new = self.multi_manager.virtual_state_handler.apply_virtual_states_to_status_list(device, status_new)
+        monitor_time = performance_monitor.stop(STAGE_REPORT_VIRTUAL_STATES, monitor_time)
 
+        #The SDK applies the status and notifies the listeners in the same call,
+        #this stage therefore includes the update_device stage
         super()._on_device_report(device_id, status_new)
         #Temporary fix until a better solution is found
         #Loop through the reported dpId and resync the aliases with the status itself
@@ -136,6 +234,7 @@ class XTSharingDeviceManager(Manager):  # noqa: F811
                 ):
                 for alias in device.local_strategy[item["dpId"]]["status_code_alias"]:
                     device.status[alias] = device.status[device.local_strategy[item["dpId"]]["status_code"]]
+        performance_monitor.stop(STAGE_REPORT_APPLY, monitor_time)
         super()._on_device_report(device_id, [])
     
     def send_commands(
@@ -17,7 +17,8 @@ from homeassistant.components.number.const import (
     NumberMode,
 )
 from .util import (
-    merge_device_descriptors
+    get_merged_descriptors,
+    DeviceDescriptorIndex,
 )
 
 from .multi_manager.multi_manager import XTConfigEntry
@@ -292,9 +293,12 @@ async def async_setup_entry(
     """Set up Tuya number dynamically through Tuya discovery."""
     hass_data = entry.runtime_data
 
-    merged_descriptors = NUMBERS
-    for new_descriptor in entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.NUMBER):
-        merged_descriptors = merge_device_descriptors(merged_descriptors, new_descriptor)
+    merged_descriptors = get_merged_descriptors(
+        Platform.NUMBER,
+        NUMBERS,
+        entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.NUMBER),
+    )
+    descriptor_index = DeviceDescriptorIndex(merged_descriptors)
 
     @callback
     def async_discover_device(device_map) -> None:
@@ -303,12 +307,10 @@ async def async_setup_entry(
         device_ids = [*device_map]
         for device_id in device_ids:
             if device := hass_data.manager.device_map.get(device_id):
-                if descriptions := merged_descriptors.get(device.category):
-                    entities.extend(
-                        TuyaNumberEntity(device, hass_data.manager, description)
-                        for description in descriptions
-                        if description.key in device.status
-                    )
+                entities.extend(
+                    TuyaNumberEntity(device, hass_data.manager, description)
+                    for description in descriptor_index.get_descriptions_to_discover(device, device.status)
+                )
 
         async_add_entities(entities)
 
@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
+from datetime import timedelta
 from typing import Any
 
 from tuya_sharing import SharingScene
 
 from homeassistant.components.scene import Scene
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 
 from .multi_manager.multi_manager import (
     MultiManager,
@@ -17,14 +20,50 @@ from .multi_manager.multi_manager import (
 )
 from .const import DOMAIN
 
+# Scenes created, changed or deleted in the app are picked up at this interval
+SCENE_REFRESH_INTERVAL = timedelta(minutes=10)
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: XTConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up Tuya scenes."""
     hass_data = entry.runtime_data
-    scenes = await hass.async_add_executor_job(hass_data.manager.query_scenes)
-    async_add_entities(TuyaSceneEntity(hass_data.manager, scene) for scene in scenes)
+    scene_entities: dict[str, TuyaSceneEntity] = {}
+
+    async def async_refresh_scenes(*_: Any) -> None:
+        """Add the new scenes, update the existing ones and remove the deleted ones."""
+        scenes = await hass_data.manager.async_query_scenes()
+        if scenes is None:
+            #The query failed, keep the current scenes until the next refresh
+            return
+        new_entities: list[TuyaSceneEntity] = []
+        current_scene_ids: set[str] = set()
+        for scene in scenes:
+            current_scene_ids.add(scene.scene_id)
+            if scene_entity := scene_entities.get(scene.scene_id):
+                scene_entity.update_scene(scene)
+            else:
+                scene_entity = TuyaSceneEntity(hass_data.manager, scene)
+                scene_entities[scene.scene_id] = scene_entity
+                new_entities.append(scene_entity)
+        if new_entities:
+            async_add_entities(new_entities)
+        device_registry = dr.async_get(hass)
+        for scene_id in [scene_id for scene_id in scene_entities if scene_id not in current_scene_ids]:
+            scene_entity = scene_entities.pop(scene_id)
+            if device_entry := device_registry.async_get_device(
+                identifiers={(DOMAIN, f"{scene_entity.unique_id}")}
+            ):
+                # Removing the scene device removes its entity as well
+                device_registry.async_remove_device(device_entry.id)
+            else:
+                await scene_entity.async_remove()
+
+    await async_refresh_scenes()
+    entry.async_on_unload(
+        async_track_time_interval(hass, async_refresh_scenes, SCENE_REFRESH_INTERVAL)
+    )
 
 
 class TuyaSceneEntity(Scene):
@@ -41,6 +80,12 @@ class TuyaSceneEntity(Scene):
         self.multi_manager = multi_manager
         self.scene = scene
 
+    def update_scene(self, scene: SharingScene) -> None:
+        """Take the refreshed scene into account."""
+        self.scene = scene
+        if self.hass is not None:
+            self.async_write_ha_state()
+
     @property
     def device_info(self) -> DeviceInfo:
         """Return a device description for device registry."""
@@ -56,6 +101,6 @@ class TuyaSceneEntity(Scene):
         """Return if the scene is enabled."""
         return self.scene.enabled
 
-    def activate(self, **kwargs: Any) -> None:
+    async def async_activate(self, **kwargs: Any) -> None:
         """Activate the scene."""
-        self.multi_manager.trigger_scene(self.scene.home_id, self.scene.scene_id)
+        await self.multi_manager.async_trigger_scene(self.scene.home_id, self.scene.scene_id)
@@ -11,7 +11,8 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .util import (
-    merge_device_descriptors
+    get_merged_descriptors,
+    DeviceDescriptorIndex,
 )
 
 from .multi_manager.multi_manager import XTConfigEntry
@@ -117,9 +118,12 @@ async def async_setup_entry(
     """Set up Tuya select dynamically through Tuya discovery."""
     hass_data = entry.runtime_data
 
-    merged_descriptors = SELECTS
-    for new_descriptor in entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.SELECT):
-        merged_descriptors = merge_device_descriptors(merged_descriptors, new_descriptor)
+    merged_descriptors = get_merged_descriptors(
+        Platform.SELECT,
+        SELECTS,
+        entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.SELECT),
+    )
+    descriptor_index = DeviceDescriptorIndex(merged_descriptors)
 
     @callback
     def async_discover_device(device_map) -> None:
@@ -128,12 +132,10 @@ async def async_setup_entry(
         device_ids = [*device_map]
         for device_id in device_ids:
             if device := hass_data.manager.device_map.get(device_id):
-                if descriptions := merged_descriptors.get(device.category):
-                    entities.extend(
-                        TuyaSelectEntity(device, hass_data.manager, description)
-                        for description in descriptions
-                        if description.key in device.status
-                    )
+                entities.extend(
+                    TuyaSelectEntity(device, hass_data.manager, description)
+                    for description in descriptor_index.get_descriptions_to_discover(device, device.status)
+                )
 
         async_add_entities(entities)
 
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import datetime
 
+from typing import Any
+
 from dataclasses import dataclass, field
 
 from tuya_sharing import CustomerDevice
@@ -11,6 +13,7 @@ from tuya_sharing.device import DeviceStatusRange
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
+    SensorEntity,
     SensorEntityDescription,
     SensorStateClass,
     RestoreSensor,
@@ -20,6 +23,7 @@ from homeassistant.const import (
     Platform,
     PERCENTAGE,
     EntityCategory,
+    UnitOfTime,
 )
 from homeassistant.core import HomeAssistant, callback, Event, EventStateChangedData, State
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
@@ -28,13 +32,23 @@ from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.event import async_track_time_change, async_call_later, async_track_state_change_event
 
 from .util import (
-    merge_device_descriptors,
+    get_merged_descriptors,
+    DeviceDescriptorIndex,
     get_default_value
 )
 
 from .multi_manager.multi_manager import XTConfigEntry, MultiManager
+from .multi_manager.shared.multi_performance_monitor import (
+    STAGE_ON_MESSAGE,
+    STAGE_REPORT_CONVERT,
+    STAGE_REPORT_FILTER,
+    STAGE_REPORT_VIRTUAL_STATES,
+    STAGE_REPORT_APPLY,
+    STAGE_UPDATE_DEVICE,
+)
 from .base import ElectricityTypeData, EnumTypeData, IntegerTypeData, TuyaEntity
 from .const import (
+    CONF_API_TELEMETRY_SENSOR,
     DEVICE_CLASS_UNITS,
     DOMAIN,
     TUYA_DISCOVERY_NEW,
@@ -699,9 +713,12 @@ async def async_setup_entry(
     """Set up Tuya sensor dynamically through Tuya discovery."""
     hass_data = entry.runtime_data
 
-    merged_descriptors = SENSORS
-    for new_descriptor in entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.SENSOR):
-        merged_descriptors = merge_device_descriptors(merged_descriptors, new_descriptor)
+    merged_descriptors = get_merged_descriptors(
+        Platform.SENSOR,
+        SENSORS,
+        entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.SENSOR),
+    )
+    descriptor_index = DeviceDescriptorIndex(merged_descriptors)
 
     @callback
     def async_discover_device(device_map) -> None:
@@ -710,18 +727,25 @@ async def async_setup_entry(
         device_ids = [*device_map]
         for device_id in device_ids:
             if device := hass_data.manager.device_map.get(device_id):
-                if descriptions := merged_descriptors.get(device.category):
-                    entities.extend(
-                        TuyaSensorEntity(device, hass_data.manager, description)
-                        for description in descriptions
-                        if description.key in device.status
-                    )
+                entities.extend(
+                    TuyaSensorEntity(device, hass_data.manager, description)
+                    for description in descriptor_index.get_descriptions_to_discover(device, device.status)
+                )
 
         async_add_entities(entities)
 
     hass_data.manager.register_device_descriptors("sensors", merged_descriptors)
     async_discover_device([*hass_data.manager.device_map])
 
+    if hass_data.manager.performance_monitor.enabled:
+        async_add_entities(
+            XTPerformanceSensorEntity(entry, hass_data.manager, stage)
+            for stage in PERFORMANCE_SENSOR_STAGES
+        )
+    #API calls are counted regardless of the performance monitoring (diagnostics), only the sensor is optional
+    if entry.options.get(CONF_API_TELEMETRY_SENSOR, False):
+        async_add_entities([XTAPITelemetrySensorEntity(entry, hass_data.manager)])
+
     entry.async_on_unload(
         async_dispatcher_connect(hass, TUYA_DISCOVERY_NEW, async_discover_device)
     )
@@ -832,13 +856,13 @@ class TuyaSensorEntity(TuyaEntity, RestoreSensor):
         if self._type is DPType.JSON:
             if self.entity_description.subkey is None:
                 return None
-            values = ElectricityTypeData.from_json(value)
+            values = self.get_decoded_value(self.entity_description.key, ElectricityTypeData.from_json)
             return getattr(values, self.entity_description.subkey)
 
         if self._type is DPType.RAW:
             if self.entity_description.subkey is None:
                 return None
-            values = ElectricityTypeData.from_raw(value)
+            values = self.get_decoded_electricity_raw(self.entity_description.key)
             return getattr(values, self.entity_description.subkey)
 
         # Valid string or enum value
@@ -920,3 +944,75 @@ class TuyaSensorEntity(TuyaEntity, RestoreSensor):
         if self.cancel_reset_after_x_seconds:
             self.cancel_reset_after_x_seconds()
         self.cancel_reset_after_x_seconds = async_call_later(self.hass, self.entity_description.reset_after_x_seconds, self.reset_value)
+
+
+PERFORMANCE_SENSOR_STAGES: tuple[str, ...] = (
+    STAGE_ON_MESSAGE,
+    STAGE_REPORT_CONVERT,
+    STAGE_REPORT_FILTER,
+    STAGE_REPORT_VIRTUAL_STATES,
+    STAGE_REPORT_APPLY,
+    STAGE_UPDATE_DEVICE,
+)
+
+class XTPerformanceSensorEntity(SensorEntity):
+    """Average processing latency of one message handling stage."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 3
+
+    def __init__(
+        self,
+        entry: XTConfigEntry,
+        device_manager: MultiManager,
+        stage: str,
+    ) -> None:
+        """Init the performance sensor."""
+        self.device_manager = device_manager
+        self.stage = stage
+        self._attr_unique_id = f"{DOMAIN}.{entry.entry_id}.performance_{stage}"
+        self._attr_name = f"{entry.title} {stage.replace('_', ' ')} latency"
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the average latency of the stage."""
+        return self.device_manager.performance_monitor.get_stage_average(self.stage)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the latency histogram and the global message rate."""
+        return {
+            "histogram": self.device_manager.performance_monitor.get_stage_statistics(self.stage),
+            "messages_per_minute": round(self.device_manager.performance_monitor.get_message_rate(), 3),
+        }
+
+#Keep the state attributes small, the full list is in the diagnostics
+API_TELEMETRY_SENSOR_MAX_ENDPOINTS = 10
+
+class XTAPITelemetrySensorEntity(SensorEntity):
+    """Number of cloud API calls, with the per-endpoint counters as attributes."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(
+        self,
+        entry: XTConfigEntry,
+        device_manager: MultiManager,
+    ) -> None:
+        """Init the API telemetry sensor."""
+        self.device_manager = device_manager
+        self._attr_unique_id = f"{DOMAIN}.{entry.entry_id}.api_calls"
+        self._attr_name = f"{entry.title} API calls"
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the number of API calls since startup."""
+        return self.device_manager.api_telemetry.get_total_count()
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the counters of the most called endpoints."""
+        return self.device_manager.api_telemetry.get_statistics(API_TELEMETRY_SENSOR_MAX_ENDPOINTS)
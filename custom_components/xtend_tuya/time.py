@@ -18,7 +18,8 @@ from .const import (
     DPCode,
 )
 from .util import (
-    merge_device_descriptors,
+    get_merged_descriptors,
+    DeviceDescriptorIndex,
 )
 from .base import TuyaEntity
 from .multi_manager.shared.device import (
@@ -44,9 +45,12 @@ async def async_setup_entry(
     """Set up Tuya binary sensor dynamically through Tuya discovery."""
     hass_data = entry.runtime_data
 
-    merged_descriptors = TIMES
-    for new_descriptor in entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.TIME):
-        merged_descriptors = merge_device_descriptors(merged_descriptors, new_descriptor)
+    merged_descriptors = get_merged_descriptors(
+        Platform.TIME,
+        TIMES,
+        entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.TIME),
+    )
+    descriptor_index = DeviceDescriptorIndex(merged_descriptors)
 
     @callback
     def async_discover_device(device_map) -> None:
@@ -55,12 +59,10 @@ async def async_setup_entry(
         device_ids = [*device_map]
         for device_id in device_ids:
             if device := hass_data.manager.device_map.get(device_id):
-                if descriptions := merged_descriptors.get(device.category):
-                    entities.extend(
-                        TuyaTimeEntity(device, hass_data.manager, description)
-                        for description in descriptions
-                        if description.key in device.status
-                    )
+                entities.extend(
+                    TuyaTimeEntity(device, hass_data.manager, description)
+                    for description in descriptor_index.get_descriptions_to_discover(device, device.status)
+                )
         
         async_add_entities(entities)
     
@@ -3,7 +3,9 @@
 from __future__ import annotations
 import copy
 import traceback
-from typing import NamedTuple
+import weakref
+from typing import Any, Callable, Iterable, NamedTuple
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity import EntityDescription
@@ -27,6 +29,9 @@ from .multi_manager.multi_manager import (
     XTConfigEntry,
 )
 
+# Merged platform descriptors, shared read-only by all the config entries of the process
+_MERGED_DESCRIPTORS: dict[tuple[Platform, tuple[int, ...]], tuple[list, Any]] = {}
+
 def log_stack(message: str):
     LOGGER.debug(message, stack_info=True)
 
@@ -126,6 +131,21 @@ def merge_device_descriptors(descriptors1, descriptors2):
             return_descriptors[category] = merge_descriptor_category(return_descriptors[category], descriptors2[category])
     return return_descriptors
 
+def get_merged_descriptors(platform: Platform, descriptors, descriptors_to_merge: list, merge_function: Callable = merge_device_descriptors):
+    """Return the platform descriptors merged with the provided ones, computed once per process.
+
+    The merged result is shared between config entries and must not be modified.
+    """
+    cache_key = (platform, tuple(id(new_descriptors) for new_descriptors in descriptors_to_merge))
+    if (cached := _MERGED_DESCRIPTORS.get(cache_key)) is not None:
+        return cached[1]
+    merged_descriptors = descriptors
+    for new_descriptors in descriptors_to_merge:
+        merged_descriptors = merge_function(merged_descriptors, new_descriptors)
+    #Keep a reference to the sources so that their ids stay valid for the cache key
+    _MERGED_DESCRIPTORS[cache_key] = (list(descriptors_to_merge), merged_descriptors)
+    return merged_descriptors
+
 def merge_descriptor_category(category1: tuple[EntityDescription, ...], category2: tuple[EntityDescription, ...]):
     descriptor1_key_list = []
     return_category = copy.deepcopy(list(category1))
@@ -137,6 +157,45 @@ def merge_descriptor_category(category1: tuple[EntityDescription, ...], category
             return_category.append(copy.deepcopy(descriptor))
     return tuple(return_category)
 
+class DeviceDescriptorIndex:
+    """Index of the entity descriptions of a platform per category and DP code."""
+
+    #Live indexes of all the platforms, used to forget a device when it is removed or added again
+    _instances: weakref.WeakSet[DeviceDescriptorIndex] = weakref.WeakSet()
+
+    def __init__(self, descriptors, get_description_dpcode: Callable[[Any], str] | None = None) -> None:
+        self.category_index: dict[str, dict[str, list[EntityDescription]]] = {}
+        self.discovered_codes: dict[str, set[str]] = {}
+        DeviceDescriptorIndex._instances.add(self)
+        for category, descriptions in descriptors.items():
+            code_index: dict[str, list[EntityDescription]] = {}
+            for description in descriptions:
+                dpcode = get_description_dpcode(description) if get_description_dpcode else description.key
+                code_index.setdefault(dpcode, []).append(description)
+            self.category_index[category] = code_index
+
+    def get_descriptions_to_discover(self, device: XTDevice, available_codes: Iterable[str]) -> list[EntityDescription]:
+        """Return the descriptions of the DP codes that were not discovered yet for this device."""
+        code_index = self.category_index.get(device.category)
+        if not code_index:
+            return []
+        discovered_codes = self.discovered_codes.setdefault(device.id, set())
+        return_list: list[EntityDescription] = []
+        for code in tuple(available_codes):
+            if code in discovered_codes:
+                continue
+            if descriptions := code_index.get(code):
+                #Platforms create one entity per returned description
+                discovered_codes.add(code)
+                return_list.extend(descriptions)
+        return return_list
+
+    @staticmethod
+    def forget_device(device_id: str) -> None:
+        #The device entities are being removed, a later discovery must create them again
+        for descriptor_index in list(DeviceDescriptorIndex._instances):
+            descriptor_index.discovered_codes.pop(device_id, None)
+
 def append_dictionnaries(dict1: dict, dict2: dict) -> dict:
     return_dict = copy.deepcopy(dict1)
     for category in dict2:
@@ -22,6 +22,7 @@ from .multi_manager.multi_manager import XTConfigEntry
 from .base import EnumTypeData, IntegerTypeData, TuyaEntity
 from .const import TUYA_DISCOVERY_NEW, DPCode, DPType
 from .util import (
+    get_merged_descriptors,
     append_lists
 )
 
@@ -59,9 +60,12 @@ async def async_setup_entry(
     """Set up Tuya vacuum dynamically through Tuya discovery."""
     hass_data = entry.runtime_data
     
-    category_list: list[str] = []
-    for new_descriptor in entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.VACUUM):
-        category_list = append_lists(category_list, new_descriptor)
+    category_list: list[str] = get_merged_descriptors(
+        Platform.VACUUM,
+        [],
+        entry.runtime_data.multi_manager.get_platform_descriptors_to_merge(Platform.VACUUM),
+        append_lists,
+    )
     
     @callback
     def async_discover_device(device_map) -> None: